@@ -3,6 +3,8 @@ from .utils import CELL_SIZE, INFO_BAR_HEIGHT
 
 
 class Obstacle:
+    is_main_block = False
+
     def __init__(self, x, y, obstacle_type, health=None):
         px = x * CELL_SIZE
         py = y * CELL_SIZE + INFO_BAR_HEIGHT
@@ -10,6 +12,16 @@ class Obstacle:
         self.type = obstacle_type
         self.health = health
 
+    @property
+    def health(self):
+        return self._health
+
+    @health.setter
+    def health(self, value):
+        # 血量文字随扣血一起更新，渲染时不用每帧 str()
+        self._health = value
+        self.health_str = str(value)
+
     @property
     def grid_pos(self):
         return self.rect.x // CELL_SIZE, (self.rect.y - INFO_BAR_HEIGHT) // CELL_SIZE
@@ -116,9 +128,7 @@ class Zombie:
                             ob.health -= self.attack
                             self.attack_timer = 0
                             if ob.health <= 0:
-                                grid_pos = ob.grid_pos
-                                if grid_pos in game_state.obstacles:
-                                    del game_state.obstacles[grid_pos]
+                                game_state.destroy_obstacle(ob.grid_pos)
                         blocked = True
                         break
                     elif ob.type == "Indestructible":
@@ -6,6 +6,20 @@ class GameState:
         self.items = items          # list[Item]
         self.destructible_count = self.count_destructible_obstacles()
         self.main_item_pos = main_item_pos
+        self.partition_obstacles()
+
+    def partition_obstacles(self):
+        # 按类型分好组，渲染时不用逐个判断；障碍变化时同步维护
+        self.main_blocks = []
+        self.destructible_blocks = []
+        self.indestructible_rects = []
+        for ob in self.obstacles.values():
+            if ob.is_main_block:
+                self.main_blocks.append(ob)
+            elif ob.type == "Destructible":
+                self.destructible_blocks.append(ob)
+            else:
+                self.indestructible_rects.append(ob.rect)
 
     def count_destructible_obstacles(self):
         return sum(1 for obs in self.obstacles.values() if obs.type == "Destructible")
@@ -13,7 +27,7 @@ class GameState:
     def collect_item(self, player_rect):
         for item in list(self.items):
             if player_rect.colliderect(item.rect):
-                if item.is_main and any(getattr(ob, "is_main_block", False) for ob in self.obstacles.values()):
+                if item.is_main and any(ob.is_main_block for ob in self.obstacles.values()):
                     return False  # 主障碍未破坏不能捡主道具
                 self.items.remove(item)
                 return True
@@ -21,6 +35,13 @@ class GameState:
 
     def destroy_obstacle(self, pos):
         if pos in self.obstacles:
-            if self.obstacles[pos].type == "Destructible":
+            ob = self.obstacles[pos]
+            if ob.type == "Destructible":
                 self.destructible_count -= 1
+            if ob.is_main_block:
+                self.main_blocks.remove(ob)
+            elif ob.type == "Destructible":
+                self.destructible_blocks.remove(ob)
+            else:
+                self.indestructible_rects.remove(ob.rect)
             del self.obstacles[pos]
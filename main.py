@@ -3,7 +3,7 @@ from core.level import get_level_config, generate_game_entities
 from core.state import GameState
 from core.entities import Player, Enemy
 from ui.menu import show_start_menu
-from ui.game_render import render_game
+from ui.game_render import render_game, present_frame, reset_present
 from ui.result_screen import render_game_result
 
 from core.utils import CELL_SIZE, INFO_BAR_HEIGHT
@@ -37,6 +37,7 @@ def main_game_loop(config, enemy_cards_collected):
     enemies = [Enemy(pos, attack=10, speed=ENEMY_SPEED) for pos in enemy_starts]
     running = True
     game_result = None
+    reset_present()
 
     while running:
         for event in pygame.event.get():
@@ -56,8 +57,7 @@ def main_game_loop(config, enemy_cards_collected):
         if not game_state.items:
             game_result = "success"
             running = False
-        render_game(screen, game_state, player, enemies)
-        pygame.display.flip()
+        present_frame(render_game(screen, game_state, player, enemies))
         clock.tick(60)
     restart_rect, next_rect = render_game_result(screen, game_result, restart_img, next_img)
     while True:
@@ -27,6 +27,8 @@ WIDTH, HEIGHT = 960, 540  # window size
 VW, VH = 320, 180  # virtual low-res surface for pixel look (scaled up)
 SCALE_X, SCALE_Y = WIDTH / VW, HEIGHT / VH
 FPS = 60
+FIXED_DT = 1.0 / 60  # simulation step, independent of render rate
+MAX_SUBSTEPS = 5  # cap catch-up steps after a long frame (avoid spiral of death)
 
 # Gameplay
 WAVE_OBSTACLES = (8, 14)  # range of obstacles per wave
@@ -146,6 +148,8 @@ class Stats:
 
 # --------------------------- Entities ----------------------------------
 class Entity:
+    __slots__ = ('pos', 'radius', 'color', 'alive', 'xp', 'xp_total', 'level', 'xp_next')
+
     def __init__(self, pos: Tuple[float, float], radius: float, color: Tuple[int, int, int]):
         self.pos = Vec2(pos)
         self.radius = radius
@@ -172,18 +176,21 @@ class Entity:
     def update(self, dt: float):
         pass
 
-    def draw(self, surf: pygame.Surface):
-        pygame.draw.circle(surf, self.color, self.pos, self.radius)
+    def draw(self, surf: pygame.Surface, at: Optional[Tuple[float, float]] = None):
+        pygame.draw.circle(surf, self.color, self.pos if at is None else at, self.radius)
 
     def dist_to(self, other: Entity) -> float:
         return self.pos.distance_to(other.pos)
 
 
 class Projectile:
+    __slots__ = ('px', 'py', 'vx', 'vy', 'damage', 'owner_is_player', 'color', 'radius', 'alive', 'life')
+
     def __init__(self, pos: Vec2, vel: Vec2, damage: float, owner_is_player: bool, color: Tuple[int, int, int] = YELLOW,
                  radius: int = 2):
-        self.pos = Vec2(pos)
-        self.vel = Vec2(vel)
+        # plain floats instead of Vec2: integration and hit tests skip the vector API
+        self.px, self.py = float(pos[0]), float(pos[1])
+        self.vx, self.vy = float(vel[0]), float(vel[1])
         self.damage = damage
         self.owner_is_player = owner_is_player
         self.color = color
@@ -192,16 +199,19 @@ class Projectile:
         self.life = 2.5  # seconds
 
     def update(self, dt: float):
-        self.pos += self.vel * dt
+        self.px += self.vx * dt
+        self.py += self.vy * dt
         self.life -= dt
         if self.life <= 0:
             self.alive = False
 
-    def draw(self, surf: pygame.Surface):
-        pygame.draw.circle(surf, self.color, self.pos, self.radius)
+    def draw(self, surf: pygame.Surface, at: Optional[Tuple[float, float]] = None):
+        pygame.draw.circle(surf, self.color, (self.px, self.py) if at is None else at, self.radius)
 
 
 class Pickup:
+    __slots__ = ('pos', 'kind', 'amount', 'radius', 'alive')
+
     def __init__(self, pos: Vec2, kind: str = 'heal', amount: float = 20, radius: int = 3):
         self.pos = Vec2(pos)
         self.kind = kind
@@ -215,6 +225,8 @@ class Pickup:
 
 
 class Obstacle:
+    __slots__ = ('rect', 'max_hp', 'hp', 'coin_value', 'xp_value', 'alive', 'last_attacker_enemy', 'dropped')
+
     def __init__(self, rect: pygame.Rect, hp: float = 40, coin_value: int = 2, xp_value: float = 6.0):
         self.rect = rect
         self.max_hp = hp
@@ -318,6 +330,11 @@ class Enemy(Entity):
     KIND_BUFFER = "buffer"
     KIND_BOSS = "boss"
 
+    # buffer-only aura fields stay unset on other kinds; reads go through getattr(..., default)
+    __slots__ = ('kind', 'special', 'max_hp', 'hp', 'speed', 'damage', 'melee_range', 'attack_cd', 'fire_cd',
+                 'projectile_speed', 'buff_radius', 'buff_mult', 'aura_cooldown', 'aura_duration', 'aura_cd_timer',
+                 'aura_time_left', '_atk_timer', '_fire_timer', '_aura_mult', 'spawn_silence')
+
     def __init__(self, pos: Tuple[float, float], kind: str, special: bool = False):
         color = RED if not special else ORANGE
         if kind == Enemy.KIND_BUFFER: color = MAGENTA
@@ -500,13 +517,14 @@ class Enemy(Entity):
                 self.alive = False
         return acted, dmg_out
 
-    def draw(self, surf: pygame.Surface):
-        super().draw(surf)
+    def draw(self, surf: pygame.Surface, at: Optional[Tuple[float, float]] = None):
+        super().draw(surf, at)
+        x, y = self.pos if at is None else at
         # tiny health bar
         w = 10 if self.kind != Enemy.KIND_BOSS else 24
         h = 2
         hp_ratio = clamp(self.hp / self.max_hp, 0, 1)
-        bar = pygame.Rect(int(self.pos.x - w // 2), int(self.pos.y - self.radius - 6), w, h)
+        bar = pygame.Rect(int(x - w // 2), int(y - self.radius - 6), w, h)
         pygame.draw.rect(surf, RED, bar)
         inner = pygame.Rect(bar.x, bar.y, int(w * hp_ratio), h)
         pygame.draw.rect(surf, GREEN, inner)
@@ -700,9 +718,14 @@ class Game:
         self.windowed_size = (WIDTH, HEIGHT)
         self.fullscreen = True
         self.surface = pygame.Surface((VW, VH))
+        # present() cache: scaled frame target and the window size it was laid out for
+        self._scaled: Optional[pygame.Surface] = None
+        self._present_size: Optional[Tuple[int, int]] = None
         self.clock = pygame.time.Clock()
         self.font = pygame.font.SysFont("Consolas", 12)
         self.big_font = pygame.font.SysFont("Consolas", 18)
+        # HUD slot -> (last text, rendered surface); re-rendered only when the text changes
+        self._hud_surfs: dict = {}
 
         # rng & run
         self.rng = random.Random()
@@ -714,6 +737,8 @@ class Game:
         self.projectiles: List[Projectile] = []
         self.enemy_projectiles: List[Projectile] = []
         self.pickups: List[Pickup] = []
+        # set whenever an enemy dies; compact_enemies() drops the dead ones lazily
+        self._enemies_dirty = False
         self.state = Game.STATE_HOME
         self.shop_selected = 0
         self.pause_selected = 0
@@ -721,6 +746,9 @@ class Game:
         self.wave_checkpoint: Optional[dict] = None
         self.prev_state_for_pause: Optional[str] = None
         self.wave_time_remaining: float = 0.0
+        self._accum: float = 0.0
+        # positions before the last fixed step of the frame, for render interpolation
+        self._prev_pos: Optional[dict] = None
 
         # BGM hook
         self.init_music()
@@ -766,9 +794,12 @@ class Game:
         self.player.alive = True
 
     def save_checkpoint_to_disk(self, data: dict):
+        # write to a temp file then rename, so a crash mid-write never leaves a torn save
+        tmp = RUN_SAVE_FILE + ".tmp"
         try:
-            with open(RUN_SAVE_FILE, 'w', encoding='utf-8') as f:
-                json.dump(data, f)
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, RUN_SAVE_FILE)
         except Exception:
             pass
 
@@ -828,8 +859,22 @@ class Game:
             self.state = Game.STATE_PLAY
 
     # ----------------- Combat / Systems -----------------
+    def compact_enemies(self):
+        # drop dead enemies in place, only when something actually died since the last pass
+        if not self._enemies_dirty:
+            return
+        enemies = self.level.enemies
+        j = 0
+        for e in enemies:
+            if e.alive:
+                enemies[j] = e
+                j += 1
+        del enemies[j:]
+        self._enemies_dirty = False
+
     def kill_enemy(self, e: Enemy, killer_is_player: bool = True):
         e.alive = False
+        self._enemies_dirty = True
         # coin & xp to player
         if killer_is_player:
             coin = self.rng.randint(2, 4) + (3 if e.special else 0)
@@ -858,24 +903,37 @@ class Game:
         e.hp = min(e.max_hp, e.hp + 0.05 * e.max_hp)
 
     def resolve_projectiles(self, dt: float):
+        self.compact_enemies()
+        enemies = self.level.enemies
+        # enemies don't move while projectiles resolve: snapshot their centres once per frame
+        # (radius is read live, XP inheritance on a kill can grow it)
+        targets = [(e, e.pos.x, e.pos.y) for e in enemies]
+        # obstacle bounds as plain ints so the point tests below stay inline
+        obstacle_rects = [(o, o.rect.x, o.rect.y, o.rect.x + o.rect.w, o.rect.y + o.rect.h)
+                          for o in self.level.obstacles if o.alive]
         # player projectiles -> enemies / obstacles
         for p in self.projectiles:
             p.update(dt)
             if not p.alive: continue
-            # collide enemies
-            for e in self.level.enemies:
-                if not e.alive: continue
-                if e.pos.distance_to(p.pos) <= (e.radius + p.radius):
+            px, py = p.px, p.py
+            # collide enemies (kills are removed on the spot, so every entry is alive)
+            pr = p.radius
+            for i, (e, ex, ey) in enumerate(targets):
+                dx, dy = ex - px, ey - py
+                rr = e.radius + pr
+                if dx * dx + dy * dy <= rr * rr:
                     e.take_damage(p.damage)
                     p.alive = False
                     if not e.alive:
                         self.kill_enemy(e, killer_is_player=True)
+                        del targets[i]
+                        enemies.remove(e)
                     break
             if not p.alive: continue
             # collide obstacles
-            for o in self.level.obstacles:
+            for o, x0, y0, x1, y1 in obstacle_rects:
                 if not o.alive: continue
-                if o.rect.collidepoint(int(p.pos.x), int(p.pos.y)):
+                if x0 <= px < x1 and y0 <= py < y1:
                     o.take_damage(p.damage, attacker_enemy=None)
                     if not o.alive:
                         self.maybe_drop_pickup(o)
@@ -888,18 +946,23 @@ class Game:
                     break
 
         # enemy projectiles -> player / obstacles
+        player = self.player
         for p in self.enemy_projectiles:
             p.update(dt)
             if not p.alive: continue
+            px, py = p.px, p.py
             # player
-            if self.player.alive and self.player.pos.distance_to(p.pos) <= (self.player.radius + p.radius):
-                self.player.take_damage(p.damage)
-                p.alive = False
-                continue
+            if player.alive:
+                dx, dy = player.pos.x - px, player.pos.y - py
+                rr = player.radius + p.radius
+                if dx * dx + dy * dy <= rr * rr:
+                    player.take_damage(p.damage)
+                    p.alive = False
+                    continue
             # obstacles (mark last attacker to grant xp if destroyed)
-            for o in self.level.obstacles:
+            for o, x0, y0, x1, y1 in obstacle_rects:
                 if not o.alive: continue
-                if o.rect.collidepoint(int(p.pos.x), int(p.pos.y)):
+                if x0 <= px < x1 and y0 <= py < y1:
                     # find firing enemy not tracked; skip for simplicity
                     o.take_damage(p.damage, attacker_enemy=None)
                     p.alive = False
@@ -910,22 +973,27 @@ class Game:
         self.enemy_projectiles = [p for p in self.enemy_projectiles if p.alive]
 
     def update_enemies(self, dt: float):
+        # enemies only die during their own iteration below, so the compacted list needs no alive checks
+        self.compact_enemies()
+        obstacles = [o for o in self.level.obstacles if o.alive]
         for e in self.level.enemies:
-            if not e.alive: continue
             e.update(dt, self.player, self.level.enemies)
             # collide with obstacles (resolve position)
-            for o in self.level.obstacles:
-                if not o.alive: continue
+            for o in obstacles:
                 e.pos = resolve_circle_rect(e.pos, e.radius, o.rect)
             shot = e.try_projectile(self.player)
             self.enemy_projectiles.extend(shot)
             acted, dmg = e.try_attack(dt, self.player)
             if acted and dmg > 0:
                 self.player.take_damage(dmg)
+            if not e.alive:
+                # suicide enemies die on their own attack
+                self._enemies_dirty = True
+        # drop suicide deaths before the obstacle pass
+        self.compact_enemies()
         # enemies collide with and damage obstacles to gain xp
         for e in self.level.enemies:
-            if not e.alive: continue
-            for o in self.level.obstacles:
+            for o in obstacles:
                 if not o.alive: continue
                 if circle_rect_intersect(e.pos, e.radius, o.rect):
                     o.take_damage(max(2, e.damage * 0.6), attacker_enemy=e)
@@ -933,7 +1001,7 @@ class Game:
                         self.enemy_destroyed_obstacle(e, o)
                         self.maybe_drop_pickup(o)
         # dead enemies cleanup
-        self.level.enemies = [e for e in self.level.enemies if e.alive]
+        self.compact_enemies()
 
     # ----------------- UI Helpers -----------------
     def draw_bar(self, surf, x, y, w, h, ratio, fg, bg):
@@ -950,6 +1018,19 @@ class Game:
             r.topleft = pos
         surf.blit(img, r)
 
+    def draw_hud_text(self, slot: str, text: str, pos, color=WHITE, center=False):
+        cached = self._hud_surfs.get(slot)
+        if cached is None or cached[0] != text:
+            cached = (text, self.font.render(text, True, color))
+            self._hud_surfs[slot] = cached
+        img = cached[1]
+        r = img.get_rect()
+        if center:
+            r.center = pos
+        else:
+            r.topleft = pos
+        self.surface.blit(img, r)
+
     def resolve_player_collisions(self):
         for o in self.level.obstacles:
             if not o.alive:
@@ -983,16 +1064,16 @@ class Game:
     def draw_hud(self):
         # HP bar
         self.draw_bar(self.surface, 6, 6, 80, 5, self.player.stats.hp / self.player.stats.max_hp, GREEN, RED)
-        self.draw_text(self.surface, f"{int(self.player.stats.hp)}/{int(self.player.stats.max_hp)}", (90, 3), WHITE)
+        self.draw_hud_text('hp', f"{int(self.player.stats.hp)}/{int(self.player.stats.max_hp)}", (90, 3), WHITE)
         # XP bar
         self.draw_bar(self.surface, 6, 14, 80, 4, self.player.xp / max(1, self.player.xp_next), CYAN, DARKGRAY)
         # coin
-        self.draw_text(self.surface, f"coin: {self.player.coin}", (6, 22), YELLOW)
-        self.draw_text(self.surface, f"Wave {self.level.wave}", (VW - 70, 6), WHITE)
-        # Timer (mm:ss)
+        self.draw_hud_text('coin', f"coin: {self.player.coin}", (6, 22), YELLOW)
+        self.draw_hud_text('wave', f"Wave {self.level.wave}", (VW - 70, 6), WHITE)
+        # Timer (mm:ss) -- whole seconds, so the text only changes once per second
         t = max(0, int(self.wave_time_remaining + 0.999))
         mm, ss = divmod(t, 60)
-        self.draw_text(self.surface, f"{mm:02d}:{ss:02d}", (VW // 2, 6), WHITE, center=True)
+        self.draw_hud_text('time', f"{mm:02d}:{ss:02d}", (VW // 2, 6), WHITE, center=True)
 
     def draw_pause(self):
         # overlay
@@ -1037,9 +1118,14 @@ class Game:
             scaled_w, scaled_h = VW * factor, VH * factor
             x = (sw - scaled_w) // 2
             y = (sh - scaled_h) // 2
-            scaled = pygame.transform.scale(self.surface, (scaled_w, scaled_h))
-            self.screen.fill((0, 0, 0))
-            self.screen.blit(scaled, (x, y))
+            # reuse the scaled target; only clear the letterbox when the window geometry changes
+            if self._scaled is None or self._scaled.get_size() != (scaled_w, scaled_h):
+                self._scaled = pygame.Surface((scaled_w, scaled_h))
+            if self._present_size != (sw, sh):
+                self.screen.fill((0, 0, 0))
+                self._present_size = (sw, sh)
+            pygame.transform.scale(self.surface, (scaled_w, scaled_h), self._scaled)
+            self.screen.blit(self._scaled, (x, y))
         pygame.display.flip()
 
     # ----------------- Main Update/Draw -----------------
@@ -1054,7 +1140,8 @@ class Game:
         self.player.update(dt)
         self.resolve_player_collisions()
 
-        # player auto-fire
+        # player auto-fire (list is compacted, so every entry is a live target)
+        self.compact_enemies()
         shots = self.player.try_fire(dt, self.level.enemies)
         if shots:
             self.projectiles.extend(shots)
@@ -1062,16 +1149,19 @@ class Game:
         # enemies & projectiles
         self.update_enemies(dt)
         self.resolve_projectiles(dt)
-
-        # pickups (heal)
-        for it in list(self.pickups):
-            if not it.alive:
-                continue
-            if self.player.pos.distance_to(it.pos) <= (self.player.radius + it.radius):
-                if it.kind == 'heal':
-                    self.player.stats.hp = min(self.player.stats.max_hp, self.player.stats.hp + it.amount)
-                it.alive = False
-        self.pickups = [it for it in self.pickups if it.alive]
+        self.compact_enemies()
+
+        # pickups (heal) -- the list only ever holds live pickups, so filter and collect in one pass
+        if self.pickups:
+            remaining = []
+            for it in self.pickups:
+                if self.player.pos.distance_to(it.pos) <= (self.player.radius + it.radius):
+                    if it.kind == 'heal':
+                        self.player.stats.hp = min(self.player.stats.max_hp, self.player.stats.hp + it.amount)
+                    it.alive = False
+                else:
+                    remaining.append(it)
+            self.pickups = remaining
 
         # wave timer & transition to shop
         self.wave_time_remaining = max(0.0, self.wave_time_remaining - dt)
@@ -1089,7 +1179,23 @@ class Game:
             self.player.alive = False
             self.state = Game.STATE_GAMEOVER
 
-    def draw_play(self):
+    def snapshot_positions(self) -> dict:
+        prev = {p: (p.px, p.py) for p in self.projectiles}
+        prev.update((p, (p.px, p.py)) for p in self.enemy_projectiles)
+        prev.update((e, (e.pos.x, e.pos.y)) for e in self.level.enemies)
+        prev[self.player] = (self.player.pos.x, self.player.pos.y)
+        return prev
+
+    def draw_play(self, alpha: float = 1.0):
+        # draw moving things at prev*(1-alpha) + cur*alpha; objects spawned in the last step have no prev
+        prev = self._prev_pos
+
+        def at(obj, x: float, y: float) -> Optional[Tuple[float, float]]:
+            p = prev.get(obj) if prev else None
+            if p is None:
+                return None
+            return p[0] + (x - p[0]) * alpha, p[1] + (y - p[1]) * alpha
+
         self.surface.fill((20, 18, 22))
         # obstacles
         for o in self.level.obstacles:
@@ -1099,13 +1205,13 @@ class Game:
             it.draw(self.surface)
         # entities
         for p in self.projectiles:
-            p.draw(self.surface)
+            p.draw(self.surface, at(p, p.px, p.py))
         for p in self.enemy_projectiles:
-            p.draw(self.surface)
+            p.draw(self.surface, at(p, p.px, p.py))
         for e in self.level.enemies:
-            e.draw(self.surface)
+            e.draw(self.surface, at(e, e.pos.x, e.pos.y))
         if self.player.alive:
-            self.player.draw(self.surface)
+            self.player.draw(self.surface, at(self.player, self.player.pos.x, self.player.pos.y))
         self.draw_hud()
 
     # ----------------- Event Handling -----------------
@@ -1117,6 +1223,7 @@ class Game:
         if e.type == pygame.KEYDOWN:
             # Toggle fullscreen
             if e.key == pygame.K_F11:
+                self._present_size = None
                 if self.fullscreen:
                     self.screen = pygame.display.set_mode(
                         self.windowed_size,
@@ -1231,15 +1338,23 @@ class Game:
             for ev in pygame.event.get():
                 self.handle_event(ev)
 
-            # Update
+            # Update (fixed-step simulation, decoupled from render rate)
             if self.state == Game.STATE_PLAY:
-                self.update_play(dt)
+                self._accum = min(self._accum + dt, FIXED_DT * MAX_SUBSTEPS)
+                while self._accum >= FIXED_DT and self.state == Game.STATE_PLAY:
+                    if self._accum < 2 * FIXED_DT:  # last step of this frame
+                        self._prev_pos = self.snapshot_positions()
+                    self.update_play(FIXED_DT)
+                    self._accum -= FIXED_DT
+            else:
+                self._accum = 0.0
+                self._prev_pos = None
 
             # Draw
             if self.state == Game.STATE_HOME:
                 self.draw_home()
             elif self.state == Game.STATE_PLAY:
-                self.draw_play()
+                self.draw_play(self._accum / FIXED_DT)
             elif self.state == Game.STATE_PAUSE:
                 self.draw_play()
                 self.draw_pause()
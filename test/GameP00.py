@@ -1,9 +1,12 @@
 
 import sys
 import pygame
+import numpy as np
 import math
+import heapq
 import random
-from queue import PriorityQueue
+from functools import lru_cache
+from itertools import count
 from typing import Dict, List, Set, Tuple, Optional
 
 # ==================== 游戏常量配置 ====================
@@ -38,12 +41,46 @@ DIRECTIONS = {
     pygame.K_s: (0, 1),
 }
 
+# 按键状态 (w, a, s, d) -> (dx, dy), 斜向已归一化
+_MOVE_TABLE: Dict[Tuple[bool, bool, bool, bool], Tuple[float, float]] = {}
+for _w in (False, True):
+    for _a in (False, True):
+        for _s in (False, True):
+            for _d in (False, True):
+                _dx = _d - _a; _dy = _s - _w
+                if _dx and _dy: _dx *= 0.7071; _dy *= 0.7071
+                _MOVE_TABLE[(_w, _a, _s, _d)] = (_dx, _dy)
+
+# 敌人追击方向候选表: (sign dx, sign dy, x轴为主) -> 按优先级排列的移动方向 (已去掉 (0,0))
+DIR_TABLE: Dict[Tuple[int, int, int], Tuple[Tuple[int, int], ...]] = {}
+for _sx in (-1, 0, 1):
+    for _sy in (-1, 0, 1):
+        DIR_TABLE[(_sx, _sy, 1)] = tuple(d for d in ((_sx,0),(0,_sy),(_sx,_sy),(-_sx,0),(0,-_sy)) if d != (0, 0))
+        DIR_TABLE[(_sx, _sy, 0)] = tuple(d for d in ((0,_sy),(_sx,0),(_sx,_sy),(0,-_sy),(-_sx,0)) if d != (0, 0))
+
 # ==================== UI Helpers ====================
+@lru_cache(maxsize=16)
+def _font(size: int) -> pygame.font.Font:
+    # SysFont scans the system font list on every call; build each size once (needs pygame.init())
+    return pygame.font.SysFont(None, size)
+
+@lru_cache(maxsize=1)
+def _star_surf() -> pygame.Surface:
+    return _font(32).render("★", True, (255, 255, 120)).convert_alpha()
+
+_hp_cache: Dict[int, pygame.Surface] = {}
+def _hp_surf(h: int) -> pygame.Surface:
+    # obstacle hp only takes a few small values; rasterize each once
+    s = _hp_cache.get(h)
+    if s is None:
+        s = _font(30).render(str(h), True, (255, 255, 255)).convert_alpha(); _hp_cache[h] = s
+    return s
+
 def draw_button(screen, label, pos, size=(180, 56), bg=(40,40,40), fg=(240,240,240), border=(15,15,15)):
     rect = pygame.Rect(pos, size)
     pygame.draw.rect(screen, border, rect.inflate(6,6))
     pygame.draw.rect(screen, bg, rect)
-    font = pygame.font.SysFont(None, 32)
+    font = _font(32)
     txt = font.render(label, True, fg)
     screen.blit(txt, txt.get_rect(center=rect.center))
     return rect
@@ -73,8 +110,8 @@ def show_start_menu(screen):
     clock = pygame.time.Clock()
     # simple animated fog background
     t = 0
-    title_font = pygame.font.SysFont(None, 64)
-    subtitle_font = pygame.font.SysFont(None, 24)
+    title_font = _font(64)
+    subtitle_font = _font(24)
     while True:
         t += 1
         # background
@@ -107,8 +144,8 @@ def show_start_menu(screen):
 
 def show_help(screen):
     clock = pygame.time.Clock()
-    font = pygame.font.SysFont(None, 28)
-    big = pygame.font.SysFont(None, 40)
+    font = _font(28)
+    big = _font(40)
     while True:
         screen.fill((18,18,18))
         screen.blit(big.render("How to Play", True, (240,240,240)), (40,40))
@@ -131,9 +168,9 @@ def show_help(screen):
         clock.tick(60)
 
 def show_fail_screen(screen, background_surf):
-    dim = pygame.Surface((WINDOW_SIZE, TOTAL_HEIGHT)); dim.set_alpha(180); dim.fill((0,0,0))
+    dim = pygame.Surface((WINDOW_SIZE, TOTAL_HEIGHT), pygame.SRCALPHA).convert_alpha(); dim.fill((0,0,0,180))
     screen.blit(background_surf, (0,0)); screen.blit(dim, (0,0))
-    title = pygame.font.SysFont(None, 80).render("YOU WERE CORRUPTED!", True, (255,60,60))
+    title = _font(80).render("YOU WERE CORRUPTED!", True, (255,60,60))
     screen.blit(title, title.get_rect(center=(WINDOW_SIZE//2, 140)))
     retry = draw_button(screen, "RETRY", (WINDOW_SIZE//2-200, 300))
     home  = draw_button(screen, "HOME", (WINDOW_SIZE//2+20, 300))
@@ -146,9 +183,9 @@ def show_fail_screen(screen, background_surf):
                 if home.collidepoint(event.pos): door_transition(screen); return "home"
 
 def show_success_screen(screen, background_surf, reward_choices):
-    dim = pygame.Surface((WINDOW_SIZE, TOTAL_HEIGHT)); dim.set_alpha(150); dim.fill((0,0,0))
+    dim = pygame.Surface((WINDOW_SIZE, TOTAL_HEIGHT), pygame.SRCALPHA).convert_alpha(); dim.fill((0,0,0,150))
     screen.blit(background_surf, (0,0)); screen.blit(dim, (0,0))
-    title = pygame.font.SysFont(None, 80).render("MEMORY RESTORED!", True, (0,255,120))
+    title = _font(80).render("MEMORY RESTORED!", True, (0,255,120))
     screen.blit(title, title.get_rect(center=(WINDOW_SIZE//2, 100)))
     # cards
     card_rects = []
@@ -156,7 +193,7 @@ def show_success_screen(screen, background_surf, reward_choices):
         x = WINDOW_SIZE//2 - (len(reward_choices)*140)//2 + i*140
         rect = pygame.Rect(x, 180, 120, 160)
         pygame.draw.rect(screen, (220,220,220), rect)
-        name = pygame.font.SysFont(None, 24).render(card.replace("_"," ").upper(), True, (20,20,20))
+        name = _font(24).render(card.replace("_"," ").upper(), True, (20,20,20))
         screen.blit(name, name.get_rect(center=(rect.centerx, rect.bottom-18)))
         # simple pixel face as placeholder
         pygame.draw.rect(screen, (40,40,40), rect, 3)
@@ -186,6 +223,7 @@ class Graph:
     def cost(self, a, b): return self.weights.get((a,b), float('inf'))
 
 class Obstacle:
+    is_main_block: bool = False  # MainBlock overrides; plain attribute read instead of hasattr/getattr probes
     def __init__(self, x: int, y: int, obstacle_type: str, health: Optional[int] = None):
         px = x * CELL_SIZE; py = y * CELL_SIZE + INFO_BAR_HEIGHT
         self.rect = pygame.Rect(px, py, CELL_SIZE, CELL_SIZE)
@@ -197,6 +235,18 @@ class Obstacle:
     def grid_pos(self):
         return self.rect.x // CELL_SIZE, (self.rect.y - INFO_BAR_HEIGHT) // CELL_SIZE
 
+def obstacles_near(obstacles: Dict[Tuple[int, int], Obstacle], rect: pygame.Rect) -> List[Obstacle]:
+    # obstacles are keyed by grid cell already, so the dict doubles as a spatial hash:
+    # only look up the (at most a handful of) cells the rect overlaps
+    cx0 = max(rect.left // CELL_SIZE, 0); cx1 = min((rect.right - 1) // CELL_SIZE, GRID_SIZE - 1)
+    cy0 = max((rect.top - INFO_BAR_HEIGHT) // CELL_SIZE, 0); cy1 = min((rect.bottom - 1 - INFO_BAR_HEIGHT) // CELL_SIZE, GRID_SIZE - 1)
+    found = []
+    for cy in range(cy0, cy1 + 1):
+        for cx in range(cx0, cx1 + 1):
+            ob = obstacles.get((cx, cy))
+            if ob is not None: found.append(ob)
+    return found
+
 class MainBlock(Obstacle):
     def __init__(self, x: int, y: int, health: Optional[int] = MAIN_BLOCK_HEALTH):
         super().__init__(x, y, "Destructible", health)
@@ -214,21 +264,15 @@ class Player:
         self.x = pos[0] * CELL_SIZE; self.y = pos[1] * CELL_SIZE
         self.speed = speed; self.size = CELL_SIZE - 6
         self.rect = pygame.Rect(self.x, self.y + INFO_BAR_HEIGHT, self.size, self.size)
+        self._probe_rect = self.rect.copy()  # reused for collision probes, mutated in place
     @property
     def pos(self):
         return int((self.x + self.size // 2) // CELL_SIZE), int((self.y + self.size // 2) // CELL_SIZE)
     def move(self, keys, obstacles):
-        dx=dy=0
-        if keys[pygame.K_w]: dy-=1
-        if keys[pygame.K_s]: dy+=1
-        if keys[pygame.K_a]: dx-=1
-        if keys[pygame.K_d]: dx+=1
-        if dx and dy: dx*=0.7071; dy*=0.7071
+        dx, dy = _MOVE_TABLE[(bool(keys[pygame.K_w]), bool(keys[pygame.K_a]), bool(keys[pygame.K_s]), bool(keys[pygame.K_d]))]
         nx = self.x + dx*self.speed; ny = self.y + dy*self.speed
-        next_rect = pygame.Rect(int(nx), int(ny)+INFO_BAR_HEIGHT, self.size, self.size)
-        can_move = True
-        for ob in obstacles.values():
-            if next_rect.colliderect(ob.rect): can_move=False; break
+        next_rect = self._probe_rect; next_rect.x = int(nx); next_rect.y = int(ny)+INFO_BAR_HEIGHT
+        can_move = next_rect.collidelist([ob.rect for ob in obstacles_near(obstacles, next_rect)]) == -1
         if can_move and 0<=nx<WINDOW_SIZE-self.size and 0<=ny<WINDOW_SIZE-self.size:
             self.x=nx; self.y=ny; self.rect.x=int(self.x); self.rect.y=int(self.y)+INFO_BAR_HEIGHT
     def draw(self, screen):
@@ -243,30 +287,42 @@ class Enemy:
         if ztype=="tank": self.attack = int(self.attack*0.5)
         self.size=CELL_SIZE-6
         self.rect=pygame.Rect(self.x, self.y+INFO_BAR_HEIGHT, self.size, self.size)
+        # cached A* route (reversed, next waypoint last); rebuilt only when the player changes cell or an obstacle falls
+        self._path: List[Tuple[int, int]] = []; self._path_goal = None; self._path_version = -1
     @property
     def pos(self): return int((self.x + self.size // 2) // CELL_SIZE), int((self.y + self.size // 2) // CELL_SIZE)
+    def next_waypoint(self, player, game_state) -> Optional[Tuple[int, int]]:
+        goal = player.pos
+        if goal != self._path_goal or game_state.version != self._path_version:
+            route = a_star_grid(build_cost_grid(game_state.obstacles), self.pos, goal)
+            self._path = route[:0:-1]; self._path_goal = goal; self._path_version = game_state.version
+        here = self.pos
+        while self._path and self._path[-1] == here: self._path.pop()
+        return self._path[-1] if self._path else None
     def move_and_attack(self, player, obstacles, game_state, attack_interval=0.5, dt=1/60):
         if not hasattr(self, 'attack_timer'): self.attack_timer=0
         self.attack_timer += dt
-        dx = player.x - self.x; dy = player.y - self.y; speed = self.speed
-        dirs = []
-        if abs(dx)>abs(dy): dirs=[(sign(dx),0),(0,sign(dy)),(sign(dx),sign(dy)),(-sign(dx),0),(0,-sign(dy))]
-        else: dirs=[(0,sign(dy)),(sign(dx),0),(sign(dx),sign(dy)),(0,-sign(dy)),(-sign(dx),0)]
+        wp = self.next_waypoint(player, game_state)
+        if wp is not None: dx = wp[0]*CELL_SIZE - self.x; dy = wp[1]*CELL_SIZE - self.y
+        else: dx = player.x - self.x; dy = player.y - self.y  # no route / same cell: greedy chase
+        speed = self.speed
+        dirs = DIR_TABLE[((dx>0)-(dx<0), (dy>0)-(dy<0), 1 if abs(dx)>abs(dy) else 0)]
+        ob_rects = [ob.rect for ob in obstacles]
+        next_rect = self.rect.copy(); rx, ry = self.rect.x, self.rect.y
         for ddx, ddy in dirs:
-            if ddx==0 and ddy==0: continue
-            next_rect = self.rect.move(ddx*speed, ddy*speed)
+            next_rect.x = rx + int(ddx*speed); next_rect.y = ry + int(ddy*speed)
             blocked=False
-            for ob in obstacles:
-                if next_rect.colliderect(ob.rect):
-                    if ob.type=="Destructible":
-                        if self.attack_timer>=attack_interval:
-                            ob.health-=self.attack; self.attack_timer=0
-                            if ob.health<=0:
-                                gp=ob.grid_pos
-                                if gp in game_state.obstacles: del game_state.obstacles[gp]
-                        blocked=True; break
-                    elif ob.type=="Indestructible":
-                        blocked=True; break
+            hit = next_rect.collidelist(ob_rects)
+            if hit != -1:
+                ob = obstacles[hit]
+                if ob.type=="Destructible":
+                    if self.attack_timer>=attack_interval:
+                        ob.health-=self.attack; self.attack_timer=0
+                        if ob.health<=0:
+                            game_state.destroy_obstacle(ob.grid_pos)
+                    blocked=True
+                elif ob.type=="Indestructible":
+                    blocked=True
             if not blocked:
                 self.x+=ddx*speed; self.y+=ddy*speed
                 self.rect.x=int(self.x); self.rect.y=int(self.y)+INFO_BAR_HEIGHT
@@ -275,30 +331,75 @@ class Enemy:
         pygame.draw.rect(screen, (255, 60, 60), self.rect)
 
 # ==================== 算法函数 ====================
+# 按血量预先算好 ceil(hp / ENEMY_ATTACK) (A* 中可破坏障碍的额外代价), 超出表范围时再现算
+_K_STEPS = tuple(math.ceil(h / ENEMY_ATTACK) for h in range(MAIN_BLOCK_HEALTH + 1))
+_K_FACTOR = tuple(k * 0.1 for k in _K_STEPS)
 def sign(v): return 1 if v>0 else (-1 if v<0 else 0)
 def heuristic(a,b): return abs(a[0]-b[0]) + abs(a[1]-b[1])
 
-def a_star_search(graph: Graph, start: Tuple[int, int], goal: Tuple[int, int], obstacles: Dict[Tuple[int, int], Obstacle]):
-    frontier = PriorityQueue(); frontier.put((0, start))
+def a_star_search(graph: Optional[Graph], start: Tuple[int, int], goal: Tuple[int, int], obstacles: Dict[Tuple[int, int], Obstacle]):
+    # plain heapq list (no lock like PriorityQueue); counter breaks ties so nodes are never compared
+    # 4-connected grid: neighbours/costs are computed inline, `graph` is unused and kept for old callers
+    tie = count()
+    frontier = [(0, next(tie), start)]
     came_from = {start: None}; cost_so_far = {start: 0}
-    while not frontier.empty():
-        _, current = frontier.get()
+    while frontier:
+        _, _, current = heapq.heappop(frontier)
         if current == goal: break
-        for neighbor in graph.neighbors(current):
-            new_cost = cost_so_far[current] + graph.cost(current, neighbor)
-            if neighbor in obstacles:
-                obstacle = obstacles[neighbor]
+        cx, cy = current; base = cost_so_far[current]
+        for neighbor in ((cx-1, cy), (cx+1, cy), (cx, cy-1), (cx, cy+1)):
+            if not (0 <= neighbor[0] < GRID_SIZE and 0 <= neighbor[1] < GRID_SIZE): continue
+            new_cost = base + 1
+            obstacle = obstacles.get(neighbor)
+            if obstacle is not None:
                 if obstacle.type == "Indestructible": continue
                 elif obstacle.type == "Destructible":
-                    k_factor = (math.ceil(obstacle.health / ENEMY_ATTACK)) * 0.1
-                    new_cost = cost_so_far[current] + 1 + k_factor
+                    h = obstacle.health
+                    k_factor = _K_FACTOR[h] if 0 <= h <= MAIN_BLOCK_HEALTH else math.ceil(h / ENEMY_ATTACK) * 0.1
+                    new_cost = base + 1 + k_factor
             if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
                 cost_so_far[neighbor] = new_cost
                 priority = new_cost + heuristic(goal, neighbor)
-                frontier.put((priority, neighbor))
+                heapq.heappush(frontier, (priority, next(tie), neighbor))
                 came_from[neighbor] = current
     return came_from, cost_so_far
 
+def build_cost_grid(obstacles: Dict[Tuple[int, int], Obstacle], grid_size: int = GRID_SIZE) -> List[int]:
+    # flat row-major step costs (index y*grid_size+x): -1 = impassable, else cost to enter the cell.
+    # scaled x10 so the 0.1 per-hit factor stays integral and the heap only compares ints
+    cost = [10] * (grid_size * grid_size)
+    for (x, y), ob in obstacles.items():
+        if ob.type == "Indestructible": cost[y*grid_size + x] = -1
+        elif ob.type == "Destructible":
+            h = ob.health
+            cost[y*grid_size + x] = 10 + (_K_STEPS[h] if 0 <= h <= MAIN_BLOCK_HEALTH else math.ceil(h / ENEMY_ATTACK))
+    return cost
+
+def a_star_grid(cost: List[int], start: Tuple[int, int], goal: Tuple[int, int], grid_size: int = GRID_SIZE) -> List[Tuple[int, int]]:
+    # same search as a_star_search, but over build_cost_grid(): int nodes + flat lists instead of tuple-keyed dicts
+    n = grid_size; unseen = 1 << 30
+    s = start[1]*n + start[0]; g = goal[1]*n + goal[0]; gx, gy = goal
+    came_from = [-1] * (n*n); best = [unseen] * (n*n)
+    came_from[s] = s; best[s] = 0
+    tie = count(); frontier = [(0, next(tie), s)]
+    while frontier:
+        _, _, cur = heapq.heappop(frontier)
+        if cur == g: break
+        cy, cx = divmod(cur, n); base = best[cur]
+        for nx, ny in ((cx-1, cy), (cx+1, cy), (cx, cy-1), (cx, cy+1)):
+            if not (0 <= nx < n and 0 <= ny < n): continue
+            nb = ny*n + nx; c = cost[nb]
+            if c < 0: continue
+            new_cost = base + c
+            if new_cost < best[nb]:
+                best[nb] = new_cost; came_from[nb] = cur
+                heapq.heappush(frontier, (new_cost + 10 * (abs(gx-nx) + abs(gy-ny)), next(tie), nb))
+    if came_from[g] == -1: return [start]
+    path = []; cur = g
+    while cur != s:
+        path.append((cur % n, cur // n)); cur = came_from[cur]
+    path.append(start); path.reverse(); return path
+
 def is_not_edge(pos, grid_size):
     x, y = pos; return 1 <= x < grid_size - 1 and 1 <= y < grid_size - 1
 
@@ -323,22 +424,26 @@ def reconstruct_path(came_from: Dict, start: Tuple[int, int], goal: Tuple[int, i
 
 # ==================== 游戏初始化函数 ====================
 def generate_game_entities(grid_size: int, obstacle_count: int, item_count: int, enemy_count: int, main_block_hp: int):
-    all_positions = [(x, y) for x in range(grid_size) for y in range(grid_size)]
-    corners = [(0, 0), (0, grid_size - 1), (grid_size - 1, 0), (grid_size - 1, grid_size - 1)]
-    forbidden = set(corners)
+    # occupancy mask indexed [x, y]; np.nonzero walks it x-major, same order as the old all_positions list
+    occ = np.zeros((grid_size, grid_size), dtype=bool)
+    occ[0, 0] = occ[0, -1] = occ[-1, 0] = occ[-1, -1] = True  # corners
+    edge = np.ones((grid_size, grid_size), dtype=bool); edge[1:-1, 1:-1] = False
+    def free_cells(mask):
+        xs, ys = np.nonzero(~mask); return list(zip(xs.tolist(), ys.tolist()))
     def pick_valid_positions(min_distance: int, count: int):
-        empty = [p for p in all_positions if p not in forbidden]
+        empty = free_cells(occ)
         while True:
             picks = random.sample(empty, count + 1)
             player_pos, enemies = picks[0], picks[1:]
             if all(abs(player_pos[0] - z[0]) + abs(player_pos[1] - z[1]) >= min_distance for z in enemies):
                 return player_pos, enemies
     player_pos, enemy_pos_list = pick_valid_positions(min_distance=5, count=enemy_count)
-    forbidden |= {player_pos}; forbidden |= set(enemy_pos_list)
-    main_item_candidates = [p for p in all_positions if p not in forbidden and is_not_edge(p, grid_size)]
-    main_item_pos = random.choice(main_item_candidates); forbidden.add(main_item_pos)
+    occ[player_pos] = True
+    for p in enemy_pos_list: occ[p] = True
+    main_item_candidates = free_cells(occ | edge)
+    main_item_pos = random.choice(main_item_candidates); occ[main_item_pos] = True
     obstacles = {main_item_pos: MainBlock(main_item_pos[0], main_item_pos[1], health=main_block_hp)}
-    rest_obstacle_candidates = [p for p in all_positions if p not in forbidden]
+    rest_obstacle_candidates = free_cells(occ)
     rest_count = obstacle_count - 1
     rest_obstacle_positions = random.sample(rest_obstacle_candidates, rest_count)
     destructible_count = int(rest_count * DESTRUCTIBLE_RATIO)
@@ -347,8 +452,8 @@ def generate_game_entities(grid_size: int, obstacle_count: int, item_count: int,
         obstacles[pos] = Obstacle(pos[0], pos[1], "Destructible", health=OBSTACLE_HEALTH)
     for pos in rest_obstacle_positions[destructible_count:]:
         obstacles[pos] = Obstacle(pos[0], pos[1], "Indestructible")
-    forbidden |= set(obstacles.keys())
-    item_candidates = [p for p in all_positions if p not in forbidden]
+    for p in obstacles: occ[p] = True
+    item_candidates = free_cells(occ)
     other_items = random.sample(item_candidates, item_count - 1)
     items = [Item(pos[0], pos[1]) for pos in other_items]
     items.append(Item(main_item_pos[0], main_item_pos[1], is_main=True))
@@ -375,52 +480,94 @@ class GameState:
     def __init__(self, obstacles: Dict, items: Set, main_item_pos: List[Tuple[int, int]]):
         self.obstacles = obstacles
         self.items = items
+        self.item_rects = [item.rect for item in items]  # kept index-aligned with self.items
         self.destructible_count = self.count_destructible_obstacles()
         self.main_item_pos = main_item_pos
+        self.version = 0  # bumped on every obstacle change, so derived data can tell when it is stale
+        self.main_block_present = any(ob.is_main_block for ob in obstacles.values())
     def count_destructible_obstacles(self) -> int:
         return sum(1 for obs in self.obstacles.values() if obs.type == "Destructible")
     def collect_item(self, player_rect):
-        for item in list(self.items):
-            if player_rect.colliderect(item.rect):
-                if item.is_main and any(getattr(ob, "is_main_block", False) for ob in self.obstacles.values()):
-                    return False
-                self.items.remove(item); return True
-        return False
+        idx = player_rect.collidelist(self.item_rects)
+        if idx == -1: return False
+        if self.items[idx].is_main and self.main_block_present:
+            return False
+        del self.items[idx]; del self.item_rects[idx]; return True
+    def nearby(self, rect: pygame.Rect) -> List[Obstacle]:
+        return obstacles_near(self.obstacles, rect)
     def destroy_obstacle(self, pos: Tuple[int, int]):
         if pos in self.obstacles:
             if self.obstacles[pos].type == "Destructible": self.destructible_count -= 1
-            del self.obstacles[pos]
+            if self.obstacles[pos].is_main_block: self.main_block_present = False
+            del self.obstacles[pos]; self.version += 1
 
 # ==================== 游戏渲染函数 ====================
-def render_game(screen: pygame.Surface, game_state, player: Player, enemies: List[Enemy]) -> pygame.Surface:
-    screen.fill((20, 20, 20))
-    pygame.draw.rect(screen, (0, 0, 0), (0, 0, WINDOW_SIZE, INFO_BAR_HEIGHT))
-    font = pygame.font.SysFont(None, 28)
-    item_txt = font.render(f"ITEMS: {len(game_state.items)}", True, (255, 255, 80))
-    screen.blit(item_txt, (12, 12))
+_grid_bg: Optional[pygame.Surface] = None
+# 上一帧的动态内容, 用于 display.update(dirty_rects); None 表示下一帧整屏 flip
+_prev_frame: Optional[dict] = None
+INFO_BAR_RECT = pygame.Rect(0, 0, WINDOW_SIZE, INFO_BAR_HEIGHT)
+
+def _build_grid_bg() -> pygame.Surface:
+    # static layer: background, info bar and grid lines, drawn once and blitted every frame
+    bg = pygame.Surface((WINDOW_SIZE, TOTAL_HEIGHT)).convert()
+    bg.fill((20, 20, 20))
+    pygame.draw.rect(bg, (0, 0, 0), (0, 0, WINDOW_SIZE, INFO_BAR_HEIGHT))
     for y in range(GRID_SIZE):
         for x in range(GRID_SIZE):
             rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE + INFO_BAR_HEIGHT, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, (50, 50, 50), rect, 1)
+            pygame.draw.rect(bg, (50, 50, 50), rect, 1)
+    return bg
+
+@lru_cache(maxsize=1)
+def _tile_surfs() -> Dict[str, pygame.Surface]:
+    # one solid tile per obstacle kind; blitting these beats a draw.rect per obstacle
+    tiles = {}
+    for kind, color in (("main", (255, 220, 80)), ("indest", (120, 120, 120)), ("dest", (200, 80, 80))):
+        t = pygame.Surface((CELL_SIZE, CELL_SIZE)).convert(); t.fill(color); tiles[kind] = t
+    return tiles
+
+def render_game(screen: pygame.Surface, game_state, player: Player, enemies: List[Enemy], full_redraw: bool = False) -> pygame.Surface:
+    global _grid_bg, _prev_frame
+    if _grid_bg is None: _grid_bg = _build_grid_bg()
+    screen.blit(_grid_bg, (0, 0))
+    font = _font(28)
+    item_txt = font.render(f"ITEMS: {len(game_state.items)}", True, (255, 255, 80))
+    screen.blit(item_txt, (12, 12))
     for item in game_state.items:
         color = (255, 255, 100) if item.is_main else (255, 255, 0)
         pygame.draw.circle(screen, color, item.center, item.radius)
     pygame.draw.rect(screen, (0, 255, 0), player.rect)
     for enemy in enemies: pygame.draw.rect(screen, (255, 60, 60), enemy.rect)
+    tiles = _tile_surfs(); tile_blits = []; label_blits = []
     for obstacle in game_state.obstacles.values():
-        is_main = hasattr(obstacle, 'is_main_block') and obstacle.is_main_block
-        if is_main: color = (255, 220, 80)
-        elif obstacle.type == "Indestructible": color = (120, 120, 120)
-        else: color = (200, 80, 80)
-        pygame.draw.rect(screen, color, obstacle.rect)
+        is_main = obstacle.is_main_block
+        x, y = obstacle.rect.topleft
+        if is_main: tile = tiles["main"]
+        elif obstacle.type == "Indestructible": tile = tiles["indest"]
+        else: tile = tiles["dest"]
+        tile_blits.append((tile, (x, y)))
         if obstacle.type == "Destructible":
-            font = pygame.font.SysFont(None, 30)
-            health_text = font.render(str(obstacle.health), True, (255, 255, 255))
-            screen.blit(health_text, (obstacle.rect.x + 6, obstacle.rect.y + 8))
+            label_blits.append((_hp_surf(obstacle.health), (x + 6, y + 8)))
         if is_main:
-            star = pygame.font.SysFont(None, 32).render("★", True, (255, 255, 120))
-            screen.blit(star, (obstacle.rect.x + 8, obstacle.rect.y + 8))
-    pygame.display.flip()
+            label_blits.append((_star_surf(), (x + 8, y + 8)))
+    # tiles first, then hp/star labels on top, each batch in a single C-side loop
+    screen.blits(tile_blits, doreturn=False)
+    screen.blits(label_blits, doreturn=False)
+    # push only what changed: movers (old + new spot), info bar, touched obstacles, collected items
+    movers = [player.rect.copy()] + [e.rect.copy() for e in enemies]
+    hp = {pos: ob.health for pos, ob in game_state.obstacles.items()}
+    item_rects = list(game_state.item_rects)
+    if full_redraw or _prev_frame is None:
+        pygame.display.flip()
+    else:
+        prev = _prev_frame
+        dirty = [INFO_BAR_RECT] + movers + prev["movers"]
+        for pos, h in prev["hp"].items():
+            if hp.get(pos) != h: dirty.append(pygame.Rect(pos[0]*CELL_SIZE, pos[1]*CELL_SIZE + INFO_BAR_HEIGHT, CELL_SIZE, CELL_SIZE))
+        if len(item_rects) != len(prev["items"]):
+            dirty.extend(r for r in prev["items"] if r not in item_rects)
+        pygame.display.update(dirty)
+    _prev_frame = {"movers": movers, "hp": hp, "items": item_rects}
     # return a copy of the frame for dim overlay screens
     return screen.copy()
 
@@ -461,13 +608,14 @@ def main_run_level(config, chosen_enemy_type:str) -> Tuple[str, Optional[str], p
         player.move(keys, game_state.obstacles)
         game_state.collect_item(player.rect)
         for enemy in enemies:
-            enemy.move_and_attack(player, list(game_state.obstacles.values()), game_state)
+            reach = int(math.ceil(enemy.speed)) * 2
+            enemy.move_and_attack(player, game_state.nearby(enemy.rect.inflate(reach, reach)), game_state)
             player_rect = pygame.Rect(int(player.x), int(player.y) + INFO_BAR_HEIGHT, player.size, player.size)
             if enemy.rect.colliderect(player_rect):
                 game_result = "fail"; running=False; break
         if not game_state.items:
             game_result = "success"; running=False
-        last_frame = render_game(pygame.display.get_surface(), game_state, player, enemies)
+        last_frame = render_game(screen, game_state, player, enemies, full_redraw=last_frame is None)
         clock.tick(60)
     return game_result, config.get("reward", None), last_frame
 
@@ -477,14 +625,14 @@ def select_enemy_screen(screen, owned_cards:List[str]) -> str:
     clock = pygame.time.Clock()
     while True:
         screen.fill((18,18,18))
-        title = pygame.font.SysFont(None, 48).render("Choose Next Level's Enemy", True, (230,230,230))
+        title = _font(48).render("Choose Next Level's Enemy", True, (230,230,230))
         screen.blit(title, title.get_rect(center=(WINDOW_SIZE//2, 110)))
         rects=[]
         for i, card in enumerate(owned_cards):
             x = WINDOW_SIZE//2 - (len(owned_cards)*140)//2 + i*140
             rect = pygame.Rect(x, 180, 120, 160)
             pygame.draw.rect(screen, (200,200,200), rect)
-            name = pygame.font.SysFont(None, 24).render(card.replace("_"," ").upper(), True, (30,30,30))
+            name = _font(24).render(card.replace("_"," ").upper(), True, (30,30,30))
             screen.blit(name, name.get_rect(center=(rect.centerx, rect.bottom-18)))
             pygame.draw.rect(screen, (40,40,40), rect, 3)
             rects.append((rect, card))
@@ -4,7 +4,8 @@ import math
 import random
 import json
 import os
-from queue import PriorityQueue
+import heapq
+from functools import lru_cache
 from typing import Dict, List, Set, Tuple, Optional
 
 
@@ -16,7 +17,55 @@ def flush_events():
         pass
 
 
+# 窗口被遮挡/最小化后恢复时会收到这两类事件：静态菜单必须借此重绘，否则一直是空白或旧画面
+REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)
+# 菜单只关心这几类事件；鼠标移动等在 C 层就丢掉，不再构造成 Python 对象
+MENU_EVENTS = (pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN) + REDRAW_EVENTS
+
+
+def poll_events(types=None) -> list:
+    """pump 一次，再按类型一次性取出；其余事件直接清掉，避免堆满队列。"""
+    if types is None:
+        return pygame.event.get()
+    pygame.event.pump()
+    events = pygame.event.get(types, pump=False)
+    pygame.event.clear(pump=False)
+    return events
+
+
+def wait_events(timeout: int = 100, types=None) -> list:
+    """阻塞等待事件（空闲时进程真正休眠），有事件则连同队列中剩余的一并取出。"""
+    first = pygame.event.wait(timeout)
+    if first.type == pygame.NOEVENT:
+        return []
+    rest = poll_events(types)
+    if types is not None and first.type not in types:
+        return rest
+    return [first] + rest
+
+
 # --- UI helper ---
+@lru_cache(maxsize=8)
+def dim_surface(size: Tuple[int, int], alpha: int, per_pixel: bool = False) -> pygame.Surface:
+    """Shared translucent black overlay; keyed by size so a view resize gets a fresh one."""
+    if per_pixel:
+        dim = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        dim.fill((0, 0, 0, alpha))
+    else:
+        dim = pygame.Surface(size).convert()
+        dim.set_alpha(alpha)
+        dim.fill((0, 0, 0))
+    return dim
+
+
+def scaled_to_view(surf: pygame.Surface) -> pygame.Surface:
+    """Return a display-format copy of surf at view size; skips smoothscale when it already matches."""
+    surf = surf.convert()  # always a fresh copy, safe to draw on
+    if surf.get_size() == (VIEW_W, VIEW_H):
+        return surf
+    return pygame.transform.smoothscale(surf, (VIEW_W, VIEW_H))
+
+
 def pause_settings_only(screen, background_surf):
     """
     Show the Pause menu but only let the player go into Settings and then come back.
@@ -47,8 +96,10 @@ def pause_from_overlay(screen, bg_surface):
 
 
 # --- Font helper ---
+@lru_cache(maxsize=16)
 def mono_font(size: int) -> "pygame.font.Font":
     # Try common monospaced fonts; fall back safely
+    # 缓存：HUD 每帧都会取，match_font 查找系统字体很慢
     candidates = ["Consolas", "Menlo", "DejaVu Sans Mono", "Courier New", "monospace"]
     try:
         name = pygame.font.match_font(candidates)
@@ -59,6 +110,19 @@ def mono_font(size: int) -> "pygame.font.Font":
     return pygame.font.SysFont("monospace", size)
 
 
+@lru_cache(maxsize=32)
+def _font(size: int) -> "pygame.font.Font":
+    # 同一字号只构建一次，避免每帧 SysFont 重新查找字体
+    return pygame.font.SysFont(None, size)
+
+
+@lru_cache(maxsize=128)
+def _hud_text(text: str, color: Tuple[int, int, int], size: int, mono: bool = False) -> pygame.Surface:
+    # HUD 文字按 (内容, 颜色, 字号) 缓存，内容不变的帧直接复用同一张 Surface
+    font = mono_font(size) if mono else _font(size)
+    return font.render(text, True, color).convert_alpha()
+
+
 def draw_ui_topbar(screen, game_state, player, time_left: float | None = None) -> None:
     """
     顶栏 HUD（绝对屏幕坐标，不受相机/等距相机影响）
@@ -68,29 +132,26 @@ def draw_ui_topbar(screen, game_state, player, time_left: float | None = None) -
     # 背板
     pygame.draw.rect(screen, (0, 0, 0), (0, 0, VIEW_W, INFO_BAR_HEIGHT))
 
-    # 字体
-    font_timer = pygame.font.SysFont(None, 28)
-    mono_small = mono_font(22)
-    font_hp = mono_font(22)
+    # 文字走 _hud_text 缓存：计时器每秒才变一次，其余数值变化更少
 
     # ===== 计时器（居中） =====
     tleft = float(time_left if time_left is not None else globals().get("_time_left_runtime", LEVEL_TIME_LIMIT))
     tleft = max(0.0, tleft)
     mins = int(tleft // 60)
     secs = int(tleft % 60)
-    timer_txt = font_timer.render(f"{mins:02d}:{secs:02d}", True, (255, 255, 255))
+    timer_txt = _hud_text(f"{mins:02d}:{secs:02d}", (255, 255, 255), 28)
     center_x = VIEW_W // 2
     screen.blit(timer_txt, (center_x - timer_txt.get_width() // 2, 10))
 
     # ===== 关卡 LV（在计时器左侧 12px）=====
     level_idx = int(getattr(game_state, "current_level", 0))  # 0-based
-    level_img = mono_small.render(f"LV {level_idx + 1:02d}", True, (255, 255, 255))
+    level_img = _hud_text(f"LV {level_idx + 1:02d}", (255, 255, 255), 22, True)
     level_x = center_x - timer_txt.get_width() // 2 - level_img.get_width() - 12
     screen.blit(level_img, (level_x, 10))
 
     # ===== 威胁预算 BDG（在计时器右侧 12px）=====
     bdg_val = budget_for_level(level_idx)
-    bdg_img = mono_small.render(f"BDG {bdg_val}", True, (200, 200, 220))
+    bdg_img = _hud_text(f"BDG {bdg_val}", (200, 200, 220), 22, True)
     bdg_x = center_x + timer_txt.get_width() // 2 + 12
     screen.blit(bdg_img, (bdg_x, 10))
 
@@ -105,7 +166,7 @@ def draw_ui_topbar(screen, game_state, player, time_left: float | None = None) -
     pygame.draw.rect(screen, (0, 200, 80), (bx, by, int(bar_w * ratio), bar_h), border_radius=3)
     # 数字覆盖在进度条中间
     hp_text = f"{int(getattr(player, 'hp', 0))}/{int(getattr(player, 'max_hp', 0))}"
-    hp_img = font_hp.render(hp_text, True, (20, 20, 20))
+    hp_img = _hud_text(hp_text, (20, 20, 20), 22, True)
     screen.blit(hp_img, hp_img.get_rect(center=(bx + bar_w // 2, by + bar_h // 2 + 1)))
 
     # ===== XP 条（紧贴 HP 条下方）=====
@@ -118,17 +179,16 @@ def draw_ui_topbar(screen, game_state, player, time_left: float | None = None) -
     pygame.draw.rect(screen, (40, 40, 40), (xp_bx, xp_by, xp_bar_w, xp_bar_h), border_radius=3)
     pygame.draw.rect(screen, (120, 110, 255), (xp_bx, xp_by, int(xp_bar_w * xp_ratio), xp_bar_h), border_radius=3)
     # 小标签（在条右侧显示等级）
-    xp_label = mono_small.render(f"Lv {int(getattr(player, 'level', 1))}", True, (210, 210, 230))
+    xp_label = _hud_text(f"Lv {int(getattr(player, 'level', 1))}", (210, 210, 230), 22, True)
     screen.blit(xp_label, (xp_bx + xp_bar_w + 8, xp_by - 6))
 
     # ===== 右上角：物品 & 金币 =====
-    hud_font = font_timer  # 统一字号
     # 物品（最右）
     total_items = int(getattr(game_state, "items_total", len(getattr(game_state, "items", []))))
     collected = max(0, total_items - len(getattr(game_state, "items", [])))
     icon_x, icon_y = VIEW_W - 120, 10
     pygame.draw.circle(screen, (255, 255, 0), (icon_x, icon_y + 8), 8)
-    items_text = hud_font.render(f"{collected}/{total_items}", True, (255, 255, 255))
+    items_text = _hud_text(f"{collected}/{total_items}", (255, 255, 255), 28)
     screen.blit(items_text, (icon_x + 18, icon_y))
 
     # 金币（物品左侧）
@@ -136,7 +196,7 @@ def draw_ui_topbar(screen, game_state, player, time_left: float | None = None) -
     coin_x, coin_y = VIEW_W - 220, 10
     pygame.draw.circle(screen, (255, 215, 80), (coin_x, coin_y + 8), 8)
     pygame.draw.circle(screen, (255, 245, 200), (coin_x, coin_y + 8), 8, 1)
-    spoils_text = hud_font.render(f"{spoils_total}", True, (255, 255, 255))
+    spoils_text = _hud_text(f"{spoils_total}", (255, 255, 255), 28)
     screen.blit(spoils_text, (coin_x + 14, coin_y))
 
 
@@ -163,6 +223,7 @@ def pause_game_modal(screen, bg_surface, clock, time_left):
     # 4) reset the clock baseline so the next tick doesn't produce a huge dt
     clock.tick(60)
     flush_events()
+    reset_present()  # 暂停菜单盖住了整屏，回到游戏时先整屏刷新
     return choice, time_left
 
 
@@ -197,6 +258,7 @@ DECOR_DENSITY = 0.06  # proportion of tiles to place non-blocking decorations
 MIN_ITEMS = 8  # ensure enough items on larger maps
 DESTRUCTIBLE_RATIO = 0.3
 PLAYER_SPEED = 5
+_INV_SQRT2 = 0.7071067811865476  # 斜向移动归一化（1/√2）
 ENEMY_SPEED = 2
 ENEMY_SPEED_MAX = 5
 ENEMY_ATTACK = 10
@@ -331,6 +393,14 @@ ENEMY_COLORS = {
     "shielder": (60, 160, 255),
 }
 
+# --- enemy card id -> starting enemy type (select_enemy_screen) ---
+_ZTYPE_MAP = {
+    "enemy_fast": "fast",
+    "enemy_tank": "tank",
+    "enemy_strong": "strong",
+    "basic": "basic"
+}
+
 # --- wave spawning ---
 SPAWN_INTERVAL = 8.0
 SPAWN_BASE = 3
@@ -394,6 +464,10 @@ BULLET_DAMAGE_ENEMY = 12
 BULLET_DAMAGE_BLOCK = 10
 ENEMY_SHOT_DAMAGE_BLOCK = BULLET_DAMAGE_BLOCK
 MAX_FIRE_RANGE = 800.0  # pixels
+_MAX_FIRE_RANGE_SQ = MAX_FIRE_RANGE * MAX_FIRE_RANGE  # 射程判断直接比平方距离
+TARGET_BUCKET = 4  # 自动索敌的粗网格边长（格），按桶一圈圈向外找方块
+SIM_DT = 1 / 60  # 固定模拟步长（秒）；移动速度按 60Hz 每步像素设计
+MAX_FRAME_DT = 0.25  # 单帧最多补这么多模拟时间，避免卡顿后连环补步
 # --- survival mode & player health ---
 LEVEL_TIME_LIMIT = 45.0  # seconds per run
 PLAYER_MAX_HP = 40  # player total health
@@ -471,34 +545,34 @@ def capture_snapshot(game_state, player, enemies, current_level: int, enemy_card
             "player": {"x": float(player.x), "y": float(player.y),
                        "speed": player.speed, "size": player.size,
                        "fire_cd": float(getattr(player, "fire_cd", 0.0)),
-                       "hp": int(getattr(player, "hp", PLAYER_MAX_HP)),
-                       "max_hp": int(getattr(player, "max_hp", PLAYER_MAX_HP)),
-                       "hit_cd": float(getattr(player, "hit_cd", 0.0)),
-                       "level": int(getattr(player, "level", 1)),
-                       "xp": int(getattr(player, "xp", 0))},
+                       "hp": int(player.hp),
+                       "max_hp": int(player.max_hp),
+                       "hit_cd": float(player.hit_cd),
+                       "level": int(player.level),
+                       "xp": int(player.xp)},
             "enemies": [{
                 "x": float(z.x), "y": float(z.y),
-                "attack": int(getattr(z, "attack", 10)),
-                "speed": int(getattr(z, "speed", 2)),
-                "type": str(getattr(z, "type", "basic")),
-                "hp": int(getattr(z, "hp", 30)),
-                "max_hp": int(getattr(z, "max_hp", getattr(z, "hp", 30))),
-                "spawn_elapsed": float(getattr(z, "_spawn_elapsed", 0.0)),
-                "attack_timer": float(getattr(z, "attack_timer", 0.0)),
+                "attack": int(z.attack),
+                "speed": int(z.speed),
+                "type": str(z.type),
+                "hp": int(z.hp),
+                "max_hp": int(z.max_hp),
+                "spawn_elapsed": float(z._spawn_elapsed),
+                "attack_timer": float(z.attack_timer),
             } for z in enemies],
             "obstacles": [{
-                "x": int(ob.rect.x // CELL_SIZE),
-                "y": int((ob.rect.y - INFO_BAR_HEIGHT) // CELL_SIZE),
+                "x": ob.grid_pos[0],
+                "y": ob.grid_pos[1],
                 "type": ob.type,
                 "health": None if ob.health is None else int(ob.health),
-                "main": bool(getattr(ob, "is_main_block", False)),
+                "main": ob.is_main_block,
             } for ob in game_state.obstacles.values()],
             "items": [{
                 "x": int(it.x),
                 "y": int(it.y),
                 "is_main": bool(it.is_main),
             } for it in game_state.items],
-            "decorations": [[int(dx), int(dy)] for (dx, dy) in getattr(game_state, "decorations", [])],
+            "decorations": [[int(dx), int(dy)] for (dx, dy) in game_state.decorations],
             "bullets": [{
                 "x": float(b.x), "y": float(b.y),
                 "vx": float(b.vx), "vy": float(b.vy),
@@ -577,7 +651,7 @@ def draw_button(screen, label, pos, size=(180, 56), bg=(40, 40, 40), fg=(240, 24
     rect = pygame.Rect(pos, size)
     pygame.draw.rect(screen, border, rect.inflate(6, 6))
     pygame.draw.rect(screen, bg, rect)
-    font = pygame.font.SysFont(None, 32)
+    font = _font(32)
     txt = font.render(label, True, fg)
     screen.blit(txt, txt.get_rect(center=rect.center))
     return rect
@@ -628,44 +702,52 @@ def draw_settings_gear(screen, x, y):
 def show_start_menu(screen):
     """Return a tuple ('new', None) or ('continue', save_data) based on player's choice."""
     flush_events()
-    clock = pygame.time.Clock()
-    title_font = pygame.font.SysFont(None, 64)
-    subtitle_font = pygame.font.SysFont(None, 24)
+    title_font = _font(64)
+    subtitle_font = _font(24)
+    # 标题/副标题是静态的，进菜单时渲染一次
+    title = title_font.render(GAME_TITLE, True, (230, 230, 210))
+    title_rect = title.get_rect(center=(VIEW_W // 2, 140))
+    sub = subtitle_font.render("A pixel roguelite of memory and monsters", True, (160, 160, 150))
+    sub_rect = sub.get_rect(center=(VIEW_W // 2, 180))
+    dirty = True
     while True:
-        # background stripes
-        screen.fill((26, 28, 24))
-        for i in range(0, VIEW_W, 40):
-            pygame.draw.rect(screen, (32 + (i // 40 % 2) * 6, 34, 30), (i, 0, 40, VIEW_H))
-        # title
-        title = title_font.render(GAME_TITLE, True, (230, 230, 210))
-        screen.blit(title, title.get_rect(center=(VIEW_W // 2, 140)))
-        sub = subtitle_font.render("A pixel roguelite of memory and monsters", True, (160, 160, 150))
-        screen.blit(sub, sub.get_rect(center=(VIEW_W // 2, 180)))
-
-        # structured layout
-        gap_x = 36
-        top_y = 260
-        btn_w = 180
-        # START (left) and HOW TO PLAY (right)
-        saved_exists = has_save()
-        start_label = "START NEW" if saved_exists else "START"
-        start_rect = draw_button(screen, start_label, (VIEW_W // 2 - btn_w - gap_x // 2, top_y))
-        how_rect = draw_button(screen, "HOW TO PLAY", (VIEW_W // 2 + gap_x // 2, top_y))
-
-        cont_rect = None
-        next_y = top_y + 80
-        if saved_exists:
-            # Centered CONTINUE if save exists
-            cont_rect = draw_button(screen, "CONTINUE", (VIEW_W // 2 - btn_w // 2, next_y))
-            next_y += 80
-
-        # EXIT centered at bottom
-        exit_rect = draw_button(screen, "EXIT", (VIEW_W // 2 - btn_w // 2, next_y))
-
-        gear_rect = draw_settings_gear(screen, VIEW_W - 44, 8)
-        pygame.display.flip()
-
-        for event in pygame.event.get():
+        # 菜单是静态的：只在有输入（或从子界面返回）后重绘
+        if dirty:
+            # background stripes
+            screen.fill((26, 28, 24))
+            for i in range(0, VIEW_W, 40):
+                pygame.draw.rect(screen, (32 + (i // 40 % 2) * 6, 34, 30), (i, 0, 40, VIEW_H))
+            # title
+            screen.blit(title, title_rect)
+            screen.blit(sub, sub_rect)
+
+            # structured layout
+            gap_x = 36
+            top_y = 260
+            btn_w = 180
+            # START (left) and HOW TO PLAY (right)
+            saved_exists = has_save()
+            start_label = "START NEW" if saved_exists else "START"
+            start_rect = draw_button(screen, start_label, (VIEW_W // 2 - btn_w - gap_x // 2, top_y))
+            how_rect = draw_button(screen, "HOW TO PLAY", (VIEW_W // 2 + gap_x // 2, top_y))
+
+            cont_rect = None
+            next_y = top_y + 80
+            if saved_exists:
+                # Centered CONTINUE if save exists
+                cont_rect = draw_button(screen, "CONTINUE", (VIEW_W // 2 - btn_w // 2, next_y))
+                next_y += 80
+
+            # EXIT centered at bottom
+            exit_rect = draw_button(screen, "EXIT", (VIEW_W // 2 - btn_w // 2, next_y))
+
+            gear_rect = draw_settings_gear(screen, VIEW_W - 44, 8)
+            pygame.display.flip()
+            dirty = False
+
+        events = wait_events(types=MENU_EVENTS)
+        dirty = bool(events)
+        for event in events:
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
@@ -692,31 +774,39 @@ def show_start_menu(screen):
                 elif how_rect.collidepoint(event.pos):
                     show_help(screen)
                     flush_events()
-        clock.tick(60)
 
 
 def show_help(screen):
-    clock = pygame.time.Clock()
-    font = pygame.font.SysFont(None, 28)
-    big = pygame.font.SysFont(None, 40)
+    font = _font(28)
+    big = _font(40)
+    # 静态文字只渲染一次，循环里仅 blit
+    title = big.render("How to Play", True, (240, 240, 240))
+    lines = [
+        "WASD to move. Survive until the timer hits 00:00 to win.",
+        "Breakable yellow blocks block the final fragment (secondary).",
+        "Enemies deal contact damage. Avoid or kite them.",
+        "Auto-fire targets the closest enemy/block in range.",
+        "Transitions use the classic 'two doors' animation."
+    ]
+    line_surfs = [font.render(s, True, (200, 200, 200)) for s in lines]
+    back = None
+    dirty = True
     while True:
-        screen.fill((18, 18, 18))
-        screen.blit(big.render("How to Play", True, (240, 240, 240)), (40, 40))
-        lines = [
-            "WASD to move. Survive until the timer hits 00:00 to win.",
-            "Breakable yellow blocks block the final fragment (secondary).",
-            "Enemies deal contact damage. Avoid or kite them.",
-            "Auto-fire targets the closest enemy/block in range.",
-            "Transitions use the classic 'two doors' animation."
-        ]
-        y = 100
-        for s in lines:
-            screen.blit(font.render(s, True, (200, 200, 200)), (40, y))
-            y += 36
-        back = draw_button(screen, "BACK", (VIEW_W // 2 - 90, VIEW_H - 120))
-        pygame.display.flip()
-        for event in pygame.event.get():
+        # 画面是静态的：只在需要时重绘
+        if dirty:
+            screen.fill((18, 18, 18))
+            screen.blit(title, (40, 40))
+            y = 100
+            for surf in line_surfs:
+                screen.blit(surf, (40, y))
+                y += 36
+            back = draw_button(screen, "BACK", (VIEW_W // 2 - 90, VIEW_H - 120))
+            pygame.display.flip()
+            dirty = False
+        for event in wait_events(types=MENU_EVENTS):
             if event.type == pygame.QUIT: pygame.quit(); sys.exit()
+            if event.type in REDRAW_EVENTS:
+                dirty = True
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 door_transition(screen)
                 flush_events()
@@ -725,40 +815,34 @@ def show_help(screen):
                 door_transition(screen)
                 flush_events()
                 return
-        clock.tick(60)
 
 
 def show_fail_screen(screen, background_surf):
-    dim = pygame.Surface((VIEW_W, VIEW_H))
-    dim.set_alpha(180)
-    dim.fill((0, 0, 0))
-    screen.blit(pygame.transform.smoothscale(background_surf, (VIEW_W, VIEW_H)), (0, 0))
-    screen.blit(dim, (0, 0))
-    title = pygame.font.SysFont(None, 80).render("YOU WERE CORRUPTED!", True, (255, 60, 60))
-    screen.blit(title, title.get_rect(center=(VIEW_W // 2, 140)))
-    retry = draw_button(screen, "RETRY", (VIEW_W // 2 - 200, 300))
-    home = draw_button(screen, "HOME", (VIEW_W // 2 + 20, 300))
-    pygame.display.flip()
+    dim = dim_surface((VIEW_W, VIEW_H), 180)
+    # 缩放后的背景 + 暗化层只合成一次，重绘时整张 blit
+    backdrop = scaled_to_view(background_surf)
+    backdrop.blit(dim, (0, 0))
+    title = _font(80).render("YOU WERE CORRUPTED!", True, (255, 60, 60))
+    retry = home = None
+    dirty = True
     while True:
-        for event in pygame.event.get():
+        if dirty:
+            screen.blit(backdrop, (0, 0))
+            screen.blit(title, title.get_rect(center=(VIEW_W // 2, 140)))
+            retry = draw_button(screen, "RETRY", (VIEW_W // 2 - 200, 300))
+            home = draw_button(screen, "HOME", (VIEW_W // 2 + 20, 300))
+            pygame.display.flip()
+            dirty = False
+        for event in wait_events(types=MENU_EVENTS):
             if event.type == pygame.QUIT: pygame.quit(); sys.exit()
+            if event.type in REDRAW_EVENTS:
+                dirty = True
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                bg = pygame.display.get_surface().copy()
+                bg = screen.copy()
                 pick = pause_from_overlay(screen, bg)
                 if pick == "continue":
                     # Repaint this Fail screen and keep waiting for input
-                    return_to_fail = True
-                    # Re-draw the same Fail UI:
-                    dim = pygame.Surface((VIEW_W, VIEW_H))
-                    dim.set_alpha(180)
-                    dim.fill((0, 0, 0))
-                    screen.blit(pygame.transform.smoothscale(background_surf, (VIEW_W, VIEW_H)), (0, 0))
-                    screen.blit(dim, (0, 0))
-                    title = pygame.font.SysFont(None, 80).render("YOU WERE CORRUPTED!", True, (255, 60, 60))
-                    screen.blit(title, title.get_rect(center=(VIEW_W // 2, 140)))
-                    retry = draw_button(screen, "RETRY", (VIEW_W // 2 - 200, 300))
-                    home = draw_button(screen, "HOME", (VIEW_W // 2 + 20, 300))
-                    pygame.display.flip()
+                    dirty = True
                     continue
                 if pick == "home":  door_transition(screen); flush_events(); return "home"
                 if pick == "restart": door_transition(screen); flush_events(); return "retry"
@@ -769,55 +853,40 @@ def show_fail_screen(screen, background_surf):
 
 
 def show_success_screen(screen, background_surf, reward_choices):
-    dim = pygame.Surface((VIEW_W, VIEW_H))
-    dim.set_alpha(150)
-    dim.fill((0, 0, 0))
-    screen.blit(pygame.transform.smoothscale(background_surf, (VIEW_W, VIEW_H)), (0, 0))
-    screen.blit(dim, (0, 0))
-    title = pygame.font.SysFont(None, 80).render("MEMORY RESTORED!", True, (0, 255, 120))
-    screen.blit(title, title.get_rect(center=(VIEW_W // 2, 100)))
+    dim = dim_surface((VIEW_W, VIEW_H), 150)
+    backdrop = scaled_to_view(background_surf)
+    backdrop.blit(dim, (0, 0))
+    title = _font(80).render("MEMORY RESTORED!", True, (0, 255, 120))
     card_rects = []
     for i, card in enumerate(reward_choices):
         x = VIEW_W // 2 - (len(reward_choices) * 140) // 2 + i * 140
-        rect = pygame.Rect(x, 180, 120, 160)
-        pygame.draw.rect(screen, (220, 220, 220), rect)
-        name = pygame.font.SysFont(None, 24).render(card.replace("_", " ").upper(), True, (20, 20, 20))
-        screen.blit(name, name.get_rect(center=(rect.centerx, rect.bottom - 18)))
-        pygame.draw.rect(screen, (40, 40, 40), rect, 3)
-        pygame.draw.rect(screen, (70, 90, 90), rect.inflate(-30, -50))
-        card_rects.append((rect, card))
-    next_btn = draw_button(screen, "CONFIRM", (VIEW_W // 2 - 90, 370))
+        card_rects.append((pygame.Rect(x, 180, 120, 160), card))
+    names = [_font(24).render(card.replace("_", " ").upper(), True, (20, 20, 20)) for card in reward_choices]
+    next_btn = None
     chosen = None
-    pygame.display.flip()
+    dirty = True
     while True:
-        for event in pygame.event.get():
+        if dirty:
+            screen.blit(backdrop, (0, 0))
+            screen.blit(title, title.get_rect(center=(VIEW_W // 2, 100)))
+            for (rect, _), name in zip(card_rects, names):
+                pygame.draw.rect(screen, (220, 220, 220), rect)
+                screen.blit(name, name.get_rect(center=(rect.centerx, rect.bottom - 18)))
+                pygame.draw.rect(screen, (40, 40, 40), rect, 3)
+                pygame.draw.rect(screen, (70, 90, 90), rect.inflate(-30, -50))
+            next_btn = draw_button(screen, "CONFIRM", (VIEW_W // 2 - 90, 370))
+            pygame.display.flip()
+            dirty = False
+        for event in wait_events(types=MENU_EVENTS):
             if event.type == pygame.QUIT: pygame.quit(); sys.exit()
+            if event.type in REDRAW_EVENTS:
+                dirty = True
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                bg = pygame.display.get_surface().copy()
+                bg = screen.copy()
                 pick = pause_from_overlay(screen, bg)  # 只在暂停菜单里设置→返回暂停→继续
                 if pick == "continue":
                     # —— 重新绘制“成功界面”，而不是失败界面 ——
-                    dim = pygame.Surface((VIEW_W, VIEW_H))
-                    dim.set_alpha(150)
-                    dim.fill((0, 0, 0))
-                    screen.blit(pygame.transform.smoothscale(background_surf, (VIEW_W, VIEW_H)), (0, 0))
-                    screen.blit(dim, (0, 0))
-                    title = pygame.font.SysFont(None, 80).render("MEMORY RESTORED!", True, (0, 255, 120))
-                    screen.blit(title, title.get_rect(center=(VIEW_W // 2, 100)))
-
-                    card_rects = []
-                    for i, card in enumerate(reward_choices):
-                        x = VIEW_W // 2 - (len(reward_choices) * 140) // 2 + i * 140
-                        rect = pygame.Rect(x, 180, 120, 160)
-                        pygame.draw.rect(screen, (220, 220, 220), rect)
-                        name = pygame.font.SysFont(None, 24).render(card.replace("_", " ").upper(), True, (20, 20, 20))
-                        screen.blit(name, name.get_rect(center=(rect.centerx, rect.bottom - 18)))
-                        pygame.draw.rect(screen, (40, 40, 40), rect, 3)
-                        pygame.draw.rect(screen, (70, 90, 90), rect.inflate(-30, -50))
-                        card_rects.append((rect, card))
-
-                    next_btn = draw_button(screen, "CONFIRM", (VIEW_W // 2 - 90, 370))
-                    pygame.display.flip()
+                    dirty = True
                     continue  # 回到本界面等待点击
                 if pick == "home":
                     door_transition(screen)
@@ -843,15 +912,14 @@ def show_success_screen(screen, background_surf, reward_choices):
 def show_pause_menu(screen, background_surf):
     """Draw pause overlay with build info in the dimmed background, keeping buttons centered."""
     # 创建半透明背景
-    dim = pygame.Surface((VIEW_W, VIEW_H), pygame.SRCALPHA)
-    dim.fill((0, 0, 0, 170))
-    bg_scaled = pygame.transform.smoothscale(background_surf, (VIEW_W, VIEW_H))
-    screen.blit(bg_scaled, (0, 0))
-    screen.blit(dim, (0, 0))
+    dim = dim_surface((VIEW_W, VIEW_H), 170, per_pixel=True)
+    backdrop = scaled_to_view(background_surf)
+    backdrop.blit(dim, (0, 0))
+    screen.blit(backdrop, (0, 0))
 
     # 在变暗的背景中显示玩家build信息
-    font_small = pygame.font.SysFont(None, 28)
-    font_tiny = pygame.font.SysFont(None, 22)
+    font_small = _font(28)
+    font_tiny = _font(22)
 
     # 左上角显示基本属性
     left_margin = 30
@@ -913,7 +981,7 @@ def show_pause_menu(screen, background_surf):
     pygame.draw.rect(screen, (30, 30, 30), panel, border_radius=16)
     pygame.draw.rect(screen, (60, 60, 60), panel, width=3, border_radius=16)
 
-    title = pygame.font.SysFont(None, 72).render("Paused", True, (230, 230, 230))
+    title = _font(72).render("Paused", True, (230, 230, 230))
     screen.blit(title, title.get_rect(center=(panel.centerx, panel.top + 58)))
 
     # 按钮保持原有位置和样式
@@ -936,17 +1004,20 @@ def show_pause_menu(screen, background_surf):
             pygame.draw.rect(screen, (120, 40, 40), rect, border_radius=10)
         else:
             pygame.draw.rect(screen, (50, 50, 50), rect, border_radius=10)
-        txt = pygame.font.SysFont(None, 32).render(label, True, (235, 235, 235))
+        txt = _font(32).render(label, True, (235, 235, 235))
         screen.blit(txt, txt.get_rect(center=rect.center))
         btns.append((rect, tag))
 
     pygame.display.flip()
 
+    # 面板静态：画一次后阻塞等待输入，不再空转；screen 上的像素还在，露出时重新提交即可
     while True:
-        for event in pygame.event.get():
+        for event in wait_events(types=MENU_EVENTS):
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+            if event.type in REDRAW_EVENTS:
+                pygame.display.flip()
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 flush_events()
                 return "continue"
@@ -961,20 +1032,18 @@ def show_settings_popup(screen, background_surf):
     """Volume settings with LIVE BGM updates and proper slider dragging/visual refresh."""
     global FX_VOLUME, BGM_VOLUME
 
-    clock = pygame.time.Clock()
-
     # background overlay
-    dim = pygame.Surface((VIEW_W, VIEW_H), pygame.SRCALPHA)
-    dim.fill((0, 0, 0, 170))
-    bg_scaled = pygame.transform.smoothscale(background_surf, (VIEW_W, VIEW_H))
+    dim = dim_surface((VIEW_W, VIEW_H), 170, per_pixel=True)
+    backdrop = scaled_to_view(background_surf)
+    backdrop.blit(dim, (0, 0))
 
     panel_w, panel_h = min(520, VIEW_W - 80), min(360, VIEW_H - 160)
     panel = pygame.Rect(0, 0, panel_w, panel_h)
     panel.center = (VIEW_W // 2, VIEW_H // 2)
 
-    title_font = pygame.font.SysFont(None, 56)
-    font = pygame.font.SysFont(None, 30)
-    btn_font = pygame.font.SysFont(None, 32)
+    title_font = _font(56)
+    font = _font(30)
+    btn_font = _font(32)
 
     # local working values
     fx_val = int(FX_VOLUME)
@@ -997,8 +1066,7 @@ def show_settings_popup(screen, background_surf):
 
     def draw_ui():
         # background & panel
-        screen.blit(bg_scaled, (0, 0))
-        screen.blit(dim, (0, 0))
+        screen.blit(backdrop, (0, 0))
         pygame.draw.rect(screen, (30, 30, 30), panel, border_radius=16)
         pygame.draw.rect(screen, (60, 60, 60), panel, width=3, border_radius=16)
 
@@ -1024,14 +1092,21 @@ def show_settings_popup(screen, background_surf):
 
     # initial draw
     fx_bar = bgm_bar = close_btn = None
-    draw_ui()
+    dirty = True
 
     while True:
-        for event in pygame.event.get():
+        # 只有滑块数值变化时才重绘
+        if dirty:
+            draw_ui()
+            dirty = False
+        for event in wait_events():
             if event.type == pygame.QUIT:
                 pygame.quit();
                 sys.exit()
 
+            if event.type in REDRAW_EVENTS:
+                dirty = True
+
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
                 # keep current values and exit
                 FX_VOLUME = fx_val;
@@ -1047,12 +1122,14 @@ def show_settings_popup(screen, background_surf):
                     fx_val = val_from_bar(fx_bar, mx)
                     FX_VOLUME = fx_val  # live apply for future SFX
                     dragging = "fx"
+                    dirty = True
                 elif bgm_bar and bgm_bar.collidepoint((mx, my)):
                     bgm_val = val_from_bar(bgm_bar, mx)
                     BGM_VOLUME = bgm_val
                     if "_bgm" in globals() and getattr(_bgm, "set_volume", None):
                         _bgm.set_volume(BGM_VOLUME / 100.0)  # LIVE apply
                     dragging = "bgm"
+                    dirty = True
                 elif close_btn and close_btn.collidepoint((mx, my)):
                     FX_VOLUME = fx_val;
                     BGM_VOLUME = bgm_val
@@ -1074,18 +1151,14 @@ def show_settings_popup(screen, background_surf):
                     BGM_VOLUME = bgm_val
                     if "_bgm" in globals() and getattr(_bgm, "set_volume", None):
                         _bgm.set_volume(BGM_VOLUME / 100.0)  # LIVE apply
-
-        # redraw each frame for smooth knob follow
-        draw_ui()
-        clock.tick(60)
+                dirty = True
 
 
 def show_shop_screen(screen) -> Optional[str]:
     """Spend META['spoils'] on small upgrades. ESC opens Pause; return action or None when closed."""
-    clock = pygame.time.Clock()
-    font = pygame.font.SysFont(None, 30)
-    title_font = pygame.font.SysFont(None, 56)
-    btn_font = pygame.font.SysFont(None, 32)
+    font = _font(30)
+    title_font = _font(56)
+    btn_font = _font(32)
 
     # pseudo-random offers
     catalog = [
@@ -1104,52 +1177,57 @@ def show_shop_screen(screen) -> Optional[str]:
 
     offers = roll_offers()
 
+    dirty = True
     while True:
-        # --- draw ---
-        screen.fill((16, 16, 18))
-
-        # Title (center)
-        title_surf = title_font.render("TRADER", True, (235, 235, 235))
-        screen.blit(title_surf, title_surf.get_rect(center=(VIEW_W // 2, 80)))
-
-        # Spoils (center under title)
-        money_surf = font.render(f"Spoils: {META['spoils']}", True, (255, 230, 120))
-        screen.blit(money_surf, money_surf.get_rect(center=(VIEW_W // 2, 130)))
-
-        # Offers row — centered as a group
-        card_w, card_h = 170, 120
-        gap = 18
-        total_w = len(offers) * card_w + (len(offers) - 1) * gap
-        start_x = (VIEW_W - total_w) // 2
-        y = 200
-
-        rects = []
-        for i, it in enumerate(offers):
-            x = start_x + i * (card_w + gap)
-            r = pygame.Rect(x, y, card_w, card_h)
-
-            pygame.draw.rect(screen, (40, 40, 42), r, border_radius=10)
-            pygame.draw.rect(screen, (80, 80, 84), r, 2, border_radius=10)
-
-            name = font.render(it["name"], True, (230, 230, 230))
-            cost = font.render(f"{it['cost']}¥", True, (255, 210, 130))
-            # text with some padding inside the card
-            screen.blit(name, name.get_rect(midleft=(r.x + 12, r.y + 34)))
-            screen.blit(cost, cost.get_rect(midleft=(r.x + 12, r.y + 78)))
-
-            rects.append((r, it))
-
-        # NEXT button — centered under cards
-        close = pygame.Rect(0, 0, 220, 56)
-        close.center = (VIEW_W // 2, y + card_h + 80)
-        pygame.draw.rect(screen, (50, 50, 50), close, border_radius=10)
-        ctxt = btn_font.render("NEXT", True, (235, 235, 235))
-        screen.blit(ctxt, ctxt.get_rect(center=close.center))
-
-        pygame.display.flip()
+        if dirty:
+            # --- draw ---
+            screen.fill((16, 16, 18))
+
+            # Title (center)
+            title_surf = title_font.render("TRADER", True, (235, 235, 235))
+            screen.blit(title_surf, title_surf.get_rect(center=(VIEW_W // 2, 80)))
+
+            # Spoils (center under title)
+            money_surf = font.render(f"Spoils: {META['spoils']}", True, (255, 230, 120))
+            screen.blit(money_surf, money_surf.get_rect(center=(VIEW_W // 2, 130)))
+
+            # Offers row — centered as a group
+            card_w, card_h = 170, 120
+            gap = 18
+            total_w = len(offers) * card_w + (len(offers) - 1) * gap
+            start_x = (VIEW_W - total_w) // 2
+            y = 200
+
+            rects = []
+            for i, it in enumerate(offers):
+                x = start_x + i * (card_w + gap)
+                r = pygame.Rect(x, y, card_w, card_h)
+
+                pygame.draw.rect(screen, (40, 40, 42), r, border_radius=10)
+                pygame.draw.rect(screen, (80, 80, 84), r, 2, border_radius=10)
+
+                name = font.render(it["name"], True, (230, 230, 230))
+                cost = font.render(f"{it['cost']}¥", True, (255, 210, 130))
+                # text with some padding inside the card
+                screen.blit(name, name.get_rect(midleft=(r.x + 12, r.y + 34)))
+                screen.blit(cost, cost.get_rect(midleft=(r.x + 12, r.y + 78)))
+
+                rects.append((r, it))
+
+            # NEXT button — centered under cards
+            close = pygame.Rect(0, 0, 220, 56)
+            close.center = (VIEW_W // 2, y + card_h + 80)
+            pygame.draw.rect(screen, (50, 50, 50), close, border_radius=10)
+            ctxt = btn_font.render("NEXT", True, (235, 235, 235))
+            screen.blit(ctxt, ctxt.get_rect(center=close.center))
+
+            pygame.display.flip()
+            dirty = False
 
         # --- input ---
-        for ev in pygame.event.get():
+        events = wait_events(types=MENU_EVENTS)
+        dirty = bool(events)
+        for ev in events:
             if ev.type == pygame.QUIT:
                 pygame.quit();
                 sys.exit()
@@ -1176,8 +1254,6 @@ def show_shop_screen(screen) -> Optional[str]:
                         else:
                             it["apply"]()
 
-        clock.tick(60)
-
 
 def is_boss_level(level_idx_zero_based: int) -> bool:
     # UI shows Lv = level_idx_zero_based + 1
@@ -1300,43 +1376,67 @@ def spawn_wave_with_budget(game_state: "GameState",
 
 
 # ==================== 数据结构 ====================
-class Graph:
-    def __init__(self):
-        self.edges: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
-        self.weights: Dict[Tuple[Tuple[int, int], Tuple[int, int]], float] = {}
-
-    def add_edge(self, a, b, w):
-        self.edges.setdefault(a, []).append(b)
-        self.weights[(a, b)] = w
-
-    def neighbors(self, node): return self.edges.get(node, [])
-
-    def cost(self, a, b): return self.weights.get((a, b), float('inf'))
+# 通行代码：0 = 不可破坏（不可走），1 = 空地，10 = 可破坏
+PASS_WALL, PASS_OPEN, PASS_BREAKABLE = 0, 1, 10
 
 
 class Obstacle:
+    # 实体类都用 __slots__：实例多、热循环里频繁取属性，省掉每个实例的 __dict__
+    __slots__ = ("rect", "grid_pos", "type", "health", "is_main_block")
+
     def __init__(self, x: int, y: int, obstacle_type: str, health: Optional[int] = None):
         px = x * CELL_SIZE;
         py = y * CELL_SIZE + INFO_BAR_HEIGHT
         self.rect = pygame.Rect(px, py, CELL_SIZE, CELL_SIZE)
+        self.grid_pos: Tuple[int, int] = (x, y)  # obstacles never move
         self.type: str = obstacle_type
         self.health: Optional[int] = health
+        self.is_main_block: bool = False  # MainBlock 覆盖为 True
 
     def is_destroyed(self) -> bool:
         return self.type == "Destructible" and self.health <= 0
 
-    @property
-    def grid_pos(self):
-        return self.rect.x // CELL_SIZE, (self.rect.y - INFO_BAR_HEIGHT) // CELL_SIZE
+
+def _ring_keys(cx: int, cy: int, k: int):
+    # 以 (cx, cy) 为中心、切比雪夫距离恰好为 k 的一圈格子
+    if k == 0:
+        yield cx, cy
+        return
+    for i in range(-k, k + 1):
+        yield cx + i, cy - k
+        yield cx + i, cy + k
+    for j in range(-k + 1, k):
+        yield cx - k, cy + j
+        yield cx + k, cy + j
+
+
+def obstacles_near(obstacles: Dict[Tuple[int, int], Obstacle], rect: pygame.Rect) -> List[Obstacle]:
+    # obstacles 本身就是按格子索引的字典，相当于空间哈希：
+    # 只查 rect 覆盖到的那几个格子，而不是遍历全图障碍
+    cx0 = max(rect.left // CELL_SIZE, 0)
+    cx1 = min((rect.right - 1) // CELL_SIZE, GRID_SIZE - 1)
+    cy0 = max((rect.top - INFO_BAR_HEIGHT) // CELL_SIZE, 0)
+    cy1 = min((rect.bottom - 1 - INFO_BAR_HEIGHT) // CELL_SIZE, GRID_SIZE - 1)
+    found = []
+    for cy in range(cy0, cy1 + 1):
+        for cx in range(cx0, cx1 + 1):
+            ob = obstacles.get((cx, cy))
+            if ob is not None:
+                found.append(ob)
+    return found
 
 
 class MainBlock(Obstacle):
+    __slots__ = ()
+
     def __init__(self, x: int, y: int, health: Optional[int] = MAIN_BLOCK_HEALTH):
         super().__init__(x, y, "Destructible", health)
         self.is_main_block = True
 
 
 class Item:
+    __slots__ = ("x", "y", "is_main", "radius", "center", "rect")
+
     def __init__(self, x: int, y: int, is_main=False):
         self.x = x
         self.y = y
@@ -1348,6 +1448,9 @@ class Item:
 
 
 class Player:
+    __slots__ = ("x", "y", "speed", "size", "rect", "max_hp", "hp", "hit_cd", "fire_cd",
+                 "level", "xp", "xp_to_next", "bullet_damage", "fire_rate_mult")
+
     def __init__(self, pos: Tuple[int, int], speed: int = PLAYER_SPEED):
         self.x = pos[0] * CELL_SIZE
         self.y = pos[1] * CELL_SIZE
@@ -1357,6 +1460,7 @@ class Player:
         self.max_hp = int(PLAYER_MAX_HP)
         self.hp = int(PLAYER_MAX_HP)
         self.hit_cd = 0.0  # contact invulnerability timer (seconds)
+        self.fire_cd = 0.0  # autofire cooldown (seconds)
         # progression
         self.level = 1
         self.xp = 0
@@ -1374,33 +1478,29 @@ class Player:
         return int((self.x + self.size // 2) // CELL_SIZE), int((self.y + self.size // 2) // CELL_SIZE)
 
     def move(self, keys, obstacles):
-        dx = dy = 0
-        if keys[pygame.K_w]: dy -= 1
-        if keys[pygame.K_s]: dy += 1
-        if keys[pygame.K_a]: dx -= 1
-        if keys[pygame.K_d]: dx += 1
-        if dx and dy: dx *= 0.7071; dy *= 0.7071
-        # axis separated for smooth sliding
-        nx = self.x + dx * self.speed
-        rect_x = pygame.Rect(int(nx), int(self.y) + INFO_BAR_HEIGHT, self.size, self.size)
-        for ob in obstacles.values():
-            if rect_x.colliderect(ob.rect):
-                if dx > 0:
-                    nx = ob.rect.left - self.size
-                elif dx < 0:
-                    nx = ob.rect.right
-                break
-        self.x = max(0, min(nx, GRID_SIZE * CELL_SIZE - self.size))
-        ny = self.y + dy * self.speed
-        rect_y = pygame.Rect(int(self.x), int(ny) + INFO_BAR_HEIGHT, self.size, self.size)
-        for ob in obstacles.values():
-            if rect_y.colliderect(ob.rect):
-                if dy > 0:
-                    ny = ob.rect.top - self.size - INFO_BAR_HEIGHT
-                elif dy < 0:
-                    ny = ob.rect.bottom - INFO_BAR_HEIGHT
-                break
-        self.y = max(0, min(ny, GRID_SIZE * CELL_SIZE - self.size))
+        # 按键状态是 0/1，直接相减得到方向
+        dx = keys[pygame.K_d] - keys[pygame.K_a]
+        dy = keys[pygame.K_s] - keys[pygame.K_w]
+        if dx and dy: dx *= _INV_SQRT2; dy *= _INV_SQRT2
+        # axis separated for smooth sliding; an axis without input keeps its position
+        if dx:
+            nx = self.x + dx * self.speed
+            rect_x = pygame.Rect(int(nx), int(self.y) + INFO_BAR_HEIGHT, self.size, self.size)
+            near = obstacles_near(obstacles, rect_x)
+            hit = rect_x.collidelist([ob.rect for ob in near])
+            if hit != -1:
+                ob = near[hit]
+                nx = ob.rect.left - self.size if dx > 0 else ob.rect.right
+            self.x = max(0, min(nx, GRID_SIZE * CELL_SIZE - self.size))
+        if dy:
+            ny = self.y + dy * self.speed
+            rect_y = pygame.Rect(int(self.x), int(ny) + INFO_BAR_HEIGHT, self.size, self.size)
+            near = obstacles_near(obstacles, rect_y)
+            hit = rect_y.collidelist([ob.rect for ob in near])
+            if hit != -1:
+                ob = near[hit]
+                ny = ob.rect.top - self.size - INFO_BAR_HEIGHT if dy > 0 else ob.rect.bottom - INFO_BAR_HEIGHT
+            self.y = max(0, min(ny, GRID_SIZE * CELL_SIZE - self.size))
         self.rect.x = int(self.x)
         self.rect.y = int(self.y) + INFO_BAR_HEIGHT
 
@@ -1428,6 +1528,12 @@ class Player:
 
 
 class Enemy:
+    __slots__ = ("x", "y", "attack", "speed", "type", "size", "rect", "hp", "max_hp",
+                 "fuse", "buff_cd", "shield_cd", "shield_hp", "shield_t", "ranged_cd",
+                 "buff_t", "buff_atk_mult", "buff_spd_add", "z_level", "xp", "xp_to_next",
+                 "is_elite", "is_boss", "spawn_delay", "_spawn_elapsed", "attack_timer",
+                 "_affix_tag", "_affix_name", "_spawn_wave_tag")
+
     def __init__(self, pos: Tuple[int, int], attack: int = ENEMY_ATTACK, speed: int = ENEMY_SPEED,
                  ztype: str = "basic", hp: Optional[int] = None):
         self.x = pos[0] * CELL_SIZE
@@ -1466,6 +1572,7 @@ class Enemy:
         self.rect = pygame.Rect(self.x, self.y + INFO_BAR_HEIGHT, self.size, self.size)
         self.spawn_delay = 0.6
         self._spawn_elapsed = 0.0
+        self.attack_timer = 0.0
 
     @property
     def pos(self):
@@ -1487,7 +1594,8 @@ class Enemy:
             if new_size != self.size:
                 cx, cy = self.rect.center
                 self.size = new_size
-                self.rect = pygame.Rect(0, 0, self.size, self.size)
+                # 原地改尺寸，保持 rect 对象不变（帧内缓存的 rect 列表仍然有效）
+                self.rect.size = (self.size, self.size)
                 self.rect.center = (cx, cy)
                 self.x = float(self.rect.x)
                 self.y = float(self.rect.y - INFO_BAR_HEIGHT)
@@ -1497,15 +1605,14 @@ class Enemy:
         base_speed = self.speed
 
         # apply temporary BUFF (from buffers)
-        if getattr(self, "buff_t", 0.0) > 0.0:
-            base_attack = int(base_attack * getattr(self, "buff_atk_mult", 1.0))
-            base_speed = base_speed + int(getattr(self, "buff_spd_add", 0))
+        if self.buff_t > 0.0:
+            base_attack = int(base_attack * self.buff_atk_mult)
+            base_speed = base_speed + int(self.buff_spd_add)
             self.buff_t = max(0.0, self.buff_t - dt)
 
         # FINAL per-frame movement speed (capped)
         speed = min(ENEMY_SPEED_MAX, max(1, int(base_speed)))
 
-        if not hasattr(self, 'attack_timer'): self.attack_timer = 0
         self.attack_timer += dt
 
         # spawn delay gate
@@ -1515,35 +1622,32 @@ class Enemy:
 
         dx = player.x - self.x
         dy = player.y - self.y
-        dirs = []
-        if abs(dx) > abs(dy):
-            dirs = [(sign(dx), 0), (0, sign(dy)), (sign(dx), sign(dy)), (-sign(dx), 0), (0, -sign(dy))]
-        else:
-            dirs = [(0, sign(dy)), (sign(dx), 0), (sign(dx), sign(dy)), (0, -sign(dy)), (-sign(dx), 0)]
+        dirs = _DIR_TABLE[(dx > 0) - (dx < 0), (dy > 0) - (dy < 0), abs(dx) > abs(dy)]
+        # 候选障碍只查一次：自身 rect 外扩一步覆盖到的格子，所有方向共用
+        near = obstacles_near(obstacles, self.rect.inflate(speed * 2, speed * 2))
+        ob_rects = [ob.rect for ob in near]
         for ddx, ddy in dirs:
             if ddx == 0 and ddy == 0: continue
             next_rect = self.rect.move(ddx * speed, ddy * speed)
             blocked = False
-            for ob in obstacles:
-                if next_rect.colliderect(ob.rect):
-                    if ob.type == "Destructible":
-                        if self.attack_timer >= attack_interval:
-                            ob.health -= self.attack
-                            self.attack_timer = 0
-                            if ob.health <= 0:
-                                gp = ob.grid_pos
-                                if gp in game_state.obstacles: del game_state.obstacles[gp]
-                                # drop spoils on the ground
-                                cx, cy = ob.rect.centerx, ob.rect.centery
-                                game_state.spawn_spoils(cx, cy, SPOILS_PER_BLOCK)
-                                self.gain_xp(XP_ENEMY_BLOCK)
-                                if random.random() < HEAL_DROP_CHANCE_BLOCK:
-                                    game_state.spawn_heal(cx, cy, HEAL_POTION_AMOUNT)
-                        blocked = True
-                        break
-                    elif ob.type == "Indestructible":
-                        blocked = True
-                        break
+            hit = next_rect.collidelist(ob_rects)
+            if hit != -1:
+                ob = near[hit]
+                if ob.type == "Destructible":
+                    if self.attack_timer >= attack_interval:
+                        ob.health -= self.attack
+                        self.attack_timer = 0
+                        if ob.health <= 0:
+                            game_state.destroy_obstacle(ob.grid_pos)
+                            # drop spoils on the ground
+                            cx, cy = ob.rect.centerx, ob.rect.centery
+                            game_state.spawn_spoils(cx, cy, SPOILS_PER_BLOCK)
+                            self.gain_xp(XP_ENEMY_BLOCK)
+                            if random.random() < HEAL_DROP_CHANCE_BLOCK:
+                                game_state.spawn_heal(cx, cy, HEAL_POTION_AMOUNT)
+                    blocked = True
+                elif ob.type == "Indestructible":
+                    blocked = True
             if not blocked:
                 self.x += ddx * speed
                 self.y += ddy * speed
@@ -1619,66 +1723,79 @@ class Enemy:
 
 
 class Bullet:
+    __slots__ = ("x", "y", "vx", "vy", "speed", "alive", "traveled", "max_dist", "damage")
+
     def __init__(self, x: float, y: float, vx: float, vy: float, max_dist: float = MAX_FIRE_RANGE,
                  damage: int = BULLET_DAMAGE_ENEMY):
+        self.reset(x, y, vx, vy, max_dist, damage)
+
+    def reset(self, x: float, y: float, vx: float, vy: float, max_dist: float = MAX_FIRE_RANGE,
+              damage: int = BULLET_DAMAGE_ENEMY):
+        # 对象池复用时重新初始化（见 spawn_bullet）
         self.x = x
         self.y = y
         self.vx = vx
         self.vy = vy
+        self.speed = math.hypot(vx, vy)  # 速度恒定，每帧飞行距离 = speed * dt
         self.alive = True
         self.traveled = 0.0
         self.max_dist = max_dist
         self.damage = int(damage)
+        return self
 
-    def update(self, dt: float, game_state: 'GameState', enemies: List['Enemy'], player: 'Player' = None):
+    def update(self, dt: float, game_state: 'GameState', enemies: List['Enemy'], player: 'Player' = None,
+               enemy_rects: Optional[List[pygame.Rect]] = None):
         if not self.alive: return
-        nx = self.x + self.vx * dt
-        ny = self.y + self.vy * dt
-        self.traveled += ((nx - self.x) ** 2 + (ny - self.y) ** 2) ** 0.5
-        self.x, self.y = nx, ny
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.traveled += self.speed * dt
         if self.traveled >= self.max_dist:
             self.alive = False;
             return
 
         r = pygame.Rect(int(self.x - BULLET_RADIUS), int(self.y - BULLET_RADIUS), BULLET_RADIUS * 2, BULLET_RADIUS * 2)
 
-        # 1) enemies
-        for z in list(enemies):
-            if r.colliderect(z.rect):
-                # shield first
-                if getattr(z, "shield_hp", 0) > 0:
-                    z.shield_hp -= self.damage
-                    if z.shield_hp < 0:
-                        z.hp += z.shield_hp
-                        z.shield_hp = 0
-                else:
-                    z.hp -= self.damage
+        # 1) enemies：enemy_rects 与 enemies 一一对应，由调用方每帧构建一次
+        if enemy_rects is None:
+            enemy_rects = [z.rect for z in enemies]
+        hit = r.collidelist(enemy_rects)
+        if hit != -1:
+            z = enemies[hit]
+            # shield first
+            if getattr(z, "shield_hp", 0) > 0:
+                z.shield_hp -= self.damage
+                if z.shield_hp < 0:
+                    z.hp += z.shield_hp
+                    z.shield_hp = 0
+            else:
+                z.hp -= self.damage
 
-                if z.hp <= 0:
-                    # coin drop (with chance) at death
-                    cx, cy = z.rect.centerx, z.rect.centery
-                    drop_n = roll_spoils_for_enemy(z)
-                    if drop_n > 0:
-                        game_state.spawn_spoils(cx, cy, drop_n)
-                    # Small chance to drop a heal potion
-                    if random.random() < HEAL_DROP_CHANCE_ENEMY:
-                        game_state.spawn_heal(cx, cy, HEAL_POTION_AMOUNT)
-                    # player XP + inheritance if you were already doing that here earlier
-                    if player:
-                        base_xp = XP_PER_ENEMY_TYPE.get(getattr(z, "type", "basic"), XP_PLAYER_KILL)
-                        bonus = max(0, z.z_level - 1) * XP_ZLEVEL_BONUS
-                        if getattr(z, "is_elite", False):  base_xp = int(base_xp * 1.5)
-                        if getattr(z, "is_boss", False):  base_xp = int(base_xp * 3.0)
-                        player.add_xp(base_xp + bonus)
+            if z.hp <= 0:
+                # coin drop (with chance) at death
+                cx, cy = z.rect.centerx, z.rect.centery
+                drop_n = roll_spoils_for_enemy(z)
+                if drop_n > 0:
+                    game_state.spawn_spoils(cx, cy, drop_n)
+                # Small chance to drop a heal potion
+                if random.random() < HEAL_DROP_CHANCE_ENEMY:
+                    game_state.spawn_heal(cx, cy, HEAL_POTION_AMOUNT)
+                # player XP + inheritance if you were already doing that here earlier
+                if player:
+                    base_xp = XP_PER_ENEMY_TYPE.get(getattr(z, "type", "basic"), XP_PLAYER_KILL)
+                    bonus = max(0, z.z_level - 1) * XP_ZLEVEL_BONUS
+                    if getattr(z, "is_elite", False):  base_xp = int(base_xp * 1.5)
+                    if getattr(z, "is_boss", False):  base_xp = int(base_xp * 3.0)
+                    player.add_xp(base_xp + bonus)
 
-                    transfer_xp_to_neighbors(z, enemies)
-                    enemies.remove(z)
+                transfer_xp_to_neighbors(z, enemies)
+                del enemies[hit]
+                del enemy_rects[hit]
 
-                self.alive = False
-                return
+            self.alive = False
+            return
 
-        # 2) obstacles
-        for gp, ob in list(game_state.obstacles.items()):
+        # 2) obstacles (only the cells the bullet overlaps)
+        for ob in game_state.nearby(r):
             if r.colliderect(ob.rect):
                 if ob.type == "Indestructible":
                     self.alive = False;
@@ -1687,7 +1804,7 @@ class Bullet:
                     ob.health = (ob.health or 0) - BULLET_DAMAGE_BLOCK
                     if ob.health <= 0:
                         cx, cy = ob.rect.centerx, ob.rect.centery
-                        del game_state.obstacles[gp]
+                        game_state.destroy_obstacle(ob.grid_pos)
                         # drop spoils for block destruction
                         game_state.spawn_spoils(cx, cy, SPOILS_PER_BLOCK)
                         if player: player.add_xp(XP_PLAYER_BLOCK)
@@ -1698,6 +1815,33 @@ class Bullet:
         pygame.draw.circle(screen, (255, 255, 255), (int(self.x - cam_x), int(self.y - cam_y)), BULLET_RADIUS)
 
 
+# 死亡子弹回收到这里，开火时优先复用，减少 60Hz 循环里的对象分配
+_bullet_pool: List[Bullet] = []
+
+
+def spawn_bullet(x: float, y: float, vx: float, vy: float, max_dist: float = MAX_FIRE_RANGE,
+                 damage: int = BULLET_DAMAGE_ENEMY) -> Bullet:
+    if _bullet_pool:
+        return _bullet_pool.pop().reset(x, y, vx, vy, max_dist, damage)
+    return Bullet(x, y, vx, vy, max_dist, damage)
+
+
+def drop_dead(shots: list, pool: Optional[list] = None) -> None:
+    """
+    原地删掉 alive=False 的子弹/敌方弹：倒序扫描，死亡的与末尾交换后 pop，
+    每次删除 O(1)、不分配新列表（不保序，子弹之间没有先后依赖）。给了 pool 就回收进去。
+    """
+    i = len(shots) - 1
+    while i >= 0:
+        shot = shots[i]
+        if not shot.alive:
+            shots[i] = shots[-1]
+            shots.pop()
+            if pool is not None:
+                pool.append(shot)
+        i -= 1
+
+
 class Spoil:
     """A coin-like pickup that pops up and bounces in place."""
 
@@ -1762,9 +1906,12 @@ class HealPickup:
 
 
 class EnemyShot:
+    __slots__ = ("x", "y", "vx", "vy", "speed", "dmg", "traveled", "max_dist", "alive")
+
     def __init__(self, x: float, y: float, vx: float, vy: float, dmg: int, max_dist: float = MAX_FIRE_RANGE):
         self.x, self.y = x, y
         self.vx, self.vy = vx, vy
+        self.speed = math.hypot(vx, vy)
         self.dmg = int(dmg)
         self.traveled = 0.0
         self.max_dist = max_dist
@@ -1775,10 +1922,9 @@ class EnemyShot:
             return
 
         # 运动
-        nx = self.x + self.vx * dt
-        ny = self.y + self.vy * dt
-        self.traveled += ((nx - self.x) ** 2 + (ny - self.y) ** 2) ** 0.5
-        self.x, self.y = nx, ny
+        self.x += self.vx * dt
+        self.y += self.vy * dt
+        self.traveled += self.speed * dt
         if self.traveled >= self.max_dist:
             self.alive = False
             return
@@ -1787,19 +1933,20 @@ class EnemyShot:
         r = pygame.Rect(int(self.x - BULLET_RADIUS), int(self.y - BULLET_RADIUS),
                         BULLET_RADIUS * 2, BULLET_RADIUS * 2)
 
-        # 1) 先撞障碍（会阻挡子弹）
-        for gp, ob in list(game_state.obstacles.items()):
+        # 1) 先撞障碍（会阻挡子弹）；只查子弹覆盖到的格子
+        for ob in game_state.nearby(r):
             if r.colliderect(ob.rect):
+                gp = ob.grid_pos
                 # 伤害数值（主方块与可破坏块统一，若需要可单独给主方块一个常量）
                 dmg_block = int(globals().get("ENEMY_SHOT_DAMAGE_BLOCK", BULLET_DAMAGE_BLOCK))
 
                 # 主方块：现在可受伤
-                if getattr(ob, 'is_main_block', False):
+                if ob.is_main_block:
                     # 主方块有 health
                     ob.health = (ob.health or 0) - dmg_block
                     if ob.health <= 0:
                         # 移除主方块（下方主碎片若有，将自然暴露）
-                        del game_state.obstacles[gp]
+                        game_state.destroy_obstacle(gp)
                     self.alive = False
                     return
 
@@ -1812,7 +1959,7 @@ class EnemyShot:
                 if getattr(ob, "type", None) == "Destructible":
                     ob.health = (ob.health or 0) - dmg_block
                     if ob.health <= 0:
-                        del game_state.obstacles[gp]
+                        game_state.destroy_obstacle(gp)
                     self.alive = False
                     return
 
@@ -1838,6 +1985,14 @@ class EnemyShot:
 def sign(v): return 1 if v > 0 else (-1 if v < 0 else 0)
 
 
+# (sign(dx), sign(dy), 是否横向为主) -> 敌人候选移动方向（主轴优先），预先算好，寻路时不再每帧建列表
+_DIR_TABLE = {
+    (sx, sy, x_major): ((sx, 0), (0, sy), (sx, sy), (-sx, 0), (0, -sy)) if x_major
+    else ((0, sy), (sx, 0), (sx, sy), (0, -sy), (-sx, 0))
+    for sx in (-1, 0, 1) for sy in (-1, 0, 1) for x_major in (False, True)
+}
+
+
 def heuristic(a, b): return abs(a[0] - b[0]) + abs(a[1] - b[1])
 
 
@@ -2081,30 +2236,58 @@ def transfer_xp_to_neighbors(dead_z: "Enemy", enemies: List["Enemy"],
         t.gain_xp(share)
 
 
-def a_star_search(graph: Graph, start: Tuple[int, int], goal: Tuple[int, int],
+def _astar_core(step: List[float], start_id: int, goal_id: int, n: int) -> Tuple[List[int], List[float]]:
+    """
+    Pure numeric A* over a flat n*n grid. step[i] is the cost of entering cell i (< 0 = blocked).
+    Returns (parents, g): parents[i] == -1 for unvisited cells, parents[start] == start.
+    """
+    size = n * n
+    parents = [-1] * size
+    g = [float('inf')] * size
+    closed = [False] * size
+    parents[start_id] = start_id
+    g[start_id] = 0
+    gx, gy = divmod(goal_id, n)
+    frontier = [(0, start_id)]
+    while frontier:
+        _, current = heapq.heappop(frontier)
+        if current == goal_id: break
+        if closed[current]: continue
+        closed[current] = True
+        cx, cy = divmod(current, n)
+        base = g[current]
+        for neighbor, nx, ny in ((current + n, cx + 1, cy), (current - n, cx - 1, cy),
+                                 (current + 1, cx, cy + 1), (current - 1, cx, cy - 1)):
+            if not (0 <= nx < n and 0 <= ny < n): continue
+            w = step[neighbor]
+            if w < 0 or closed[neighbor]: continue
+            new_cost = base + w
+            if new_cost < g[neighbor]:
+                g[neighbor] = new_cost
+                parents[neighbor] = current
+                heapq.heappush(frontier, (new_cost + abs(gx - nx) + abs(gy - ny), neighbor))
+    return parents, g
+
+
+def a_star_search(passable: List[List[int]], start: Tuple[int, int], goal: Tuple[int, int],
                   obstacles: Dict[Tuple[int, int], Obstacle]):
-    frontier = PriorityQueue()
-    frontier.put((0, start))
-    came_from = {start: None}
-    cost_so_far = {start: 0}
-    while not frontier.empty():
-        _, current = frontier.get()
-        if current == goal: break
-        for neighbor in graph.neighbors(current):
-            new_cost = cost_so_far[current] + graph.cost(current, neighbor)
-            if neighbor in obstacles:
-                obstacle = obstacles[neighbor]
-                if obstacle.type == "Indestructible":
-                    continue
-                elif obstacle.type == "Destructible":
-                    k_factor = (math.ceil(obstacle.health / ENEMY_ATTACK)) * 0.1
-                    new_cost = cost_so_far[current] + 1 + k_factor
-            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
-                cost_so_far[neighbor] = new_cost
-                priority = new_cost + heuristic(goal, neighbor)
-                frontier.put((priority, neighbor))
-                # came_from[current] = current if current not in came_from else came_from[current]
-                came_from[neighbor] = current
+    # 先把通行代码 + 当前障碍血量折算成扁平的进入代价表，内核只做数值运算
+    n = len(passable)
+    step = [(-1 if w == PASS_WALL else w) for col in passable for w in col]
+    for (x, y), obstacle in obstacles.items():
+        if obstacle.type == "Indestructible":
+            step[x * n + y] = -1
+        elif obstacle.type == "Destructible":
+            step[x * n + y] = 1 + -(-obstacle.health // ENEMY_ATTACK) * 0.1  # 整数向上取整
+    start_id = start[0] * n + start[1]
+    parents, g = _astar_core(step, start_id, goal[0] * n + goal[1], n)
+    # 对外仍以 (x, y) 为键，reconstruct_path 不用改
+    came_from, cost_so_far = {}, {}
+    for i, p in enumerate(parents):
+        if p == -1: continue
+        node = divmod(i, n)
+        came_from[node] = None if i == start_id else divmod(p, n)
+        cost_so_far[node] = g[i]
     return came_from, cost_so_far
 
 
@@ -2176,11 +2359,10 @@ def generate_game_entities(grid_size: int, obstacle_count: int, item_count: int,
     rest_needed = target_obstacles
 
     base_candidates = [p for p in all_positions if p not in forbidden]
-    random.shuffle(base_candidates)
     placed = 0
 
-    # cluster seeds
-    cluster_seeds = base_candidates[:max(1, rest_needed // 6)]
+    # cluster seeds (sample only what we need instead of shuffling every cell)
+    cluster_seeds = random.sample(base_candidates, min(len(base_candidates), max(1, rest_needed // 6)))
     for seed in cluster_seeds:
         if placed >= rest_needed: break
         cluster_size = random.randint(3, 6)
@@ -2205,13 +2387,12 @@ def generate_game_entities(grid_size: int, obstacle_count: int, item_count: int,
     # if still short, scatter
     if placed < rest_needed:
         more = [p for p in base_candidates if p not in obstacles]
-        random.shuffle(more)
-        for pos in more[:(rest_needed - placed)]:
+        for pos in random.sample(more, min(len(more), rest_needed - placed)):
             typ = "Indestructible" if random.random() < 0.5 else "Destructible"
             hp = OBSTACLE_HEALTH if typ == "Destructible" else None
             obstacles[pos] = Obstacle(pos[0], pos[1], typ, health=hp)
 
-    forbidden |= set(obstacles.keys())
+    forbidden.update(obstacles)
 
     # --- items (all are normal) ---
     item_target = max(item_count, MIN_ITEMS, grid_size // 2)
@@ -2221,29 +2402,22 @@ def generate_game_entities(grid_size: int, obstacle_count: int, item_count: int,
 
     # --- decorations ---
     decor_target = int(area * DECOR_DENSITY)
-    decor_candidates = [p for p in all_positions if p not in forbidden]
-    random.shuffle(decor_candidates)
-    decorations = decor_candidates[:decor_target]
+    # 物品格子一次性收成集合，逐格判断时不再重建
+    item_positions = frozenset((it.x, it.y) for it in items)
+    # 空位列表沿用物品的候选（已排除 forbidden），只需再去掉物品格子
+    decor_candidates = [p for p in item_candidates if p not in item_positions]
+    decorations = random.sample(decor_candidates, min(len(decor_candidates), decor_target))
 
     # keep return shape the same: last “main_item_list” is now empty list
     return obstacles, items, player_pos, enemy_pos_list, [], decorations
 
 
-def build_graph(grid_size: int, obstacles: Dict[Tuple[int, int], Obstacle]) -> Graph:
-    graph = Graph()
-    for x in range(grid_size):
-        for y in range(grid_size):
-            current_pos = (x, y)
-            if current_pos in obstacles and obstacles[current_pos].type == "Indestructible": continue
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
-                neighbor_pos = (x + dx, y + dy)
-                if not (0 <= neighbor_pos[0] < grid_size and 0 <= neighbor_pos[1] < grid_size): continue
-                if neighbor_pos in obstacles and obstacles[neighbor_pos].type == "Indestructible": continue
-                weight = 1
-                if neighbor_pos in obstacles and obstacles[neighbor_pos].type == "Destructible":
-                    weight = 10
-                graph.add_edge(current_pos, neighbor_pos, weight)
-    return graph
+def build_graph(grid_size: int, obstacles: Dict[Tuple[int, int], Obstacle]) -> List[List[int]]:
+    # 不再存边表：只记录每格的通行代码，passable[x][y]
+    passable = [[PASS_OPEN] * grid_size for _ in range(grid_size)]
+    for (x, y), ob in obstacles.items():
+        passable[x][y] = PASS_WALL if ob.type == "Indestructible" else PASS_BREAKABLE
+    return passable
 
 
 # ==================== 新增游戏状态类 ====================
@@ -2256,13 +2430,66 @@ class GameState:
         self.items_total = len(items)  # track total at start
         # non-colliding visual fillers
         self.decorations = decorations  # list[Tuple[int,int]] grid coords
+        # 按行分桶，渲染时只看可见行
+        self.decor_by_row: Dict[int, List[int]] = {}
+        for gx, gy in decorations:
+            self.decor_by_row.setdefault(gy, []).append(gx)
         self.spoils = []  # List[Spoil]
         self.spoils_gained = 0
         self.heals = []  # List[HealPickup]
+        # 静态地图底图（render_game 首帧生成），以及待补画的格子
+        self.map_layer: Optional[pygame.Surface] = None
+        self.map_patches: List[Tuple[int, int]] = []
+        # 可被自动索敌的方块（可破坏、非主方块）只在这里筛一次，之后只在摧毁时删除
+        # 按粗网格分桶：(gx // TARGET_BUCKET, gy // TARGET_BUCKET) -> 方块列表
+        self.target_buckets: Dict[Tuple[int, int], List[Obstacle]] = {}
+        for (gx, gy), ob in obstacles.items():
+            if ob.type == "Destructible" and not ob.is_main_block:
+                self.target_buckets.setdefault((gx // TARGET_BUCKET, gy // TARGET_BUCKET), []).append(ob)
 
     def count_destructible_obstacles(self) -> int:
         return sum(1 for obs in self.obstacles.values() if obs.type == "Destructible")
 
+    def nearby(self, rect: pygame.Rect) -> List[Obstacle]:
+        return obstacles_near(self.obstacles, rect)
+
+    def destroy_obstacle(self, pos: Tuple[int, int]):
+        ob = self.obstacles.pop(pos, None)
+        if ob is None:
+            return
+        if ob.type == "Destructible":
+            self.destructible_count -= 1
+            if not ob.is_main_block:
+                self.target_buckets[(pos[0] // TARGET_BUCKET, pos[1] // TARGET_BUCKET)].remove(ob)
+        self.map_patches.append(pos)
+
+    def nearest_block(self, px: float, py: float, best_d2: float, max_d2: float):
+        """
+        离 (px, py) 最近的可破坏（非主）方块，只接受比 best_d2 更近且不超过 max_d2 的。
+        从玩家所在的桶开始一圈圈向外找，一旦下一圈不可能更近就停。返回 (ob 或 None, d2)。
+        """
+        span = TARGET_BUCKET * CELL_SIZE
+        bx0 = int(px // span)
+        by0 = int((py - INFO_BAR_HEIGHT) // span)
+        max_ring = GRID_SIZE // TARGET_BUCKET + 1
+        buckets = self.target_buckets
+        best = None
+        for k in range(max_ring + 1):
+            if k:
+                reach2 = ((k - 1) * span) ** 2  # 第 k 圈里的方块至少这么远
+                if reach2 >= best_d2 or reach2 > max_d2:
+                    break
+            for key in _ring_keys(bx0, by0, k):
+                for ob in buckets.get(key, ()):
+                    cx, cy = ob.rect.center
+                    dx = cx - px
+                    dy = cy - py
+                    d2 = dx * dx + dy * dy
+                    if d2 < best_d2 and d2 <= max_d2:
+                        best_d2 = d2
+                        best = ob
+        return best, best_d2
+
     def spawn_spoils(self, x_px: float, y_px: float, count: int = 1):
         for _ in range(int(max(0, count))):
             # tiny jitter so multiple coins don't overlap perfectly
@@ -2312,6 +2539,137 @@ class GameState:
 
 
 # ==================== 游戏渲染函数 ====================
+_grid_surf: Optional[pygame.Surface] = None
+
+
+def _grid_lines_surface() -> pygame.Surface:
+    """视口大小的网格底图（多出一格用于滚动偏移），视口尺寸变化时重建。"""
+    global _grid_surf
+    size = (VIEW_W + CELL_SIZE, VIEW_H - INFO_BAR_HEIGHT + CELL_SIZE)
+    if _grid_surf is None or _grid_surf.get_size() != size:
+        surf = pygame.Surface(size).convert()
+        surf.fill((20, 20, 20))
+        grid_col = (50, 50, 50)
+        for x in range(0, size[0], CELL_SIZE):
+            pygame.draw.line(surf, grid_col, (x, 0), (x, size[1]), 1)
+        for y in range(0, size[1], CELL_SIZE):
+            pygame.draw.line(surf, grid_col, (0, y), (size[0], y), 1)
+        _grid_surf = surf
+    return _grid_surf
+
+
+@lru_cache(maxsize=1)
+def _decor_sprite() -> pygame.Surface:
+    # 装饰小圆点预先画好，渲染时整批 blits
+    r = max(2, CELL_SIZE // 8)
+    surf = pygame.Surface((r * 2, r * 2), pygame.SRCALPHA).convert_alpha()
+    pygame.draw.circle(surf, (70, 80, 70), (r, r), r)
+    return surf
+
+
+@lru_cache(maxsize=256)
+def _hp_label(hp: int) -> pygame.Surface:
+    # 血量数字按值缓存，同一数值不再每帧重新光栅化；转成显示格式，blit 时免去逐次格式转换
+    return _font(30).render(str(hp), True, (255, 255, 255)).convert_alpha()
+
+
+@lru_cache(maxsize=16)
+def _dot_sprite(color: Tuple[int, int, int], radius: int) -> pygame.Surface:
+    # 实心小圆（物品/子弹）预先光栅化，逐帧只做 blit；锚点在圆心 (radius, radius)
+    surf = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA).convert_alpha()
+    pygame.draw.circle(surf, color, (radius, radius), radius)
+    return surf
+
+
+@lru_cache(maxsize=4)
+def _pickup_sprite(kind: str, r: int) -> pygame.Surface:
+    # 金币/血瓶连同地面阴影一起预先画好；锚点在圆心 (r, r)
+    surf = pygame.Surface((r * 2 + 1, r + 13), pygame.SRCALPHA).convert_alpha()
+    pygame.draw.ellipse(surf, (0, 0, 0, 80), pygame.Rect(0, r + 6, r * 2, 6))
+    if kind == "coin":
+        pygame.draw.circle(surf, (255, 215, 80), (r, r), r)
+        pygame.draw.circle(surf, (255, 245, 200), (r, r), r, 1)
+    else:
+        # potion: red circle with white cross
+        pygame.draw.circle(surf, (220, 60, 60), (r, r), r)
+        surf.fill((255, 255, 255), (r - 2, 3, 4, r * 2 - 6))
+        surf.fill((255, 255, 255), (3, r - 2, r * 2 - 6, 4))
+    return surf
+
+
+@lru_cache(maxsize=8)
+def _affix_label(tag: str) -> pygame.Surface:
+    # 词缀字母只有几种，按字母缓存
+    return _font(18).render(tag, True, (0, 0, 0)).convert_alpha()
+
+
+@lru_cache(maxsize=1)
+def _tile_surfs() -> Dict[str, pygame.Surface]:
+    # 每种障碍一块纯色砖，blit 比逐个 draw.rect 便宜
+    tiles = {}
+    for kind, color in (("Indestructible", (120, 120, 120)), ("Destructible", (200, 80, 80))):
+        t = pygame.Surface((CELL_SIZE, CELL_SIZE)).convert()
+        t.fill(color)
+        tiles[kind] = t
+    return tiles
+
+
+def _paint_map_cell(layer: pygame.Surface, game_state, gx: int, gy: int) -> None:
+    # 重画一格：底色 + 该格左/上两条网格线 + 装饰 + 障碍砖
+    x, y = gx * CELL_SIZE, gy * CELL_SIZE + INFO_BAR_HEIGHT
+    layer.fill((20, 20, 20), (x, y, CELL_SIZE, CELL_SIZE))
+    pygame.draw.line(layer, (50, 50, 50), (x, y), (x + CELL_SIZE - 1, y), 1)
+    pygame.draw.line(layer, (50, 50, 50), (x, y), (x, y + CELL_SIZE - 1), 1)
+    if gx in game_state.decor_by_row.get(gy, ()):
+        decor = _decor_sprite()
+        layer.blit(decor, (x + CELL_SIZE // 2 - decor.get_width() // 2, y + CELL_SIZE // 2 - decor.get_height() // 2))
+    ob = game_state.obstacles.get((gx, gy))
+    if ob is not None:
+        tiles = _tile_surfs()
+        layer.blit(tiles.get(ob.type, tiles["Destructible"]), ob.rect.topleft)
+
+
+def build_map_layer(game_state) -> pygame.Surface:
+    """整张地图的静态底图（世界坐标，含顶栏高度）：背景、网格线、装饰和障碍砖块。"""
+    w = GRID_SIZE * CELL_SIZE
+    h = GRID_SIZE * CELL_SIZE + INFO_BAR_HEIGHT
+    layer = pygame.Surface((w, h)).convert()
+    layer.fill((20, 20, 20))
+    grid_col = (50, 50, 50)
+    for x in range(0, w, CELL_SIZE):
+        pygame.draw.line(layer, grid_col, (x, INFO_BAR_HEIGHT), (x, h), 1)
+    for y in range(INFO_BAR_HEIGHT, h, CELL_SIZE):
+        pygame.draw.line(layer, grid_col, (0, y), (w, y), 1)
+    decor = _decor_sprite()
+    off_x = CELL_SIZE // 2 - decor.get_width() // 2
+    off_y = CELL_SIZE // 2 - decor.get_height() // 2 + INFO_BAR_HEIGHT
+    layer.blits([(decor, (gx * CELL_SIZE + off_x, gy * CELL_SIZE + off_y))
+                 for gx, gy in game_state.decorations], doreturn=False)
+    tiles = _tile_surfs()
+    layer.blits([(tiles.get(ob.type, tiles["Destructible"]), ob.rect.topleft)
+                 for ob in game_state.obstacles.values()], doreturn=False)
+    return layer
+
+
+# 脏矩形呈现：相机没动、地图静态部分也没变时，只把上一帧和本帧的动态物体区域推到屏幕
+_present_state = {"key": None, "rects": []}
+
+
+def reset_present() -> None:
+    """菜单/暂停等整屏画面之后调用，保证下一帧整屏 flip。"""
+    _present_state["key"] = None
+    _present_state["rects"] = []
+
+
+def present_frame(key, dirty: list) -> None:
+    if key == _present_state["key"]:
+        pygame.display.update(_present_state["rects"] + dirty)
+    else:
+        pygame.display.flip()
+    _present_state["key"] = key
+    _present_state["rects"] = dirty
+
+
 def render_game_iso(screen: pygame.Surface, game_state, player, enemies,
                     bullets=None, enemy_shots=None) -> pygame.Surface:
     # 1) 计算以“玩家所在格”为中心的相机
@@ -2435,19 +2793,30 @@ def render_game_iso(screen: pygame.Surface, game_state, player, enemies,
     draw_ui_topbar(screen, game_state, player, time_left=globals().get("_time_left_runtime"))
     pygame.display.flip()
 
-    return screen.copy()
+    return screen
 
 
 def render_game(screen: pygame.Surface, game_state, player: Player, enemies: List[Enemy],
                 bullets: Optional[List['Bullet']] = None,
-                enemy_shots: Optional[List[EnemyShot]] = None) -> pygame.Surface:
+                enemy_shots: Optional[List[EnemyShot]] = None,
+                alpha: float = 1.0, prev_pos: Optional[dict] = None) -> pygame.Surface:
+    # 固定步长插值：玩家/敌人画在上一步与当前步之间，alpha = acc / SIM_DT；
+    # prev_pos 记录最后一个模拟步之前的 rect 左上角
+    def lerp_off(obj) -> Tuple[int, int]:
+        p = prev_pos.get(obj) if prev_pos else None
+        if p is None:
+            return 0, 0
+        k = 1.0 - alpha
+        return int(round((p[0] - obj.rect.x) * k)), int(round((p[1] - obj.rect.y) * k))
+
     # Camera centers on player; add pillarbox if the viewport is wider/taller than the world
     world_w = GRID_SIZE * CELL_SIZE
     world_h = GRID_SIZE * CELL_SIZE + INFO_BAR_HEIGHT
 
     # initial (follow player)
-    cam_x = int(player.x + player.size // 2 - VIEW_W // 2)
-    cam_y = int(player.y + player.size // 2 - (VIEW_H - INFO_BAR_HEIGHT) // 2)
+    pox, poy = lerp_off(player)
+    cam_x = int(player.x + pox + player.size // 2 - VIEW_W // 2)
+    cam_y = int(player.y + poy + player.size // 2 - (VIEW_H - INFO_BAR_HEIGHT) // 2)
 
     # Horizontal: if the screen is wider than the world, center the world (pillarbox both sides)
     if VIEW_W > world_w:
@@ -2463,80 +2832,92 @@ def render_game(screen: pygame.Surface, game_state, player: Player, enemies: Lis
     else:
         cam_y = max(0, min(cam_y, world_h - VIEW_H))
 
-    screen.fill((20, 20, 20))
-    font = pygame.font.SysFont(None, 28)
-    font_small = pygame.font.SysFont(None, 22)
-
     # gear_rect = draw_settings_gear(screen, VIEW_W - 44, 8)
 
-    # full-view grid aligned to world; covers pillar areas too
-    grid_col = (50, 50, 50)
-
-    # vertical lines
-    x0 = (-cam_x) % CELL_SIZE  # align to world columns
-    for x in range(x0, VIEW_W, CELL_SIZE):
-        pygame.draw.line(screen, grid_col, (x, INFO_BAR_HEIGHT), (x, VIEW_H), 1)
-
-    # horizontal lines (start just below HUD bar)
-    y0 = (INFO_BAR_HEIGHT - cam_y) % CELL_SIZE
-    y0 += INFO_BAR_HEIGHT
-    for y in range(y0, VIEW_H, CELL_SIZE):
-        pygame.draw.line(screen, grid_col, (0, y), (VIEW_W, y), 1)
+    # 静态地图底图：背景/网格/装饰/障碍砖一次画好，障碍被摧毁时只补画那一格
+    layer = game_state.map_layer
+    if layer is None or layer.get_size() != (world_w, world_h):
+        layer = game_state.map_layer = build_map_layer(game_state)
+        game_state.map_patches.clear()
+    for gx, gy in game_state.map_patches:
+        _paint_map_cell(layer, game_state, gx, gy)
+    game_state.map_patches.clear()
+
+    if cam_x < 0 or cam_y < 0:
+        # pillarbox：世界比视口小，两侧补满网格（与世界对齐）
+        screen.fill((20, 20, 20))
+        x0 = (-cam_x) % CELL_SIZE  # align to world columns
+        y0 = (INFO_BAR_HEIGHT - cam_y) % CELL_SIZE  # start just below HUD bar
+        screen.blit(_grid_lines_surface(), (0, INFO_BAR_HEIGHT),
+                    pygame.Rect(CELL_SIZE - x0, CELL_SIZE - y0, VIEW_W, VIEW_H - INFO_BAR_HEIGHT))
+    screen.blit(layer, (-cam_x, -cam_y))
 
     # small yellow fragment icon
     icon_x = VIEW_W - 120
     icon_y = 10
     pygame.draw.circle(screen, (255, 255, 0), (icon_x, icon_y + 8), 8)
 
-    # --- draw items ---
+    # visible area in world pixels, and the matching cell window
+    # (camera may be negative when the world is pillarboxed)
+    view_rect = pygame.Rect(cam_x, cam_y, VIEW_W, VIEW_H)
+    start_x = max(0, cam_x // CELL_SIZE)
+    end_x = min(GRID_SIZE, (cam_x + VIEW_W) // CELL_SIZE + 1)
+    start_y = max(0, (cam_y - INFO_BAR_HEIGHT) // CELL_SIZE)
+    end_y = min(GRID_SIZE, (cam_y + VIEW_H - INFO_BAR_HEIGHT) // CELL_SIZE + 1)
+    # 子弹只按中心点做包围盒剔除，留出半径余量
+    cull_l, cull_t = cam_x - 16, cam_y - 16
+    cull_r, cull_b = cam_x + VIEW_W + 16, cam_y + VIEW_H + 16
+
+    # --- draw items ---（圆点、金币、血瓶、子弹都是预先画好的小图，整批 blits）
+    item_blits = []
     for item in game_state.items:
+        if not view_rect.colliderect(item.rect): continue
         # convert world -> screen using camera offset
         sx = int(item.center[0] - cam_x)
         sy = int(item.center[1] - cam_y)
         color = (255, 255, 100) if item.is_main else (255, 255, 0)
-        pygame.draw.circle(screen, color, (sx, sy), item.radius)
+        item_blits.append((_dot_sprite(color, item.radius), (sx - item.radius, sy - item.radius)))
+    screen.blits(item_blits, doreturn=False)
 
-    # decorations (non-colliding visual fillers)
-    for gx, gy in getattr(game_state, 'decorations', []):
-        cx = gx * CELL_SIZE + CELL_SIZE // 2 - cam_x
-        cy = gy * CELL_SIZE + CELL_SIZE // 2 + INFO_BAR_HEIGHT - cam_y
-        pygame.draw.circle(screen, (70, 80, 70), (cx, cy), max(2, CELL_SIZE // 8))
+    # 本帧会变化的屏幕区域（供 present_frame 做脏矩形更新）
+    dirty = [(0, 0, VIEW_W, INFO_BAR_HEIGHT + 16)]  # HUD（XP 标签略超出顶栏）
 
-    # spoils (coins) on the ground
+    # spoils (coins) and healing potions on the ground (sprite includes the shadow)
+    pickup_blits = []
+    pickup_view = view_rect.inflate(0, 32)  # 阴影在圆下方
     for s in getattr(game_state, "spoils", []):
+        if not pickup_view.colliderect(s.rect): continue
         sx = int(s.base_x - cam_x)
         sy = int((s.base_y - s.h) - cam_y)
-        # shadow
-        pygame.draw.ellipse(screen, (0, 0, 0, 80), pygame.Rect(sx - s.r, sy + 6, s.r * 2, 6))
-        # coin
-        pygame.draw.circle(screen, (255, 215, 80), (sx, sy), s.r)
-        pygame.draw.circle(screen, (255, 245, 200), (sx, sy), s.r, 1)
-
-    # healing potions (heals) on the ground
+        dirty.append((sx - s.r - 1, sy - s.r - 1, s.r * 2 + 2, s.r + 14))
+        pickup_blits.append((_pickup_sprite("coin", s.r), (sx - s.r, sy - s.r)))
     for h in getattr(game_state, "heals", []):
+        if not pickup_view.colliderect(h.rect): continue
         sx = int(h.base_x - cam_x)
         sy = int((h.base_y - h.h) - cam_y)
-        # shadow
-        pygame.draw.ellipse(screen, (0, 0, 0, 80), pygame.Rect(sx - h.r, sy + 6, h.r * 2, 6))
-        # potion: red circle with white cross
-        pygame.draw.circle(screen, (220, 60, 60), (sx, sy), h.r)
-        pygame.draw.rect(screen, (255, 255, 255), pygame.Rect(sx - 2, sy - h.r + 3, 4, h.r * 2 - 6))
-        pygame.draw.rect(screen, (255, 255, 255), pygame.Rect(sx - h.r + 3, sy - 2, h.r * 2 - 6, 4))
+        dirty.append((sx - h.r - 1, sy - h.r - 1, h.r * 2 + 2, h.r + 14))
+        pickup_blits.append((_pickup_sprite("potion", h.r), (sx - h.r, sy - h.r)))
+    screen.blits(pickup_blits, doreturn=False)
+
+    # 实心矩形直接用 Surface.fill(color, rect)，比 pygame.draw.rect 少一层绘制开销
+    ticks = pygame.time.get_ticks()
 
     # player
-    player_draw = player.rect.copy()
-    player_draw.x -= cam_x
-    player_draw.y -= cam_y
-    if player.hit_cd > 0 and ((pygame.time.get_ticks() // 80) % 2 == 0):
-        pygame.draw.rect(screen, (240, 80, 80), player_draw)  # flicker color
+    player_draw = player.rect.move(pox - cam_x, poy - cam_y)
+    dirty.append(player_draw)
+    if player.hit_cd > 0 and ((ticks // 80) % 2 == 0):
+        screen.fill((240, 80, 80), player_draw)  # flicker color
     else:
-        pygame.draw.rect(screen, (0, 255, 0), player_draw)
+        screen.fill((0, 255, 0), player_draw)
 
-    # enemies
+    # enemies (HP/shield bars sit up to ~16px above the body)
+    enemy_view = view_rect.inflate(0, 32)
+    fuse_blink = (ticks // 100) % 2 == 0
     for enemy in enemies:
-        zr = enemy.rect.copy()
-        zr.x -= cam_x
-        zr.y -= cam_y
+        if not enemy_view.colliderect(enemy.rect): continue
+        ox, oy = lerp_off(enemy)
+        zr = enemy.rect.move(ox - cam_x, oy - cam_y)
+        dirty.append(zr.inflate(0, 32))  # 含头顶血条/护盾条
 
         # 基于类型的底色
         base_color = ENEMY_COLORS.get(getattr(enemy, "type", "basic"), (255, 60, 60))
@@ -2544,10 +2925,10 @@ def render_game(screen: pygame.Surface, game_state, player: Player, enemies: Lis
 
         # 自爆怪：临爆前闪烁（覆盖底色）
         if enemy.type in ("suicide", "bomber") and getattr(enemy, "fuse", None) is not None:
-            if enemy.fuse <= SUICIDE_FLICKER and (pygame.time.get_ticks() // 100) % 2 == 0:
+            if enemy.fuse <= SUICIDE_FLICKER and fuse_blink:
                 color = (255, 220, 100)
 
-        pygame.draw.rect(screen, color, zr)
+        screen.fill(color, zr)
         # Elite/Boss outline
         if getattr(enemy, "is_boss", False):
             pygame.draw.rect(screen, (255, 215, 0), zr, 3)  # gold outline
@@ -2557,18 +2938,17 @@ def render_game(screen: pygame.Surface, game_state, player: Player, enemies: Lis
         # Affix letter (tiny)
         tag = getattr(enemy, "_affix_tag", None)
         if tag:
-            aff_font = pygame.font.SysFont(None, 18)
-            screen.blit(aff_font.render(tag, True, (0, 0, 0)), (zr.x + 3, zr.y + 2))
+            screen.blit(_affix_label(tag), (zr.x + 3, zr.y + 2))
 
         # HP bar
         try:
-            mhp = getattr(enemy, 'max_hp', None) or getattr(enemy, 'hp', 1)
+            mhp = enemy.max_hp or 1
             ratio = max(0.0, min(1.0, float(max(0, enemy.hp)) / float(mhp)))
             bar_w = zr.width
             bar_h = 4
             bx, by = zr.x, zr.y - (bar_h + 3)
-            pygame.draw.rect(screen, (40, 40, 40), (bx, by, bar_w, bar_h))
-            pygame.draw.rect(screen, (0, 220, 80), (bx, by, int(bar_w * ratio), bar_h))
+            screen.fill((40, 40, 40), (bx, by, bar_w, bar_h))
+            screen.fill((0, 220, 80), (bx, by, int(bar_w * ratio), bar_h))
         except Exception:
             pass
 
@@ -2576,44 +2956,50 @@ def render_game(screen: pygame.Surface, game_state, player: Player, enemies: Lis
         if getattr(enemy, "shield_hp", 0) > 0 and getattr(enemy, "shield_t", 0.0) > 0:
             sh_ratio = max(0.0, min(1.0, enemy.shield_hp / float(SHIELD_AMOUNT)))
             sby = by - (bar_h + 2)
-            pygame.draw.rect(screen, (30, 30, 50), (bx, sby, bar_w, bar_h))
-            pygame.draw.rect(screen, (60, 180, 255), (bx, sby, int(bar_w * sh_ratio), bar_h))
+            screen.fill((30, 30, 50), (bx, sby, bar_w, bar_h))
+            screen.fill((60, 180, 255), (bx, sby, int(bar_w * sh_ratio), bar_h))
 
-    # bullets
+    # bullets & enemy shots
+    shot_d = BULLET_RADIUS * 2 + 2
+    shot_blits = []
     if bullets:
+        spr = _dot_sprite((255, 255, 255), BULLET_RADIUS)
         for b in bullets:
-            b.draw(screen, cam_x, cam_y)
-
-    # enemy shots
+            if not (cull_l < b.x < cull_r and cull_t < b.y < cull_b): continue
+            bx = int(b.x - cam_x) - BULLET_RADIUS
+            by = int(b.y - cam_y) - BULLET_RADIUS
+            shot_blits.append((spr, (bx, by)))
+            dirty.append((bx - 1, by - 1, shot_d, shot_d))
     if enemy_shots:
+        spr = _dot_sprite((255, 120, 50), BULLET_RADIUS)
         for es in enemy_shots:
-            es.draw(screen, cam_x, cam_y)
-
-    # obstacles
-    for obstacle in game_state.obstacles.values():
+            if not (cull_l < es.x < cull_r and cull_t < es.y < cull_b): continue
+            bx = int(es.x - cam_x) - BULLET_RADIUS
+            by = int(es.y - cam_y) - BULLET_RADIUS
+            shot_blits.append((spr, (bx, by)))
+            dirty.append((bx - 1, by - 1, shot_d, shot_d))
+    screen.blits(shot_blits, doreturn=False)
+
+    # obstacles：砖块已在静态底图里，这里只整批贴会变化的血量文字
+    label_blits = []
+    obstacles = game_state.obstacles
+    visible = (obstacles.get((gx, gy)) for gy in range(start_y, end_y) for gx in range(start_x, end_x))
+    for obstacle in visible:
+        if obstacle is None: continue
         # is_main = hasattr(obstacle, 'is_main_block') and obstacle.is_main_block
-        # # if is_main:
-        # #     color = (255, 220, 80)
-        if obstacle.type == "Indestructible":
-            color = (120, 120, 120)
-        else:
-            color = (200, 80, 80)
-        draw_rect = obstacle.rect.copy()
-        draw_rect.x -= cam_x
-        draw_rect.y -= cam_y
-        pygame.draw.rect(screen, color, draw_rect)
         if obstacle.type == "Destructible":
-            font2 = pygame.font.SysFont(None, 30)
-            health_text = font2.render(str(obstacle.health), True, (255, 255, 255))
-            screen.blit(health_text, (draw_rect.x + 6, draw_rect.y + 8))
+            label_blits.append((_hp_label(obstacle.health), (obstacle.rect.x - cam_x + 6, obstacle.rect.y - cam_y + 8)))
         # if is_main:
-        #     star = pygame.font.SysFont(None, 32).render("★", True, (255, 255, 120))
+        #     star = _font(32).render("★", True, (255, 255, 120))
         #     screen.blit(star, (draw_rect.x + 8, draw_rect.y + 8))
+    screen.blits(label_blits, doreturn=False)
 
     draw_ui_topbar(screen, game_state, player, time_left=globals().get("_time_left_runtime"))
 
-    pygame.display.flip()
-    return screen.copy()
+    # 障碍被打掉/掉血、物品被拾取都会改动静态部分，这时整屏 flip
+    present_frame((cam_x, cam_y, len(obstacles), len(game_state.items), label_blits), dirty)
+    # 不再每帧整屏拷贝；需要保留画面（暂停/结算背景）时由调用方 copy
+    return screen
 
 
 # ==================== GAMESOUND ====================
@@ -2740,13 +3126,7 @@ def main_run_level(config, chosen_enemy_type: str) -> Tuple[str, Optional[str],
     player.fire_cd = 0.0
     apply_player_carry(player, globals().get("_carry_player_state"))
 
-    ztype_map = {
-        "enemy_fast": "fast",
-        "enemy_tank": "tank",
-        "enemy_strong": "strong",
-        "basic": "basic"
-    }
-    zt = ztype_map.get(chosen_enemy_type, "basic")
+    zt = _ZTYPE_MAP.get(chosen_enemy_type, "basic")
     enemies = [Enemy(pos, speed=ENEMY_SPEED, ztype=zt) for pos in enemy_starts]
 
     bullets: List[Bullet] = []
@@ -2755,9 +3135,6 @@ def main_run_level(config, chosen_enemy_type: str) -> Tuple[str, Optional[str],
     spawn_timer = 0.0
     wave_index = 0
 
-    def player_center():
-        return player.x + player.size / 2, player.y + player.size / 2 + INFO_BAR_HEIGHT
-
     def pick_enemy_type_weighted():
         # 可按关卡/波次调整，这里给一个基础权重
         table = [
@@ -2793,60 +3170,53 @@ def main_run_level(config, chosen_enemy_type: str) -> Tuple[str, Optional[str],
             if len(out) >= n: break
         return out
 
-    def find_target():
-        px, py = player_center()
+    def find_target(px: float, py: float):
         best = None
         best_d2 = float('inf')
         # Prefer enemies first
         for z in enemies:
-            cx, cy = z.rect.centerx, z.rect.centery
-            d2 = (cx - px) ** 2 + (cy - py) ** 2
+            cx, cy = z.rect.center
+            dx = cx - px
+            dy = cy - py
+            d2 = dx * dx + dy * dy
             if d2 < best_d2:
                 best_d2 = d2
                 best = ('enemy', None, z, cx, cy)
-        # Then destructible blocks (non-main)
-        for gp, ob in game_state.obstacles.items():
-            if ob.type == 'Destructible' and not getattr(ob, 'is_main_block', False):
-                cx, cy = ob.rect.centerx, ob.rect.centery
-                d2 = (cx - px) ** 2 + (cy - py) ** 2
-                if d2 < best_d2:
-                    best_d2 = d2;
-                    best = ('block', gp, ob, cx, cy)
-        return best, (best_d2 ** 0.5) if best else None
+        # Then destructible blocks (non-main): ring search, only as far as could still win / be in range
+        ob, d2 = game_state.nearest_block(px, py, best_d2, _MAX_FIRE_RANGE_SQ)
+        if ob is not None:
+            best_d2 = d2
+            best = ('block', ob.grid_pos, ob, ob.rect.centerx, ob.rect.centery)
+        return best, best_d2
 
     # Initial spawn: use threat budget once
     spawn_wave_with_budget(game_state, player, current_level, wave_index, enemies, ENEMY_CAP)
 
     running = True
     game_result = None
-    last_frame = None
+    frame_drawn = False
+    reset_present()  # 新关卡第一帧整屏 flip
+
+    def grab_frame() -> pygame.Surface:
+        # 只在真正需要背景图（暂停/结算）时才拷贝屏幕
+        if not frame_drawn:
+            render_game(screen, game_state, player, enemies, bullets, enemy_shots)
+        return screen.copy()
+
     time_left = float(LEVEL_TIME_LIMIT)
     globals()["_time_left_runtime"] = time_left
     clock.tick(60)
 
+    # 固定步长模拟：移动速度按“每帧像素”写的，用 60Hz 定步长推进，掉帧时补步；渲染每帧一次并插值
+    acc = 0.0
+    prev_pos = None
     while running:
-        dt = clock.tick(60) / 1000.0
-        # countdown timer
-        time_left -= dt
-        globals()["_time_left_runtime"] = time_left
-        if time_left <= 0:
-            game_result = "success" if 'game_result' in locals() else "success"
-            running = False
-
-        # === wave spawning ===
-        spawn_timer += dt
-        if spawn_timer >= SPAWN_INTERVAL:
-            spawn_timer = 0.0
-            if len(enemies) < ENEMY_CAP:
-                spawned = spawn_wave_with_budget(game_state, player, current_level, wave_index, enemies, ENEMY_CAP)
-                if spawned > 0:
-                    wave_index += 1
-                    globals()["_max_wave_reached"] = max(globals().get("_max_wave_reached", 0), wave_index)
+        acc += min(clock.tick(60) / 1000.0, MAX_FRAME_DT)
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT: pygame.quit(); sys.exit()
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                bg = last_frame or render_game(screen, game_state, player, enemies, bullets, enemy_shots)
+                bg = grab_frame()
                 choice, time_left = pause_game_modal(screen, bg, clock, time_left)
 
                 if choice == 'continue':
@@ -2870,68 +3240,96 @@ def main_run_level(config, chosen_enemy_type: str) -> Tuple[str, Optional[str],
                                   max_wave_reached=wave_index)
                     return 'exit', config.get('reward', None), bg
 
-        keys = pygame.key.get_pressed()
-        player.move(keys, game_state.obstacles)
-        game_state.collect_item(player.rect)
-        game_state.update_spoils(dt)
-        game_state.collect_spoils(player.rect)
-        game_state.update_heals(dt)
-        game_state.collect_heals(player)
-
-        # Autofire handling
-        player.fire_cd = getattr(player, 'fire_cd', 0.0) - dt
-        target, dist = find_target()
-        if target and player.fire_cd <= 0 and (dist is None or dist <= MAX_FIRE_RANGE):
-            _, gp, ob_or_z, cx, cy = target
-            px, py = player_center()
-            dx, dy = cx - px, cy - py
-            length = (dx * dx + dy * dy) ** 0.5 or 1.0
-            vx, vy = (dx / length) * BULLET_SPEED, (dy / length) * BULLET_SPEED
-            bullets.append(Bullet(px, py, vx, vy, MAX_FIRE_RANGE, damage=player.bullet_damage))
-            player.fire_cd += player.fire_cooldown()
-
-        # Update bullets
-        for b in list(bullets):
-            b.update(dt, game_state, enemies, player)
-            if not b.alive:
-                bullets.remove(b)
-
-        player.hit_cd = max(0.0, player.hit_cd - dt)
-        for enemy in list(enemies):
-            enemy.move_and_attack(player, list(game_state.obstacles.values()), game_state, dt=dt)
-            if enemy.rect.colliderect(player.rect) and player.hit_cd <= 0.0:
-                player.hp -= int(ENEMY_CONTACT_DAMAGE)
-                player.hit_cd = float(PLAYER_HIT_COOLDOWN)
-                if player.hp <= 0:
-                    game_result = "fail"
-                    running = False
-                    break
-        # special behaviors & enemy shots
-        for z in list(enemies):
-            z.update_special(dt, player, enemies, enemy_shots)
-            if z.hp <= 0:
-                # drop spoils & share XP even if it died by fuse/other causes
-                game_state.spawn_spoils(z.rect.centerx, z.rect.centery, SPOILS_PER_KILL)
-                if random.random() < HEAL_DROP_CHANCE_ENEMY:
-                    game_state.spawn_heal(z.rect.centerx, z.rect.centery, HEAL_POTION_AMOUNT)
+        while running and acc >= SIM_DT:
+            acc -= SIM_DT
+            if acc < SIM_DT:  # 本帧最后一步：记下步前位置供渲染插值
+                prev_pos = {z: (z.rect.x, z.rect.y) for z in enemies}
+                prev_pos[player] = (player.rect.x, player.rect.y)
+            dt = SIM_DT
+            # countdown timer
+            time_left -= dt
+            globals()["_time_left_runtime"] = time_left
+            if time_left <= 0:
+                game_result = "success" if 'game_result' in locals() else "success"
+                running = False
+
+            # === wave spawning ===
+            spawn_timer += dt
+            if spawn_timer >= SPAWN_INTERVAL:
+                spawn_timer = 0.0
+                if len(enemies) < ENEMY_CAP:
+                    spawned = spawn_wave_with_budget(game_state, player, current_level, wave_index, enemies, ENEMY_CAP)
+                    if spawned > 0:
+                        wave_index += 1
+                        globals()["_max_wave_reached"] = max(globals().get("_max_wave_reached", 0), wave_index)
+
+            keys = pygame.key.get_pressed()
+            player.move(keys, game_state.obstacles)
+            game_state.collect_item(player.rect)
+            game_state.update_spoils(dt)
+            game_state.collect_spoils(player.rect)
+            game_state.update_heals(dt)
+            game_state.collect_heals(player)
+
+            # Autofire handling
+            # 玩家中心每帧只算一次，同时用于选目标和发射
+            px = player.x + player.size / 2
+            py = player.y + player.size / 2 + INFO_BAR_HEIGHT
+            player.fire_cd -= dt
+            target, d2 = find_target(px, py)
+            if target and player.fire_cd <= 0 and d2 <= _MAX_FIRE_RANGE_SQ:
+                _, gp, ob_or_z, cx, cy = target
+                dx, dy = cx - px, cy - py
+                length = (dx * dx + dy * dy) ** 0.5 or 1.0
+                vx, vy = (dx / length) * BULLET_SPEED, (dy / length) * BULLET_SPEED
+                bullets.append(spawn_bullet(px, py, vx, vy, MAX_FIRE_RANGE, damage=player.bullet_damage))
+                player.fire_cd += player.fire_cooldown()
+
+            # Update bullets
+            # 子弹只会在自身 update 里被标记死亡，统一在帧末一次性压缩列表
+            enemy_rects = [z.rect for z in enemies]
+            for b in bullets:
+                b.update(dt, game_state, enemies, player, enemy_rects)
+            drop_dead(bullets, _bullet_pool)
+
+            player.hit_cd = max(0.0, player.hit_cd - dt)
+            for enemy in enemies:  # 移动阶段不会增删敌人，无需拷贝列表
+                enemy.move_and_attack(player, game_state.obstacles, game_state, dt=dt)
+                if enemy.rect.colliderect(player.rect) and player.hit_cd <= 0.0:
+                    player.hp -= int(ENEMY_CONTACT_DAMAGE)
+                    player.hit_cd = float(PLAYER_HIT_COOLDOWN)
+                    if player.hp <= 0:
+                        game_result = "fail"
+                        running = False
+                        break
+            # special behaviors & enemy shots
+            for z in list(enemies):
+                z.update_special(dt, player, enemies, enemy_shots)
+                if z.hp <= 0:
+                    # drop spoils & share XP even if it died by fuse/other causes
+                    game_state.spawn_spoils(z.rect.centerx, z.rect.centery, SPOILS_PER_KILL)
+                    if random.random() < HEAL_DROP_CHANCE_ENEMY:
+                        game_state.spawn_heal(z.rect.centerx, z.rect.centery, HEAL_POTION_AMOUNT)
 
-                transfer_xp_to_neighbors(z, enemies)
-                enemies.remove(z)
+                    transfer_xp_to_neighbors(z, enemies)
+                    enemies.remove(z)
 
-        # enemy shots update
-        for es in list(enemy_shots):
-            es.update(dt, player, game_state)
-            if not es.alive:
-                enemy_shots.remove(es)
+            # enemy shots update
+            for es in enemy_shots:
+                es.update(dt, player, game_state)
+            drop_dead(enemy_shots)
+
+            if player.hp <= 0:
+                break
 
         # >>> FAIL CONDITION <<<
         if player.hp <= 0:
             game_result = "fail"
             running = False
             continue
-
-
-        last_frame = render_game(pygame.display.get_surface(), game_state, player, enemies, bullets, enemy_shots)
+        # 每帧都渲染（即使本帧没有推进模拟），位置按剩余累积时间插值
+        render_game(screen, game_state, player, enemies, bullets, enemy_shots, acc / SIM_DT, prev_pos)
+        frame_drawn = True
 
         if game_result == "success":
             globals()["_last_spoils"] = getattr(game_state, "spoils_gained", 0)
@@ -2940,7 +3338,7 @@ def main_run_level(config, chosen_enemy_type: str) -> Tuple[str, Optional[str],
             # NEW: save carry on death so 'Retry' keeps your levels/xp
             globals()["_carry_player_state"] = capture_player_carry(player)
 
-    return game_result, config.get("reward", None), last_frame
+    return game_result, config.get("reward", None), grab_frame()
 
 
 def run_from_snapshot(save_data: dict) -> Tuple[str, Optional[str], pygame.Surface]:
@@ -3027,57 +3425,51 @@ def run_from_snapshot(save_data: dict) -> Tuple[str, Optional[str], pygame.Surfa
     screen = pygame.display.get_surface()
     clock = pygame.time.Clock()
     running = True
-    last_frame = None
+    frame_drawn = False
+    reset_present()  # 新关卡第一帧整屏 flip
+
+    def grab_frame() -> pygame.Surface:
+        # 只在真正需要背景图（暂停/结算）时才拷贝屏幕
+        if not frame_drawn:
+            render_game(screen, game_state, player, enemies, bullets, enemy_shots)
+        return screen.copy()
+
     chosen_enemy_type = meta.get("chosen_enemy_type", "basic")
 
     # Spawner state
     spawn_timer = 0.0
     wave_index = 0
 
-    def player_center():
-        return player.x + player.size / 2, player.y + player.size / 2 + INFO_BAR_HEIGHT
-
-    def find_target():
-        px, py = player_center()
+    def find_target(px: float, py: float):
         best = None
         best_d2 = float('inf')
         # prefer enemies
         for z in enemies:
-            cx, cy = z.rect.centerx, z.rect.centery
-            d2 = (cx - px) ** 2 + (cy - py) ** 2
+            cx, cy = z.rect.center
+            dx = cx - px
+            dy = cy - py
+            d2 = dx * dx + dy * dy
             if d2 < best_d2:
                 best_d2 = d2;
                 best = ('enemy', None, z, cx, cy)
-        # then destructible blocks
-        for gp, ob in game_state.obstacles.items():
-            if ob.type == 'Destructible' and not getattr(ob, 'is_main_block', False):
-                cx, cy = ob.rect.centerx, ob.rect.centery
-                d2 = (cx - px) ** 2 + (cy - py) ** 2
-                if d2 < best_d2:
-                    best_d2 = d2;
-                    best = ('block', gp, ob, cx, cy)
-        return best, (best_d2 ** 0.5) if best else None
-
+        # then destructible blocks (ring search over the target buckets)
+        ob, d2 = game_state.nearest_block(px, py, best_d2, _MAX_FIRE_RANGE_SQ)
+        if ob is not None:
+            best_d2 = d2
+            best = ('block', ob.grid_pos, ob, ob.rect.centerx, ob.rect.centery)
+        return best, best_d2
+
+    # 固定步长模拟（同 main_run_level）
+    acc = 0.0
+    prev_pos = None
     while running:
-        dt = clock.tick(60) / 1000.0
-
-        # survival timer
-        time_left -= dt
-        globals()["_time_left_runtime"] = time_left
-        if time_left <= 0:
-            # win on survival
-            chosen = show_success_screen(
-                screen,
-                last_frame or render_game(screen, game_state, player, enemies, bullets, enemy_shots),
-                reward_choices=[]
-            )
-            return "success", None, last_frame or screen.copy()
+        acc += min(clock.tick(60) / 1000.0, MAX_FRAME_DT)
 
         # input
         for event in pygame.event.get():
             if event.type == pygame.QUIT: pygame.quit(); sys.exit()
             if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-                bg = last_frame or render_game(screen, game_state, player, enemies, bullets, enemy_shots)
+                bg = grab_frame()
                 choice, time_left = pause_game_modal(screen, bg, clock, time_left)
                 if choice == 'continue':
                     pass
@@ -3101,129 +3493,156 @@ def run_from_snapshot(save_data: dict) -> Tuple[str, Optional[str], pygame.Surfa
                     )
                     return 'exit', None, bg
 
-        # movement & pickups
-        keys = pygame.key.get_pressed()
-        player.move(keys, game_state.obstacles)
-        game_state.collect_item(player.rect)
-        game_state.update_spoils(dt)
-        game_state.collect_spoils(player.rect)
-        game_state.update_heals(dt)
-        game_state.collect_heals(player)
-
-        # Autofire
-        player.fire_cd = getattr(player, 'fire_cd', 0.0) - dt
-        target, dist = find_target()
-        if target and player.fire_cd <= 0 and (dist is None or dist <= MAX_FIRE_RANGE):
-            _, gp, ob_or_z, cx, cy = target
-            px, py = player_center()
-            dx, dy = cx - px, cy - py
-            L = (dx * dx + dy * dy) ** 2 ** 0.5 if False else ((dx * dx + dy * dy) ** 0.5)  # keep readable
-            L = L or 1.0
-            vx, vy = (dx / L) * BULLET_SPEED, (dy / L) * BULLET_SPEED
-            bullets.append(Bullet(px, py, vx, vy, MAX_FIRE_RANGE, damage=player.bullet_damage))
-            player.fire_cd += player.fire_cooldown()
-
-        # Update bullets
-        for b in list(bullets):
-            b.update(dt, game_state, enemies, player)
-            if not b.alive:
-                bullets.remove(b)
-
-        # === wave spawning (budget-based ONLY) ===
-        spawn_timer += dt
-        if spawn_timer >= SPAWN_INTERVAL:
-            spawn_timer = 0.0
-            if len(enemies) < ENEMY_CAP:
-                spawned = spawn_wave_with_budget(game_state, player, level_idx, wave_index, enemies, ENEMY_CAP)
-                if spawned > 0:
-                    wave_index += 1
-                    globals()["_max_wave_reached"] = max(globals().get("_max_wave_reached", 0), wave_index)
-
-        # Enemies update & contact damage
-        player.hit_cd = max(0.0, player.hit_cd - dt)
-        for enemy in list(enemies):
-            enemy.move_and_attack(player, list(game_state.obstacles.values()), game_state, dt=dt)
-            if enemy.rect.colliderect(player.rect) and player.hit_cd <= 0.0:
-                player.hp -= int(ENEMY_CONTACT_DAMAGE)
-                player.hit_cd = float(PLAYER_HIT_COOLDOWN)
-                if player.hp <= 0:
-                    clear_save()
-                    action = show_fail_screen(screen,
-                                              last_frame or render_game(screen, game_state, player, enemies, bullets,
-                                                                        enemy_shots))
-                    if action == "home":
-                        clear_save();
-                        flush_events()
-                        return "home", None, last_frame or screen.copy()
-                    elif action == "retry":
-                        clear_save();
-                        flush_events()
-                        return "restart", None, last_frame or screen.copy()
+        while acc >= SIM_DT:
+            acc -= SIM_DT
+            if acc < SIM_DT:  # 本帧最后一步：记下步前位置供渲染插值
+                prev_pos = {z: (z.rect.x, z.rect.y) for z in enemies}
+                prev_pos[player] = (player.rect.x, player.rect.y)
+            dt = SIM_DT
+            # survival timer
+            time_left -= dt
+            globals()["_time_left_runtime"] = time_left
+            if time_left <= 0:
+                # win on survival
+                bg = grab_frame()
+                chosen = show_success_screen(
+                    screen,
+                    bg,
+                    reward_choices=[]
+                )
+                return "success", None, bg
+
+            # movement & pickups
+            keys = pygame.key.get_pressed()
+            player.move(keys, game_state.obstacles)
+            game_state.collect_item(player.rect)
+            game_state.update_spoils(dt)
+            game_state.collect_spoils(player.rect)
+            game_state.update_heals(dt)
+            game_state.collect_heals(player)
+
+            # Autofire
+            # 玩家中心每帧只算一次，同时用于选目标和发射
+            px = player.x + player.size / 2
+            py = player.y + player.size / 2 + INFO_BAR_HEIGHT
+            player.fire_cd -= dt
+            target, d2 = find_target(px, py)
+            if target and player.fire_cd <= 0 and d2 <= _MAX_FIRE_RANGE_SQ:
+                _, gp, ob_or_z, cx, cy = target
+                dx, dy = cx - px, cy - py
+                L = (dx * dx + dy * dy) ** 0.5 or 1.0  # 只有归一化速度时才开方
+                vx, vy = (dx / L) * BULLET_SPEED, (dy / L) * BULLET_SPEED
+                bullets.append(spawn_bullet(px, py, vx, vy, MAX_FIRE_RANGE, damage=player.bullet_damage))
+                player.fire_cd += player.fire_cooldown()
+
+            # Update bullets
+            # 子弹只会在自身 update 里被标记死亡，统一在帧末一次性压缩列表
+            enemy_rects = [z.rect for z in enemies]
+            for b in bullets:
+                b.update(dt, game_state, enemies, player, enemy_rects)
+            drop_dead(bullets, _bullet_pool)
+
+            # === wave spawning (budget-based ONLY) ===
+            spawn_timer += dt
+            if spawn_timer >= SPAWN_INTERVAL:
+                spawn_timer = 0.0
+                if len(enemies) < ENEMY_CAP:
+                    spawned = spawn_wave_with_budget(game_state, player, level_idx, wave_index, enemies, ENEMY_CAP)
+                    if spawned > 0:
+                        wave_index += 1
+                        globals()["_max_wave_reached"] = max(globals().get("_max_wave_reached", 0), wave_index)
+
+            # Enemies update & contact damage
+            player.hit_cd = max(0.0, player.hit_cd - dt)
+            for enemy in enemies:  # 移动阶段不会增删敌人，无需拷贝列表
+                enemy.move_and_attack(player, game_state.obstacles, game_state, dt=dt)
+                if enemy.rect.colliderect(player.rect) and player.hit_cd <= 0.0:
+                    player.hp -= int(ENEMY_CONTACT_DAMAGE)
+                    player.hit_cd = float(PLAYER_HIT_COOLDOWN)
+                    if player.hp <= 0:
+                        clear_save()
+                        bg = grab_frame()
+                        action = show_fail_screen(screen, bg)
+                        if action == "home":
+                            clear_save();
+                            flush_events()
+                            return "home", None, bg
+                        elif action == "retry":
+                            clear_save();
+                            flush_events()
+                            return "restart", None, bg
+
+            # Special behaviors & enemy shots
+            for z in list(enemies):
+                z.update_special(dt, player, enemies, enemy_shots)
+                if z.hp <= 0:
+                    game_state.spawn_spoils(z.rect.centerx, z.rect.centery, SPOILS_PER_KILL)
+                    if random.random() < HEAL_DROP_CHANCE_ENEMY:
+                        game_state.spawn_heal(z.rect.centerx, z.rect.centery, HEAL_POTION_AMOUNT)
+                    transfer_xp_to_neighbors(z, enemies)
+                    enemies.remove(z)
 
-        # Special behaviors & enemy shots
-        for z in list(enemies):
-            z.update_special(dt, player, enemies, enemy_shots)
-            if z.hp <= 0:
-                game_state.spawn_spoils(z.rect.centerx, z.rect.centery, SPOILS_PER_KILL)
-                if random.random() < HEAL_DROP_CHANCE_ENEMY:
-                    game_state.spawn_heal(z.rect.centerx, z.rect.centery, HEAL_POTION_AMOUNT)
-                transfer_xp_to_neighbors(z, enemies)
-                enemies.remove(z)
+            for es in enemy_shots:
+                es.update(dt, player, game_state)
+            drop_dead(enemy_shots)
 
-        for es in list(enemy_shots):
-            es.update(dt, player, game_state)
-            if not es.alive:
-                enemy_shots.remove(es)
+            if player.hp <= 0:
+                break
 
         # Fail check (redundant guard)
         if player.hp <= 0:
             clear_save()
-            action = show_fail_screen(screen,
-                                      last_frame or render_game(screen, game_state, player, enemies, bullets,
-                                                                enemy_shots))
+            bg = grab_frame()
+            action = show_fail_screen(screen, bg)
             if action == "home":
                 clear_save();
                 flush_events()
-                return "home", None, last_frame or screen.copy()
+                return "home", None, bg
             elif action == "retry":
                 clear_save();
                 flush_events()
-                return "restart", None, last_frame or screen.copy()
+                return "restart", None, bg
 
+        # 每帧都渲染（即使本帧没有推进模拟），位置按剩余累积时间插值
+        render_game(screen, game_state, player, enemies, bullets, enemy_shots, acc / SIM_DT, prev_pos)
+        frame_drawn = True
 
-        last_frame = render_game(pygame.display.get_surface(), game_state, player, enemies, bullets, enemy_shots)
-
-    return "home", None, last_frame or screen.copy()
+    return "home", None, grab_frame()
 
 
 def select_enemy_screen(screen, owned_cards: List[str]) -> str:
     if not owned_cards: return "basic"
-    clock = pygame.time.Clock()
+    rects = []
+    confirm = None
+    dirty = True
     while True:
-        screen.fill((18, 18, 18))
-        title = pygame.font.SysFont(None, 48).render("Choose Next Level's Enemy", True, (230, 230, 230))
-        screen.blit(title, title.get_rect(center=(VIEW_W // 2, 110)))
-        rects = []
-        for i, card in enumerate(owned_cards):
-            x = VIEW_W // 2 - (len(owned_cards) * 140) // 2 + i * 140
-            rect = pygame.Rect(x, 180, 120, 160)
-            pygame.draw.rect(screen, (200, 200, 200), rect)
-            name = pygame.font.SysFont(None, 24).render(card.replace("_", " ").upper(), True, (30, 30, 30))
-            screen.blit(name, name.get_rect(center=(rect.centerx, rect.bottom - 18)))
-            pygame.draw.rect(screen, (40, 40, 40), rect, 3)
-            rects.append((rect, card))
-        confirm = draw_button(screen, "CONFIRM", (VIEW_W // 2 - 90, 370))
-        pygame.display.flip()
+        if dirty:
+            screen.fill((18, 18, 18))
+            title = _font(48).render("Choose Next Level's Enemy", True, (230, 230, 230))
+            screen.blit(title, title.get_rect(center=(VIEW_W // 2, 110)))
+            rects = []
+            for i, card in enumerate(owned_cards):
+                x = VIEW_W // 2 - (len(owned_cards) * 140) // 2 + i * 140
+                rect = pygame.Rect(x, 180, 120, 160)
+                pygame.draw.rect(screen, (200, 200, 200), rect)
+                name = _font(24).render(card.replace("_", " ").upper(), True, (30, 30, 30))
+                screen.blit(name, name.get_rect(center=(rect.centerx, rect.bottom - 18)))
+                pygame.draw.rect(screen, (40, 40, 40), rect, 3)
+                rects.append((rect, card))
+            confirm = draw_button(screen, "CONFIRM", (VIEW_W // 2 - 90, 370))
+            pygame.display.flip()
+            dirty = False
         chosen = None
-        for event in pygame.event.get():
+        for event in wait_events(types=MENU_EVENTS):
             if event.type == pygame.QUIT: pygame.quit(); sys.exit()
+            if event.type in REDRAW_EVENTS:
+                dirty = True
             if event.type == pygame.MOUSEBUTTONDOWN:
                 for rect, card in rects:
                     if rect.collidepoint(event.pos): chosen = card
                 if confirm.collidepoint(event.pos) and (chosen or owned_cards):
                     door_transition(screen)
                     return chosen or owned_cards[0]
-        clock.tick(60)
 
 
 # ==================== 入口 ====================
@@ -3235,7 +3654,8 @@ if __name__ == "__main__":
     info = pygame.display.Info()
 
     # Create the window first (safer on some systems)
-    screen = pygame.display.set_mode((info.current_w, info.current_h), pygame.NOFRAME)
+    # vsync=0：flip 不等垂直同步，帧率上限只由 clock.tick(60) 控制（2D 网格画面，轻微撕裂可接受）
+    screen = pygame.display.set_mode((info.current_w, info.current_h), pygame.NOFRAME, vsync=0)
     pygame.display.set_caption(GAME_TITLE)
     VIEW_W, VIEW_H = info.current_w, info.current_h
     # Make the world at least as big as what we can see (removes “non-playable band”)
@@ -3249,7 +3669,7 @@ if __name__ == "__main__":
         print(f"[Audio] background music not started: {e}")
 
     # Borderless fullscreen to avoid display mode flicker
-    screen = pygame.display.set_mode((info.current_w, info.current_h), pygame.NOFRAME)
+    screen = pygame.display.set_mode((info.current_w, info.current_h), pygame.NOFRAME, vsync=0)
     pygame.display.set_caption(GAME_TITLE)
     VIEW_W, VIEW_H = info.current_w, info.current_h
     # Make the world at least as big as what we can see (removes “non-playable band”)
@@ -3,7 +3,8 @@ import sys
 import pygame
 import math
 import random
-from queue import PriorityQueue
+from functools import lru_cache
+from heapq import heappush, heappop
 from typing import Dict, List, Set, Tuple, Optional
 
 # ==================== 游戏常量配置 ====================
@@ -38,6 +39,22 @@ DIRECTIONS = {
     pygame.K_w: (0, -1),  # 上
     pygame.K_s: (0, 1),  # 下
 }
+# 格子图的四邻域
+NEIGHBOR_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+def _build_move_table() -> Tuple[Tuple[float, float], ...]:
+    """按键组合 (W<<3 | S<<2 | A<<1 | D) -> 移动方向，斜向已归一化"""
+    table = []
+    for code in range(16):
+        dx = (code & 1) - ((code >> 1) & 1)
+        dy = ((code >> 2) & 1) - ((code >> 3) & 1)
+        k = 0.7071 if dx and dy else 1
+        table.append((dx * k, dy * k))
+    return tuple(table)
+
+
+MOVE_TABLE = _build_move_table()
 
 
 # ==================== 数据结构 ====================
@@ -45,28 +62,52 @@ class Graph:
     """表示游戏地图的图结构，用于路径查找"""
 
     def __init__(self):
-        self.edges: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
-        self.weights: Dict[Tuple[Tuple[int, int], Tuple[int, int]], float] = {}
+        # 邻接表直接存 (邻居, 代价)，寻路内层循环不用再查一次权重
+        self.edges: Dict[Tuple[int, int], List[Tuple[Tuple[int, int], float]]] = {}
 
     def add_edge(self, from_node: Tuple[int, int], to_node: Tuple[int, int], weight: float) -> None:
         """添加一条边到图中"""
-        if from_node not in self.edges:
-            self.edges[from_node] = []
-        self.edges[from_node].append(to_node)
-        self.weights[(from_node, to_node)] = weight
+        self.edges.setdefault(from_node, []).append((to_node, weight))
 
-    def neighbors(self, node: Tuple[int, int]) -> List[Tuple[int, int]]:
-        """获取节点的邻居"""
+    def neighbors(self, node: Tuple[int, int]) -> List[Tuple[Tuple[int, int], float]]:
+        """获取节点的邻居及移动代价"""
         return self.edges.get(node, [])
 
-    def cost(self, from_node: Tuple[int, int], to_node: Tuple[int, int]) -> float:
-        """获取两个节点之间的移动代价"""
-        return self.weights.get((from_node, to_node), float('inf'))
+    def remove_edges_to(self, node: Tuple[int, int]) -> None:
+        """删除所有指向 node 的边（只可能来自它的 4 个邻居）"""
+        x, y = node
+        for dx, dy in NEIGHBOR_OFFSETS:
+            adj = self.edges.get((x + dx, y + dy))
+            if adj:
+                adj[:] = [e for e in adj if e[0] != node]
+
+    def add_edges_around(self, node: Tuple[int, int], grid_size: int,
+                         obstacles: Dict[Tuple[int, int], "Obstacle"]) -> None:
+        """node 格子状态变化后（如障碍被摧毁），只重连它与 4 个邻居之间的边"""
+        self.remove_edges_to(node)
+        self.edges.pop(node, None)
+        ob = obstacles.get(node)
+        if ob is not None and ob.type == "Indestructible":
+            return
+        w_in = 10 if ob is not None and ob.type == "Destructible" else 1
+        x, y = node
+        for dx, dy in NEIGHBOR_OFFSETS:
+            nb = (x + dx, y + dy)
+            if not (0 <= nb[0] < grid_size and 0 <= nb[1] < grid_size):
+                continue
+            nb_ob = obstacles.get(nb)
+            if nb_ob is not None and nb_ob.type == "Indestructible":
+                continue
+            self.add_edge(nb, node, w_in)
+            self.add_edge(node, nb, 10 if nb_ob is not None and nb_ob.type == "Destructible" else 1)
 
 
 class Obstacle:
     """表示游戏中的障碍物"""
 
+    __slots__ = ("rect", "type", "health", "_k_cost")
+    is_main_block = False  # 普通障碍；MainBlock 用同名 slot 覆盖
+
     def __init__(self, x: int, y: int, obstacle_type: str, health: Optional[int] = None):
         # def __init__(self, pos: Tuple[int, int], obstacle_type: str, health: Optional[int] = None):
         """
@@ -82,6 +123,16 @@ class Obstacle:
         self.rect = pygame.Rect(px, py, CELL_SIZE, CELL_SIZE)
         self.type: str = obstacle_type
         self.health: Optional[int] = health
+        self._k_cost = self._calc_k_cost()
+
+    def _calc_k_cost(self) -> float:
+        """A* 穿过该障碍的额外代价：打穿所需攻击次数 * 0.1"""
+        return math.ceil(self.health / ENEMY_ATTACK) * 0.1 if self.health else 0.0
+
+    def take_damage(self, dmg: int) -> None:
+        """扣血并同步刷新寻路代价"""
+        self.health -= dmg
+        self._k_cost = self._calc_k_cost()
 
     def is_destroyed(self) -> bool:
         """检查障碍物是否已被破坏"""
@@ -93,6 +144,8 @@ class Obstacle:
 
 
 class MainBlock(Obstacle):
+    __slots__ = ("is_main_block",)
+
     def __init__(self, x: int, y: int, health: Optional[int] = MAIN_BLOCK_HEALTH):
         # def __init__(self, pos: Tuple[int, int], health: Optional[int] = MAIN_BLOCK_HEALTH):
         super().__init__(x, y, "Destructible", health)
@@ -100,6 +153,8 @@ class MainBlock(Obstacle):
 
 
 class Item:
+    __slots__ = ("x", "y", "is_main", "radius", "center", "rect")
+
     def __init__(self, x: int, y: int, is_main=False):
         self.x = x
         self.y = y
@@ -118,6 +173,26 @@ class Item:
         )
 
 
+def obstacles_in_rect(obstacles: Dict[Tuple[int, int], Obstacle], rect: pygame.Rect) -> List[Obstacle]:
+    """返回与 rect 重叠的障碍物：障碍物正好占满格子，只需查 rect 覆盖到的几个格子"""
+    x0 = rect.left // CELL_SIZE
+    x1 = (rect.right - 1) // CELL_SIZE
+    y0 = (rect.top - INFO_BAR_HEIGHT) // CELL_SIZE
+    y1 = (rect.bottom - 1 - INFO_BAR_HEIGHT) // CELL_SIZE
+    hits = []
+    for gy in range(y0, y1 + 1):
+        for gx in range(x0, x1 + 1):
+            ob = obstacles.get((gx, gy))
+            if ob is not None:
+                hits.append(ob)
+    return hits
+
+
+def hit_priority(ob: Obstacle) -> Tuple[bool, bool]:
+    """同时撞到多个障碍时的处理顺序：主方块 → 可破坏 → 不可破坏（与障碍字典的插入顺序一致）"""
+    return not ob.is_main_block, ob.type != "Destructible"
+
+
 # ---------- OO 角色定义 ----------
 # class Player:
 #     """玩家角色"""
@@ -156,6 +231,8 @@ class Item:
 class Player:
     """玩家角色（像素自由移动版）"""
 
+    __slots__ = ("x", "y", "speed", "size", "rect", "_probe")
+
     def __init__(self, pos: Tuple[int, int], speed: int = PLAYER_SPEED):
         """
         pos: 初始格子 (x, y)
@@ -166,6 +243,7 @@ class Player:
         self.speed = speed
         self.size = CELL_SIZE - 6  # 角色实际占位像素，略小于格子便于走位
         self.rect = pygame.Rect(self.x, self.y + INFO_BAR_HEIGHT, self.size, self.size)
+        self._probe = pygame.Rect(0, 0, self.size, self.size)  # 复用的试探碰撞盒
 
     @property
     def pos(self):
@@ -173,30 +251,19 @@ class Player:
         return int((self.x + self.size // 2) // CELL_SIZE), int((self.y + self.size // 2) // CELL_SIZE)
 
     def move(self, keys, obstacles):
-        dx = dy = 0
-        if keys[pygame.K_w]:
-            dy -= 1
-        if keys[pygame.K_s]:
-            dy += 1
-        if keys[pygame.K_a]:
-            dx -= 1
-        if keys[pygame.K_d]:
-            dx += 1
-        # 斜向归一化
-        if dx != 0 and dy != 0:
-            dx *= 0.7071
-            dy *= 0.7071
+        # 查表得到方向（斜向归一化已算在表里）
+        code = (keys[pygame.K_w] << 3) | (keys[pygame.K_s] << 2) | (keys[pygame.K_a] << 1) | keys[pygame.K_d]
+        dx, dy = MOVE_TABLE[code]
 
         nx = self.x + dx * self.speed
         ny = self.y + dy * self.speed
 
-        # 预测下一帧碰撞盒
-        next_rect = pygame.Rect(int(nx), int(ny) + INFO_BAR_HEIGHT, self.size, self.size)
-        can_move = True
-        for ob in obstacles.values():
-            if next_rect.colliderect(ob.rect):
-                can_move = False
-                break
+        # 预测下一帧碰撞盒（原地改坐标，不新建 Rect）
+        next_rect = self._probe
+        next_rect.x = int(nx)
+        next_rect.y = int(ny) + INFO_BAR_HEIGHT
+        # 按格子查表，不再遍历全部障碍物
+        can_move = not obstacles_in_rect(obstacles, next_rect)
 
         if can_move and 0 <= nx < WINDOW_SIZE - self.size and 0 <= ny < WINDOW_SIZE - self.size:
             self.x = nx
@@ -239,6 +306,8 @@ class Enemy:
     #     self.breaking_obstacle: Optional[Tuple[int, int]] = None
     """像素自由移动版僵尸"""
 
+    __slots__ = ("x", "y", "attack", "speed", "size", "rect", "attack_timer", "_probe")
+
     def __init__(self, pos: Tuple[int, int], attack: int = ENEMY_ATTACK, speed: int = ENEMY_SPEED):
         # 初始格子坐标转像素
         self.x = pos[0] * CELL_SIZE
@@ -247,6 +316,8 @@ class Enemy:
         self.speed = speed
         self.size = CELL_SIZE - 6  # 可微调
         self.rect = pygame.Rect(self.x, self.y + INFO_BAR_HEIGHT, self.size, self.size)
+        self.attack_timer = 0.0
+        self._probe = pygame.Rect(0, 0, self.size, self.size)  # 复用的试探碰撞盒
 
     @property
     def pos(self) -> Tuple[int, int]:
@@ -254,38 +325,42 @@ class Enemy:
         return int((self.x + self.size // 2) // CELL_SIZE), int((self.y + self.size // 2) // CELL_SIZE)
 
     def move_and_attack(self, player, obstacles, game_state, attack_interval=0.5, dt=1 / 60):
+        # obstacles 是按格子索引的障碍字典（game_state.obstacles），直接查表，不必每帧复制成列表
         # attack_interval 秒攻击一次（例如 0.5s），dt 是本帧时长
-        if not hasattr(self, 'attack_timer'):
-            self.attack_timer = 0
         self.attack_timer += dt
 
         dx = player.x - self.x
         dy = player.y - self.y
         speed = self.speed
 
-        # 按主方向、次方向、正交方向尝试
-        dirs = []
-        if abs(dx) > abs(dy):
-            dirs = [(sign(dx), 0), (0, sign(dy)), (sign(dx), sign(dy)), (-sign(dx), 0), (0, -sign(dy))]
-        else:
-            dirs = [(0, sign(dy)), (sign(dx), 0), (sign(dx), sign(dy)), (0, -sign(dy)), (-sign(dx), 0)]
+        # 按主方向、次方向、正交方向尝试（方向表在导入时预先算好）
+        dirs = DIR_TABLE[(sign(dx), sign(dy), 0 if abs(dx) > abs(dy) else 1)]
+
+        # 一步之内都没有障碍时，首选方向必然畅通，跳过逐方向碰撞检测
+        open_area = not obstacles_in_rect(obstacles, self.rect.inflate(2 * speed, 2 * speed))
 
         moved = False
         for ddx, ddy in dirs:
-            if ddx == 0 and ddy == 0:
-                continue
-            next_rect = self.rect.move(ddx * speed, ddy * speed)
             blocked = False
-            for ob in obstacles:
+            if open_area:
+                candidates = ()
+            else:
+                next_rect = self._probe
+                next_rect.x = self.rect.x + ddx * speed
+                next_rect.y = self.rect.y + ddy * speed
+                # 空间哈希：只检查 next_rect 覆盖的格子（最多 2x2）
+                candidates = obstacles_in_rect(obstacles, next_rect)
+                if len(candidates) > 1:
+                    # 格子是按行列顺序取出的；先撞到可破坏的就去攻击它，别被旁边的不可破坏方块挡掉
+                    candidates.sort(key=hit_priority)
+            for ob in candidates:
                 if next_rect.colliderect(ob.rect):
                     if ob.type == "Destructible":
                         if self.attack_timer >= attack_interval:
-                            ob.health -= self.attack
+                            ob.take_damage(self.attack)
                             self.attack_timer = 0
                             if ob.health <= 0:
-                                grid_pos = ob.grid_pos
-                                if grid_pos in game_state.obstacles:
-                                    del game_state.obstacles[grid_pos]
+                                game_state.destroy_obstacle(ob.grid_pos)
                         blocked = True
                         break
                     elif ob.type == "Indestructible":
@@ -313,6 +388,21 @@ def sign(v):
     return 0
 
 
+def _build_dir_table() -> Dict[Tuple[int, int, int], Tuple[Tuple[int, int], ...]]:
+    """(sign(dx), sign(dy), 主轴) -> 僵尸依次尝试的方向（主方向、次方向、斜向、反向），已去掉 (0, 0)"""
+    table = {}
+    for sx in (-1, 0, 1):
+        for sy in (-1, 0, 1):
+            x_major = [(sx, 0), (0, sy), (sx, sy), (-sx, 0), (0, -sy)]
+            y_major = [(0, sy), (sx, 0), (sx, sy), (0, -sy), (-sx, 0)]
+            table[(sx, sy, 0)] = tuple(d for d in x_major if d != (0, 0))
+            table[(sx, sy, 1)] = tuple(d for d in y_major if d != (0, 0))
+    return table
+
+
+DIR_TABLE = _build_dir_table()
+
+
 def heuristic(a, b):
     # 曼哈顿距离，适合格子图
     return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -332,42 +422,51 @@ def a_star_search(graph: Graph, start: Tuple[int, int], goal: Tuple[int, int],
     Returns:
         (路径字典, 代价字典)
     """
-    frontier = PriorityQueue()
-    frontier.put((0, start))
+    # 单线程寻路不需要 PriorityQueue 的锁，直接用 heapq；counter 打破同优先级，避免比较坐标
+    frontier = [(0, 0, start)]
+    counter = 0
     came_from = {start: None}
     cost_so_far = {start: 0}
 
-    while not frontier.empty():
-        _, current = frontier.get()
+    # 热循环里用到的方法/字典先绑定成局部变量
+    neighbors = graph.edges.get
+    get_obstacle = obstacles.get
+    get_cost = cost_so_far.get
+    push = heappush
+    gx, gy = goal  # 曼哈顿启发式内联，省去每个邻居一次函数调用
+
+    while frontier:
+        _, _, current = heappop(frontier)
 
         # 找到目标位置，结束搜索
         if current == goal:
             break
 
+        base_cost = cost_so_far[current]
         # 探索邻居节点
-        for neighbor in graph.neighbors(current):
+        for neighbor, weight in neighbors(current, ()):
             # 计算新代价
-            new_cost = cost_so_far[current] + graph.cost(current, neighbor)
+            new_cost = base_cost + weight
 
             # 处理障碍物
-            if neighbor in obstacles:
-                obstacle = obstacles[neighbor]
-
+            obstacle = get_obstacle(neighbor)
+            if obstacle is not None:
                 # 不可破坏障碍物，跳过
                 if obstacle.type == "Indestructible":
                     continue
 
                 # 可破坏障碍物，增加额外代价
                 elif obstacle.type == "Destructible":
-                    # 计算破坏障碍物所需的额外代价
-                    k_factor = (math.ceil(obstacle.health / ENEMY_ATTACK)) * 0.1
-                    new_cost = cost_so_far[current] + 1 + k_factor
+                    # 破坏障碍物所需的额外代价（扣血时已缓存在障碍物上）
+                    new_cost = base_cost + 1 + obstacle._k_cost
 
             # 更新节点代价
-            if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+            old_cost = get_cost(neighbor)
+            if old_cost is None or new_cost < old_cost:
                 cost_so_far[neighbor] = new_cost
-                priority = new_cost + heuristic(goal, neighbor)
-                frontier.put((priority, neighbor))
+                priority = new_cost + abs(gx - neighbor[0]) + abs(gy - neighbor[1])
+                counter += 1
+                push(frontier, (priority, counter, neighbor))
                 came_from[neighbor] = current
 
     return came_from, cost_so_far
@@ -378,6 +477,14 @@ def is_not_edge(pos, grid_size):
     return 1 <= x < grid_size - 1 and 1 <= y < grid_size - 1
 
 
+@lru_cache(maxsize=4)
+def grid_positions(grid_size: int) -> Tuple[Tuple[Tuple[int, int], ...], frozenset]:
+    """(全部格子, 非边缘格子集合)，同一尺寸只生成一次"""
+    all_positions = tuple((x, y) for x in range(grid_size) for y in range(grid_size))
+    interior = frozenset(p for p in all_positions if is_not_edge(p, grid_size))
+    return all_positions, interior
+
+
 def get_level_config(level: int) -> dict:
     if level < len(LEVELS):
         return LEVELS[level]
@@ -421,7 +528,7 @@ def generate_game_entities(grid_size: int, obstacle_count: int, item_count: int,
         enemy_starts: List[(x, y)]
         main_item_pos: List[Tuple[int, int]]
     """
-    all_positions = [(x, y) for x in range(grid_size) for y in range(grid_size)]
+    all_positions, interior = grid_positions(grid_size)
     corners = [(0, 0), (0, grid_size - 1), (grid_size - 1, 0), (grid_size - 1, grid_size - 1)]
 
     # 玩家、僵尸初始点不能在角落
@@ -429,18 +536,17 @@ def generate_game_entities(grid_size: int, obstacle_count: int, item_count: int,
 
     def pick_valid_positions(min_distance: int, count: int):
         empty = [p for p in all_positions if p not in forbidden]
-        while True:
-            picks = random.sample(empty, count + 1)
-            player_pos, enemies = picks[0], picks[1:]
-            if all(abs(player_pos[0] - z[0]) + abs(player_pos[1] - z[1]) >= min_distance for z in enemies):
-                return player_pos, enemies
+        # 先定玩家，再只在足够远的格子里抽僵尸，不用整体重抽
+        player_pos = random.choice(empty)
+        far = [p for p in empty if abs(player_pos[0] - p[0]) + abs(player_pos[1] - p[1]) >= min_distance]
+        return player_pos, random.sample(far, count)
 
     player_pos, enemy_pos_list = pick_valid_positions(min_distance=5, count=enemy_count)
     forbidden |= {player_pos}
     forbidden |= set(enemy_pos_list)
 
     # 主道具点（不在 forbidden）
-    main_item_candidates = [p for p in all_positions if p not in forbidden and is_not_edge(p, grid_size)]
+    main_item_candidates = [p for p in all_positions if p in interior and p not in forbidden]
     main_item_pos = random.choice(main_item_candidates)
     forbidden.add(main_item_pos)
 
@@ -512,7 +618,7 @@ def build_graph(grid_size: int, obstacles: Dict[Tuple[int, int], Obstacle]) -> G
                 continue
 
             # 检查四个方向
-            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            for dx, dy in NEIGHBOR_OFFSETS:
                 neighbor_pos = (x + dx, y + dy)
 
                 # 确保邻居在网格范围内
@@ -545,6 +651,8 @@ class GameState:
         self.items = items
         self.destructible_count = self.count_destructible_obstacles()
         self.main_item_pos = main_item_pos
+        # 主障碍是否还在；destroy_obstacle 时更新，捡道具时不用每帧扫描全部障碍
+        self.has_main_block = any(ob.is_main_block for ob in obstacles.values())
 
     def count_destructible_obstacles(self) -> int:
         """计算可破坏障碍物的数量"""
@@ -566,11 +674,14 @@ class GameState:
     #         return True
     #     return False
     def collect_item(self, player_rect):
-        for item in list(self.items):  # 用 list 防止迭代时删
+        # 倒序按下标遍历，删除时不必复制列表；每次最多捡一个
+        items = self.items
+        for i in range(len(items) - 1, -1, -1):
+            item = items[i]
             if player_rect.colliderect(item.rect):
-                if item.is_main and any(getattr(ob, "is_main_block", False) for ob in self.obstacles.values()):
+                if item.is_main and self.has_main_block:
                     return False  # 主障碍未破坏不能捡主道具
-                self.items.remove(item)
+                items.pop(i)
                 return True
         return False
 
@@ -580,6 +691,8 @@ class GameState:
             # 如果是可破坏障碍物，更新计数
             if self.obstacles[pos].type == "Destructible":
                 self.destructible_count -= 1
+            if self.obstacles[pos].is_main_block:
+                self.has_main_block = False
             del self.obstacles[pos]
 
         # # 每次破坏后检查是否满足解锁条件
@@ -587,24 +700,54 @@ class GameState:
 
 
 # ==================== 游戏渲染函数 ====================
+@lru_cache(maxsize=None)
+def _font(size: int) -> pygame.font.Font:
+    """按字号缓存字体，避免每帧重新创建 SysFont"""
+    return pygame.font.SysFont(None, size)
 
 
-def render_game(screen: pygame.Surface, game_state, player: Player, enemies: List[Enemy]) -> None:
-    """渲染游戏画面"""
-    # 清空屏幕
-    screen.fill((20, 20, 20))
+@lru_cache(maxsize=128)
+def _hp_text(hp: int) -> pygame.Surface:
+    """障碍物血量文字，同一数值只渲染一次"""
+    return _font(30).render(str(hp), True, (255, 255, 255))
 
-    # 顶部信息栏
-    pygame.draw.rect(screen, (0, 0, 0), (0, 0, WINDOW_SIZE, INFO_BAR_HEIGHT))
-    font = pygame.font.SysFont(None, 28)
-    item_txt = font.render(f"ITEMS: {len(game_state.items)}", True, (255, 255, 80))
-    screen.blit(item_txt, (12, 12))
 
-    # 绘制网格
+@lru_cache(maxsize=32)
+def _items_text(count: int) -> pygame.Surface:
+    return _font(28).render(f"ITEMS: {count}", True, (255, 255, 80))
+
+
+@lru_cache(maxsize=1)
+def _background() -> pygame.Surface:
+    """底色、顶部信息栏和网格线都是静态的，预先画到一张图上"""
+    bg = pygame.Surface((WINDOW_SIZE, TOTAL_HEIGHT)).convert()
+    bg.fill((20, 20, 20))
+    pygame.draw.rect(bg, (0, 0, 0), (0, 0, WINDOW_SIZE, INFO_BAR_HEIGHT))
     for y in range(GRID_SIZE):
         for x in range(GRID_SIZE):
             rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE + INFO_BAR_HEIGHT, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, (50, 50, 50), rect, 1)
+            pygame.draw.rect(bg, (50, 50, 50), rect, 1)
+    return bg
+
+
+@lru_cache(maxsize=4)
+def _tile(color: Tuple[int, int, int]) -> pygame.Surface:
+    """单色障碍砖，按颜色缓存，整批 blits"""
+    tile = pygame.Surface((CELL_SIZE, CELL_SIZE)).convert()
+    tile.fill(color)
+    return tile
+
+
+@lru_cache(maxsize=1)
+def _star_text() -> pygame.Surface:
+    return _font(32).render("★", True, (255, 255, 120))
+
+
+def render_game(screen: pygame.Surface, game_state, player: Player, enemies: List[Enemy]) -> None:
+    """渲染游戏画面"""
+    # 底色 + 顶部信息栏 + 网格：一次 blit 预渲染背景
+    screen.blit(_background(), (0, 0))
+    screen.blit(_items_text(len(game_state.items)), (12, 12))
 
     # 绘制道具
     for item in game_state.items:
@@ -636,24 +779,22 @@ def render_game(screen: pygame.Surface, game_state, player: Player, enemies: Lis
     for enemy in enemies:
         pygame.draw.rect(screen, (255, 60, 60), enemy.rect)
 
-    # 绘制障碍物
+    # 绘制障碍物：砖块和文字按绘制顺序收集，一次 blits 提交
+    obstacle_blits = []
     for obstacle in game_state.obstacles.values():
-        is_main = hasattr(obstacle, 'is_main_block') and obstacle.is_main_block
+        is_main = obstacle.is_main_block
         if is_main:
             color = (255, 220, 80)  # 主障碍：金黄
         elif obstacle.type == "Indestructible":
             color = (120, 120, 120)  # 灰色
         else:
             color = (200, 80, 80)  # 可破坏：红
-        pygame.draw.rect(screen, color, obstacle.rect)
+        obstacle_blits.append((_tile(color), obstacle.rect))
         if obstacle.type == "Destructible":
-            font = pygame.font.SysFont(None, 30)
-            health_text = font.render(str(obstacle.health), True, (255, 255, 255))
-            screen.blit(health_text,
-                        (obstacle.rect.x + 6, obstacle.rect.y + 8))
+            obstacle_blits.append((_hp_text(obstacle.health), (obstacle.rect.x + 6, obstacle.rect.y + 8)))
         if is_main:
-            star = pygame.font.SysFont(None, 32).render("★", True, (255, 255, 120))
-            screen.blit(star, (obstacle.rect.x + 8, obstacle.rect.y + 8))
+            obstacle_blits.append((_star_text(), (obstacle.rect.x + 8, obstacle.rect.y + 8)))
+    screen.blits(obstacle_blits, doreturn=False)
 
 
 def render_game_result(screen: pygame.Surface, result: str, restart_img, next_img) -> Tuple[pygame.Rect, pygame.Rect]:
@@ -761,7 +902,7 @@ def main(config, enemy_cards_collected: Set[str]) -> Tuple[str, Optional[str]]:
 
         for enemy in enemies:
             # 僵尸像素级追踪玩家
-            enemy.move_and_attack(player, list(game_state.obstacles.values()), game_state)
+            enemy.move_and_attack(player, game_state.obstacles, game_state)
             # 僵尸与玩家像素碰撞则失败
             player_rect = pygame.Rect(int(player.x), int(player.y) + INFO_BAR_HEIGHT, player.size, player.size)
             if enemy.rect.colliderect(player_rect):
@@ -778,8 +919,8 @@ def main(config, enemy_cards_collected: Set[str]) -> Tuple[str, Optional[str]]:
         #     if action == "destroy":
         #         # 更新游戏状态
         #         game_state.destroy_obstacle(target_pos)
-        #         # 重建图
-        #         graph = build_graph(GRID_SIZE, game_state.obstacles)
+        #         # 只重连该格子周围的边，不必整图重建
+        #         graph.add_edges_around(target_pos, GRID_SIZE, game_state.obstacles)
         #
         #     # 处理僵尸移动
         #     if action == "move":
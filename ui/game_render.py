@@ -1,41 +1,116 @@
+from functools import lru_cache
+
 import pygame
 from core.utils import CELL_SIZE, INFO_BAR_HEIGHT
 
 
+@lru_cache(maxsize=8)
+def _get_font(size):
+    return pygame.font.SysFont(None, size)
+
+
+@lru_cache(maxsize=256)
+def _render_text(text, size, color):
+    return _get_font(size).render(text, True, color)
+
+
+@lru_cache(maxsize=16)
+def _solid(color, size):
+    # 纯色方块精灵（玩家/僵尸/障碍砖），整批 blits
+    surf = pygame.Surface(size).convert()
+    surf.fill(color)
+    return surf
+
+
+@lru_cache(maxsize=4)
+def _dot(color, radius):
+    # 道具圆点预先画好，逐帧只做 blit
+    surf = pygame.Surface((radius * 2 + 1, radius * 2 + 1), pygame.SRCALPHA).convert_alpha()
+    pygame.draw.circle(surf, color, (radius, radius), radius)
+    return surf
+
+
+@lru_cache(maxsize=64)
+def _items_surf(n):
+    # 信息栏唯一的动态文字，按数量缓存
+    return _render_text(f"ITEMS: {n}", 28, (255, 255, 80))
+
+
+_prev_dirty = None
+_BG_SURF = None
+_GRID_RECTS = tuple(pygame.Rect(x * CELL_SIZE, y * CELL_SIZE + INFO_BAR_HEIGHT, CELL_SIZE, CELL_SIZE)
+                    for y in range(18) for x in range(18))
+
+
+def _background(screen):
+    # 底色、信息栏和网格线是静态的，画一次缓存起来
+    global _BG_SURF
+    if _BG_SURF is None or _BG_SURF.get_size() != screen.get_size():
+        _BG_SURF = pygame.Surface(screen.get_size()).convert()
+        _BG_SURF.fill((20, 20, 20))
+        _BG_SURF.fill((0, 0, 0), (0, 0, screen.get_width(), INFO_BAR_HEIGHT))
+        for rect in _GRID_RECTS:
+            pygame.draw.rect(_BG_SURF, (50, 50, 50), rect, 1)
+    return _BG_SURF
+
+
 def render_game(screen, game_state, player, enemies):
-    screen.fill((20, 20, 20))
-    pygame.draw.rect(screen, (0, 0, 0), (0, 0, screen.get_width(), INFO_BAR_HEIGHT))
-    font = pygame.font.SysFont(None, 28)
-    item_txt = font.render(f"ITEMS: {len(game_state.items)}", True, (255, 255, 80))
-    screen.blit(item_txt, (12, 12))
+    screen.blit(_background(screen), (0, 0))
+    screen.blit(_items_surf(len(game_state.items)), (12, 12))
 
-    for y in range(18):
-        for x in range(18):
-            rect = pygame.Rect(x * CELL_SIZE, y * CELL_SIZE + INFO_BAR_HEIGHT, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, (50, 50, 50), rect, 1)
+    # 只画与可视区域相交的实体（信息栏下方）
+    view = screen.get_rect()
+    view.top = INFO_BAR_HEIGHT
+    view.height = max(0, screen.get_height() - INFO_BAR_HEIGHT)
+    visible = view.colliderect
 
+    # 道具、玩家、僵尸、障碍砖都是预渲染精灵，按原绘制顺序收进同一个 blits 列表
+    blit_list = []
     for item in game_state.items:
+        if not visible(item.rect):
+            continue
         color = (255, 255, 100) if item.is_main else (255, 255, 0)
-        pygame.draw.circle(screen, color, item.center, item.radius)
-
-    pygame.draw.rect(screen, (0, 255, 0), player.rect)
-
-    for enemy in enemies:
-        pygame.draw.rect(screen, (255, 60, 60), enemy.rect)
-
-    for obstacle in game_state.obstacles.values():
-        is_main = hasattr(obstacle, 'is_main_block') and obstacle.is_main_block
-        if is_main:
-            color = (255, 220, 80)
-        elif obstacle.type == "Indestructible":
-            color = (120, 120, 120)
-        else:
-            color = (200, 80, 80)
-        pygame.draw.rect(screen, color, obstacle.rect)
-        if obstacle.type == "Destructible":
-            font = pygame.font.SysFont(None, 30)
-            health_text = font.render(str(obstacle.health), True, (255, 255, 255))
-            screen.blit(health_text, (obstacle.rect.x + 6, obstacle.rect.y + 8))
-        if is_main:
-            star = pygame.font.SysFont(None, 32).render("★", True, (255, 255, 120))
-            screen.blit(star, (obstacle.rect.x + 8, obstacle.rect.y + 8))
+        blit_list.append((_dot(color, item.radius), (item.center[0] - item.radius, item.center[1] - item.radius)))
+    blit_list.append((_solid((0, 255, 0), player.rect.size), player.rect))
+    blit_list += [(_solid((255, 60, 60), enemy.rect.size), enemy.rect) for enemy in enemies if visible(enemy.rect)]
+    # 障碍已在 game_state 里按类型分组，三段紧凑循环，不再逐个判断类型
+    for rect in game_state.indestructible_rects:
+        if visible(rect):
+            blit_list.append((_solid((120, 120, 120), rect.size), rect))
+    labels = [ob for ob in game_state.destructible_blocks if visible(ob.rect)]
+    mains = [ob for ob in game_state.main_blocks if visible(ob.rect)]
+    for ob in labels:
+        blit_list.append((_solid((200, 80, 80), ob.rect.size), ob.rect))
+    for ob in mains:
+        blit_list.append((_solid((255, 220, 80), ob.rect.size), ob.rect))
+    screen.blits(blit_list, doreturn=False)
+
+    # 障碍之间不重叠，文字在所有砖块之后统一一次 blits
+    text_blits = [(_render_text(ob.health_str, 30, (255, 255, 255)), (ob.rect.x + 6, ob.rect.y + 8))
+                  for ob in labels + mains]
+    star = _render_text("★", 32, (255, 255, 120))
+    text_blits += [(star, (ob.rect.x + 8, ob.rect.y + 8)) for ob in mains]
+    screen.blits(text_blits, doreturn=False)
+
+    # 本帧会变化的区域：信息栏、道具、玩家、僵尸、可破坏障碍（血量文字）
+    dirty = [pygame.Rect(0, 0, screen.get_width(), INFO_BAR_HEIGHT), player.rect.copy()]
+    dirty += [item.rect.inflate(2, 2) for item in game_state.items if visible(item.rect)]
+    dirty += [enemy.rect.copy() for enemy in enemies if visible(enemy.rect)]
+    dirty += [ob.rect for ob in labels + mains]
+    return dirty
+
+
+def reset_present():
+    # 新关卡/切换画面后第一帧必须整屏提交
+    global _prev_dirty
+    _prev_dirty = None
+
+
+def present_frame(dirty):
+    # 只提交上一帧和本帧的脏矩形（擦掉旧位置 + 画上新位置）
+    global _prev_dirty
+    if _prev_dirty is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(_prev_dirty + dirty)
+    _prev_dirty = dirty
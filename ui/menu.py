@@ -1,20 +1,43 @@
 import pygame
 
+_IMG_CACHE = {}
 
-def show_start_menu(screen):
-    background = pygame.image.load("assets/start_bg.png").convert()
-    background = pygame.transform.scale(background, screen.get_size())
-    start_button_img = pygame.image.load("assets/start_button.png").convert_alpha()
-    start_button_rect = start_button_img.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
 
-    while True:
+def _load(path, size=None, alpha=False):
+    # 菜单图片解码/缩放一次，重新进入菜单时直接复用
+    key = (path, size, alpha)
+    img = _IMG_CACHE.get(key)
+    if img is None:
+        img = pygame.image.load(path)
+        img = img.convert_alpha() if alpha else img.convert()
+        if size is not None:
+            img = pygame.transform.scale(img, size)
+        _IMG_CACHE[key] = img
+    return img
+
+
+_REDRAW_EVENTS = (pygame.VIDEOEXPOSE, pygame.VIDEORESIZE, pygame.WINDOWEXPOSED)
+
+
+def show_start_menu(screen):
+    def draw():
+        background = _load("assets/start_bg.png", screen.get_size())
+        start_button_img = _load("assets/start_button.png", alpha=True)
+        rect = start_button_img.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2))
         screen.blit(background, (0, 0))
-        screen.blit(start_button_img, start_button_rect)
+        screen.blit(start_button_img, rect)
         pygame.display.flip()
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                exit()
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if start_button_rect.collidepoint(event.pos):
-                    return True
+        return rect
+
+    # 事件驱动：进入时画一次，之后阻塞等事件，只有窗口重新露出/尺寸变化才重画
+    start_button_rect = draw()
+    while True:
+        event = pygame.event.wait()
+        if event.type == pygame.QUIT:
+            pygame.quit()
+            exit()
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            if start_button_rect.collidepoint(event.pos):
+                return True
+        elif event.type in _REDRAW_EVENTS:
+            start_button_rect = draw()
@@ -1,6 +1,18 @@
+from functools import lru_cache
+
 import pygame
 
 
+@lru_cache(maxsize=4)
+def _result_rects(w, h):
+    # 左下角 Restart / Next 图标位置只取决于屏幕尺寸
+    margin = 40
+    icon_size = 64
+    restart_rect = pygame.Rect((margin, h - icon_size - margin), (icon_size, icon_size))
+    next_rect = pygame.Rect((margin + icon_size + 32, h - icon_size - margin), (icon_size, icon_size))
+    return restart_rect, next_rect
+
+
 def render_game_result(screen, result, restart_img, next_img):
     screen.fill((0, 0, 0))
     font = pygame.font.SysFont(None, 80)
@@ -14,13 +26,8 @@ def render_game_result(screen, result, restart_img, next_img):
     text_rect = text.get_rect(center=(screen.get_width() // 2, screen.get_height() // 2 - 60))
     screen.blit(text, text_rect)
 
-    margin = 40
-    icon_size = 64
-    restart_pos = (margin, screen.get_width() - icon_size - margin)
-    restart_rect = pygame.Rect(restart_pos, (icon_size, icon_size))
+    restart_rect, next_rect = _result_rects(*screen.get_size())
     screen.blit(restart_img, restart_rect)
-    next_pos = (margin + icon_size + 32, screen.get_width() - icon_size - margin)
-    next_rect = pygame.Rect(next_pos, (icon_size, icon_size))
     screen.blit(next_img, next_rect)
     pygame.display.flip()
     return restart_rect, next_rect